@@ -0,0 +1,248 @@
+"""Rolling-window absence rates and Bradford factor scores.
+
+AbsenceAnalytics keeps employee x day running totals (leave days, sick days and
+sick spells started), so any trailing window is two lookups per employee and
+the org trend is a difference of two shifted arrays. Adding (or removing) rows
+only updates the totals of the employees touched, from the earliest changed
+date onwards, so a new data version is applied as its row delta.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from leave_intervals import expand_leave_intervals, leave_days
+
+SICK_TYPES = ("Sick Leave",)
+WINDOWS = (30, 90, 365)
+BRADFORD_WINDOW = 365
+
+
+class AbsenceAnalytics:
+    """Incrementally maintained absence totals for the whole organisation.
+
+    A sick spell is a run of sick days on consecutive business days, so a
+    Friday-Monday absence is one spell. The Bradford factor is S * S * D for the
+    S spells starting and D sick days falling in the trailing window.
+    """
+
+    def __init__(self, sick_types=SICK_TYPES, holidays=None):
+        self.sick_types = set(sick_types)
+        self.holidays = np.array([] if holidays is None else holidays, dtype='datetime64[D]')
+        self.version = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.employees = []
+        # Everyone the org trend's headcount covers, with or without leave
+        self.roster = set()
+        self._rows = {}
+        self.origin = None
+        # Cumulative sums with a leading zero column: total[:, j] covers days < j
+        self._days = np.zeros((0, 1), dtype=np.float32)
+        self._sick = np.zeros((0, 1), dtype=np.float32)
+        self._spells = np.zeros((0, 1), dtype=np.int32)
+        self._org = np.zeros(1, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.employees)
+
+    @classmethod
+    def from_frame(cls, df, sick_types=SICK_TYPES, holidays=None):
+        analytics = cls(sick_types, holidays)
+        analytics.add_frame(df)
+        return analytics
+
+    @property
+    def span(self):
+        return self._days.shape[1] - 1
+
+    def _dates(self):
+        return self.origin + np.arange(self.span)
+
+    def _grow(self, first, last, names):
+        """Extend the grid to cover [first, last] and any new employees"""
+        if self.origin is None:
+            self.origin = first
+        pad_left = max(0, int((self.origin - first).astype(np.int64)))
+        pad_right = max(0, int((last - (self.origin + self.span - 1)).astype(np.int64)))
+        new = [n for n in dict.fromkeys(names) if n not in self._rows]
+        for name in new:
+            self._rows[name] = len(self.employees)
+            self.employees.append(name)
+        if pad_left or pad_right or new:
+            # New rows and earlier days start at zero; later days repeat the final totals
+            def pad(total):
+                rows = ((0, len(new)),) if total.ndim == 2 else ()
+                total = np.pad(total, rows + ((pad_left, 0),))
+                return np.pad(total, ((0, 0),) * (total.ndim - 1) + ((0, pad_right),), mode='edge')
+            self._days, self._sick, self._spells, self._org = (
+                pad(self._days), pad(self._sick), pad(self._spells), pad(self._org))
+            self.origin = self.origin - pad_left
+
+    def add_employees(self, names):
+        """Put employees on the roster, e.g. those who never took leave"""
+        names = [n for n in names if isinstance(n, str) and n]
+        if names and self.origin is not None:
+            self._grow(self.origin, self.origin, names)
+        self.roster.update(names)
+
+    def add_frame(self, df, name_col='Employee Name', type_col='Leave Type',
+                  start_col='Start Date', end_col='End Date', days_col='Days'):
+        """Add interval records, spread over their days by expand_leave_intervals"""
+        if df.empty:
+            return
+        intervals = df.rename(columns={name_col: 'Employee Name', type_col: 'Leave Type',
+                                       start_col: 'Start Date', end_col: 'End Date', days_col: 'Days'})
+        self.add_days(expand_leave_intervals(intervals, holidays=self.holidays))
+
+    def add_days(self, rows, name_col='Name', date_col='Leave Date', type_col='Leave Type',
+                 duration_col='Duration'):
+        """Add one-row-per-day records (Duration as days or 'Full Day'/'Half Day')"""
+        self._apply(rows, 1, name_col, date_col, type_col, duration_col)
+
+    def remove_days(self, rows, name_col='Name', date_col='Leave Date', type_col='Leave Type',
+                    duration_col='Duration'):
+        """Take back rows previously added with add_days"""
+        self._apply(rows, -1, name_col, date_col, type_col, duration_col)
+
+    def sync(self, frame, version, changes=None, name_col='Name', date_col='Leave Date',
+             type_col='Leave Type', duration_col='Duration'):
+        """Move to another data version; returns self.
+
+        changes(old_version, new_version) gives (added, removed) rows, e.g.
+        SnapshotStore.diff, so only the delta is applied. Without it, or on the
+        first sync, the totals are built from frame. The roster becomes the
+        names in frame.
+        """
+        columns = (name_col, date_col, type_col, duration_col)
+        with self._lock:
+            if version == self.version:
+                return self
+            if changes is None or self.version is None:
+                self._reset()
+                self.add_days(frame, *columns)
+            else:
+                added, removed = changes(self.version, version)
+                self.remove_days(removed, *columns)
+                self.add_days(added, *columns)
+            self.roster = set(frame[name_col].dropna())
+            self.add_employees(self.roster)
+            self.version = version
+        return self
+
+    def _apply(self, rows, sign, name_col, date_col, type_col, duration_col):
+        rows = rows.dropna(subset=[name_col, date_col])
+        if rows.empty:
+            return
+        dates = rows[date_col].to_numpy().astype('datetime64[D]')
+        names = rows[name_col].to_numpy()
+        self._grow(dates.min(), dates.max(), names)
+        self.roster.update(names)
+
+        row_ids = np.fromiter((self._rows[n] for n in names), dtype=np.int64, count=len(names))
+        cols = (dates - self.origin).astype(np.int64)
+        values = leave_days(rows[duration_col]) * sign
+        sick_values = np.where(rows[type_col].isin(self.sick_types).to_numpy(), values, 0)
+
+        touched, local = np.unique(row_ids, return_inverse=True)
+        start = int(cols.min())
+        delta = np.zeros((len(touched), self.span - start), dtype=np.float32)
+        np.add.at(delta, (local, cols - start), values)
+        self._days[touched, start + 1:] += np.cumsum(delta, axis=1)
+        self._org[start + 1:] += np.cumsum(delta.sum(axis=0, dtype=np.float64))
+        if sick_values.any():
+            delta[:] = 0
+            np.add.at(delta, (local, cols - start), sick_values)
+            self._sick[touched, start + 1:] += np.cumsum(delta, axis=1)
+            self._refresh_spells(touched, start)
+
+    def _refresh_spells(self, rows, start):
+        """Recount spell starts for rows from column start onwards"""
+        sick = np.diff(self._sick[rows], axis=1) > 0
+        dates = self._dates()[start:]
+        prev = (np.busday_offset(dates, -1, roll='forward', holidays=self.holidays) - self.origin).astype(np.int64)
+        continues = np.zeros((len(rows), len(dates)), dtype=bool)
+        valid = prev >= 0
+        continues[:, valid] = sick[:, prev[valid]]
+        starts = sick[:, start:] & ~continues
+        self._spells[rows, start + 1:] = self._spells[rows, start:start + 1] + np.cumsum(starts, axis=1)
+
+    def _window(self, as_of, window):
+        """(start, end) cumulative-column bounds for the window ending on as_of"""
+        as_of = np.datetime64(pd.Timestamp(as_of).date(), 'D')
+        if self.origin is None:
+            return 0, 0, as_of
+        end = int((as_of - self.origin).astype(np.int64)) + 1
+        return int(np.clip(end - window, 0, self.span)), int(np.clip(end, 0, self.span)), as_of
+
+    def _business_days(self, as_of, window):
+        first = as_of - np.timedelta64(window - 1, 'D')
+        return int(np.busday_count(first, as_of + 1, holidays=self.holidays))
+
+    def rolling_rates(self, as_of, windows=WINDOWS):
+        """Leave days and share of business days absent per employee over each window"""
+        data = {}
+        for window in windows:
+            start, end, as_of_day = self._window(as_of, window)
+            days = self._days[:, end] - self._days[:, start]
+            data[f'Days {window}d'] = days
+            data[f'Rate {window}d'] = days / max(self._business_days(as_of_day, window), 1)
+        return pd.DataFrame(data, index=pd.Index(self.employees, name='Employee Name'))
+
+    def bradford(self, as_of, window=BRADFORD_WINDOW):
+        """Sick spells, sick days and Bradford factor per employee"""
+        start, end, _ = self._window(as_of, window)
+        spells = self._spells[:, end] - self._spells[:, start]
+        sick_days = self._sick[:, end] - self._sick[:, start]
+        return pd.DataFrame({
+            'Sick Spells': spells,
+            'Sick Days': sick_days,
+            'Bradford Factor': spells.astype(np.float64) ** 2 * sick_days,
+        }, index=pd.Index(self.employees, name='Employee Name'))
+
+    def summary(self, as_of, windows=WINDOWS):
+        """Rolling rates and Bradford scores in one frame, worst offenders first"""
+        frame = self.rolling_rates(as_of, windows).join(self.bradford(as_of))
+        frame = frame[frame.index.isin(self.roster)]
+        return frame.sort_values(['Bradford Factor', f'Days {windows[-1]}d'], ascending=False).reset_index()
+
+    def org_trend(self, window=30, headcount=None, start=None, end=None):
+        """Org-wide absence rate over a trailing window, one value per calendar day"""
+        if self.origin is None:
+            return pd.Series(dtype=float, name='Absence Rate')
+        dates = self._dates()
+        totals = self._org[window:] - self._org[:-window] if self.span >= window else np.array([])
+        head = self._org[1:min(window, self.span + 1)]
+        rolling = np.concatenate([head, totals])[:self.span]
+        is_bus = np.is_busday(dates, holidays=self.holidays).astype(np.int64)
+        bus_cum = np.concatenate([[0], np.cumsum(is_bus)])
+        idx = np.arange(1, self.span + 1)
+        bus = bus_cum[idx] - bus_cum[np.maximum(idx - window, 0)]
+        staff = headcount or len(self.roster)
+        rate = pd.Series(rolling / np.maximum(bus * staff, 1), index=pd.DatetimeIndex(dates, name='Date'),
+                         name='Absence Rate')
+        return rate.loc[start:end] if start is not None or end is not None else rate
+
+
+def render_absence_dashboard(analytics, as_of, employees=None, key="absence"):
+    """Org trend chart plus rolling rates and Bradford scores, optionally for a subset"""
+    window = st.selectbox("Trend window (days)", WINDOWS, key=f"{key}_window")
+    trend = analytics.org_trend(window, end=pd.Timestamp(as_of))
+    summary = analytics.summary(as_of)
+    if employees is not None:
+        summary = summary[summary['Employee Name'].isin(employees)]
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric(f"Org Absence ({window}d)", f"{trend.iloc[-1]:.1%}" if len(trend) else "–")
+    col2.metric("Absent Days (365d)", f"{summary['Days 365d'].sum():g}")
+    col3.metric("Highest Bradford Factor", f"{summary['Bradford Factor'].max():g}" if len(summary) else "–")
+    if len(trend):
+        st.line_chart(trend.loc[pd.Timestamp(as_of) - pd.Timedelta(days=730):])
+    st.dataframe(
+        summary, use_container_width=True, hide_index=True,
+        column_config={f'Rate {w}d': st.column_config.NumberColumn(format="percent") for w in WINDOWS}
+    )
+
@@ -0,0 +1,28 @@
+"""Stylesheets served once from ./static instead of inlined on every rerun.
+
+With server.enableStaticServing (set in .streamlit/config.toml) each rerun only
+sends a <link> tag and the browser caches the file; the mtime query string
+busts that cache when the stylesheet changes. Without static serving the CSS
+is inlined as before.
+"""
+import os
+from functools import lru_cache
+
+import streamlit as st
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+@lru_cache(maxsize=None)
+def _stylesheet(name, mtime):
+    with open(os.path.join(STATIC_DIR, name), encoding="utf-8") as fh:
+        return fh.read()
+
+
+def load_css(name):
+    path = os.path.join(STATIC_DIR, name)
+    mtime = os.stat(path).st_mtime_ns
+    if st.get_option("server.enableStaticServing"):
+        st.markdown(f'<link rel="stylesheet" href="app/static/{name}?v={mtime:x}">', unsafe_allow_html=True)
+    else:
+        st.markdown(f"<style>{_stylesheet(name, mtime)}</style>", unsafe_allow_html=True)
@@ -0,0 +1,203 @@
+"""What-if team coverage for pending leave requests.
+
+A simulator covers one team: its roster (or an explicit headcount, to count
+members who never took leave) and their leave history. Booked leave gives a
+fixed per-day absence; pending requests are granted per
+scenario (all of them, or each with a probability); on top of that every
+employee not already off may be absent with the historical rate for that
+calendar month. All scenarios are drawn at once as a (scenarios x days)
+binomial sample, so thousands of scenarios over a year take well under a
+second. Only business days are simulated.
+
+Pending requests of one employee are assumed not to overlap each other;
+overlaps with booked leave are counted once.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from leave_intervals import expand_leave_intervals, interval_day_counts, leave_days
+
+MIN_COVERAGE = 0.75
+SCENARIOS = 2000
+
+
+def _key(name):
+    return str(name).strip().casefold()
+
+
+class CapacitySimulator:
+    """Coverage scenarios for one team over its leave history"""
+
+    def __init__(self, rows, roster=None, headcount=None, leave_types=None, holidays=None, name_col='Name',
+                 date_col='Leave Date', type_col='Leave Type', duration_col='Duration'):
+        """rows are one-per-day leaves, limited to the roster's names when one is given.
+
+        headcount defaults to the size of the roster; one of them is required.
+        leave_types limits the seasonal absence model.
+        """
+        if roster is None and headcount is None:
+            raise ValueError("give the team's roster or its headcount")
+        if roster is not None:
+            roster = {_key(name) for name in roster}
+            rows = rows[rows[name_col].map(_key).isin(roster)]
+        self.holidays = np.array([] if holidays is None else holidays, dtype='datetime64[D]')
+        self.headcount = int(len(roster) if headcount is None else headcount)
+        names = rows[name_col].map(_key).to_numpy()
+        dates = rows[date_col].to_numpy().astype('datetime64[D]')
+        days = leave_days(rows[duration_col]).astype(float)
+        # Absent days per (employee, day number), a full day at most
+        self._booked = pd.Series(days).groupby([names, dates.astype(np.int64)], sort=False).sum().clip(upper=1.0)
+        seasonal = rows[type_col].isin(leave_types).to_numpy() if leave_types else np.ones(len(rows), dtype=bool)
+        seasonal &= np.is_busday(dates, holidays=self.holidays)
+        self._history_dates, self._history_days = dates[seasonal], days[seasonal]
+
+    @classmethod
+    def from_intervals(cls, intervals, roster=None, headcount=None, leave_types=None, holidays=None):
+        return cls(expand_leave_intervals(intervals, holidays=holidays), roster, headcount, leave_types, holidays)
+
+    def business_days(self, start, end):
+        start = np.datetime64(pd.Timestamp(start).date(), 'D')
+        end = np.datetime64(pd.Timestamp(end).date(), 'D')
+        days = np.arange(start, end + 1)
+        return days[np.is_busday(days, holidays=self.holidays)]
+
+    def seasonal_rates(self, before):
+        """Share of employee business days absent, per calendar month, from history before `before`"""
+        before = np.datetime64(pd.Timestamp(before).date(), 'D')
+        earlier = self._history_dates < before
+        dates, days = self._history_dates[earlier], self._history_days[earlier]
+        rates = np.zeros(12)
+        if not len(dates) or not self.headcount:
+            return rates
+        observed = self.business_days(dates.min(), min(dates.max(), before - 1))
+        month_of = lambda d: d.astype('datetime64[M]').astype(int) % 12
+        capacity = np.bincount(month_of(observed), minlength=12) * float(self.headcount)
+        absent = np.bincount(month_of(dates), weights=days, minlength=12)
+        seen = capacity > 0
+        rates[seen] = absent[seen] / capacity[seen]
+        rates[~seen] = absent.sum() / capacity.sum()
+        return np.clip(rates, 0.0, 1.0)
+
+    def _booked_matrix(self, dates):
+        """(absent days, people off) per day from booked leave, and the lookup used for pending"""
+        day_numbers = dates.astype(np.int64)
+        booked = self._booked[self._booked.index.get_level_values(1).isin(day_numbers)]
+        day = np.searchsorted(day_numbers, booked.index.get_level_values(1).to_numpy())
+        days = np.bincount(day, weights=booked.to_numpy(), minlength=len(dates))
+        people = np.bincount(day, minlength=len(dates)).astype(float)
+        return days, people, booked
+
+    def _pending_matrix(self, pending, dates, booked):
+        """(extra absent days, extra people off) per request and day, net of booked leave"""
+        count = 0 if pending is None else len(pending)
+        extra_days = np.zeros((count, len(dates)))
+        extra_people = np.zeros((count, len(dates)))
+        if not count:
+            return extra_days, extra_people
+        pending = pending.assign(**{
+            'Start Date': pd.to_datetime(pending['Start Date']),
+            'End Date': pd.to_datetime(pending['End Date']),
+        }).reset_index(drop=True)
+        rows = expand_leave_intervals(pending, holidays=self.holidays)
+        request = np.repeat(np.arange(count), interval_day_counts(pending, holidays=self.holidays))
+        d = rows['Leave Date'].to_numpy().astype('datetime64[D]')
+        inside = np.isin(d, dates)
+        request, d = request[inside], d[inside]
+        names = rows['Name'].map(_key).to_numpy()[inside]
+        taken = booked.reindex(pd.MultiIndex.from_arrays([names, d.astype(np.int64)]), fill_value=0.0).to_numpy()
+        column = np.searchsorted(dates, d)
+        np.add.at(extra_days, (request, column), np.minimum(rows['Duration'].to_numpy()[inside], 1.0 - taken))
+        np.add.at(extra_people, (request, column), (taken == 0).astype(float))
+        return extra_days, extra_people
+
+    def simulate(self, start, end, pending=None, scenarios=SCENARIOS, min_staff=None,
+                 grant_probability=1.0, seed=None):
+        """Per business day: booked and pending absence, expected and 5th-percentile
+        available staff, and the probability of falling below min_staff"""
+        dates = self.business_days(start, end)
+        if min_staff is None:
+            min_staff = math.ceil(self.headcount * MIN_COVERAGE)
+        booked_days, booked_people, booked = self._booked_matrix(dates)
+        extra_days, extra_people = self._pending_matrix(pending, dates, booked)
+
+        rng = np.random.default_rng(seed)
+        if grant_probability >= 1.0:
+            granted = np.ones((scenarios, len(extra_days)))
+        else:
+            granted = (rng.random((scenarios, len(extra_days))) < grant_probability).astype(float)
+        planned_days = booked_days + granted @ extra_days
+        free = np.clip(self.headcount - (booked_people + granted @ extra_people), 0, None).astype(np.int64)
+        rates = self.seasonal_rates(start)[dates.astype('datetime64[M]').astype(int) % 12]
+        available = self.headcount - planned_days - rng.binomial(free, rates)
+
+        return pd.DataFrame({
+            'Date': dates.astype('datetime64[ns]'),
+            'Booked Absent': booked_days,
+            'Pending Absent': extra_days.sum(axis=0),
+            'Seasonal Rate': rates,
+            'Expected Available': available.mean(axis=0),
+            'P5 Available': np.percentile(available, 5, axis=0),
+            'P(Below Minimum)': (available < min_staff).mean(axis=0),
+        })
+
+
+def render_capacity_whatif(simulator, employees, leave_types, key="capacity"):
+    """Pending-request editor plus daily shortfall risk for the chosen horizon"""
+    col1, col2, col3 = st.columns(3)
+    today = pd.Timestamp.today().normalize()
+    horizon = col1.date_input("Horizon", value=(today.date(), (today + pd.DateOffset(years=1)).date()),
+                              key=f"{key}_horizon")
+    start, end = (tuple(horizon) + (None, None))[:2] if isinstance(horizon, (tuple, list)) else (horizon, None)
+    end = end or start
+    min_staff = col2.number_input("Minimum staff on duty", 0, simulator.headcount,
+                                  math.ceil(simulator.headcount * MIN_COVERAGE), key=f"{key}_min_staff")
+    grant_probability = col3.slider("Chance each pending request is granted", 0.0, 1.0, 1.0, 0.05,
+                                    key=f"{key}_grant")
+
+    st.markdown("**Pending requests**")
+    pending = st.data_editor(
+        pd.DataFrame({'Employee Name': pd.Series(dtype=object), 'Leave Type': pd.Series(dtype=object),
+                      'Start Date': pd.Series(dtype='datetime64[ns]'), 'End Date': pd.Series(dtype='datetime64[ns]'),
+                      'Days': pd.Series(dtype=float)}),
+        num_rows="dynamic", use_container_width=True, hide_index=True, key=f"{key}_pending",
+        column_config={
+            'Employee Name': st.column_config.SelectboxColumn(options=sorted(employees), required=True),
+            'Leave Type': st.column_config.SelectboxColumn(options=list(leave_types), required=True),
+            'Start Date': st.column_config.DateColumn(required=True),
+            'End Date': st.column_config.DateColumn(required=True),
+            'Days': st.column_config.NumberColumn(help="Defaults to the calendar days requested", min_value=0.5),
+        },
+    )
+    pending = pending.dropna(subset=['Employee Name', 'Start Date', 'End Date'])
+    pending = pending[pd.to_datetime(pending['End Date']) >= pd.to_datetime(pending['Start Date'])]
+    pending = pending.assign(
+        **{'Leave Type': pending['Leave Type'].fillna(leave_types[0]),
+           'Days': pending['Days'].fillna((pd.to_datetime(pending['End Date'])
+                                           - pd.to_datetime(pending['Start Date'])).dt.days + 1)})
+
+    result = simulator.simulate(start, end, pending, min_staff=min_staff, grant_probability=grant_probability)
+    if result.empty:
+        st.info("No business days in the chosen horizon")
+        return
+    risky = result[result['P(Below Minimum)'] >= 0.05]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Headcount", simulator.headcount)
+    col2.metric("Days at Risk (≥5%)", f"{len(risky)} of {len(result)}")
+    worst = result.loc[result['P(Below Minimum)'].idxmax()]
+    col3.metric("Worst Day", f"{worst['Date']:%d %b %Y}", f"{worst['P(Below Minimum)']:.0%} below minimum",
+                delta_color="off")
+    st.line_chart(result.set_index('Date')[['P(Below Minimum)']])
+    st.line_chart(result.set_index('Date')[['Expected Available', 'P5 Available']])
+    st.dataframe(
+        risky.sort_values('P(Below Minimum)', ascending=False).head(50),
+        use_container_width=True, hide_index=True,
+        column_config={
+            'Date': st.column_config.DateColumn(format="DD MMM YYYY"),
+            'Seasonal Rate': st.column_config.NumberColumn(format="percent"),
+            'P(Below Minimum)': st.column_config.NumberColumn(format="percent"),
+            'Expected Available': st.column_config.NumberColumn(format="%.1f"),
+        },
+    )
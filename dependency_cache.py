@@ -0,0 +1,133 @@
+"""Derived views tracked against the (employee, year, month) keys they read.
+
+Each cached view declares dependency patterns such as (name, 2025, None) for
+"this employee's 2025 leaves" or (None, 2025, 3) for "anyone's March 2025
+leaves". sync() diffs a new dataset against the last one and drops only the
+views whose patterns match a changed row, so one new leave re-renders one
+month and one employee's stats instead of everything.
+"""
+import threading
+from collections import OrderedDict
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+ANY = None
+
+
+def leave_keys(df, name_col='Name', date_col='Leave Date'):
+    """Distinct (employee, year, month) keys covered by day rows"""
+    if df.empty:
+        return set()
+    dates = pd.DatetimeIndex(df[date_col])
+    keys = pd.DataFrame({'e': df[name_col].to_numpy(), 'y': dates.year, 'm': dates.month}).drop_duplicates()
+    return set(zip(keys['e'], keys['y'].astype(int), keys['m'].astype(int)))
+
+
+def changed_keys(old, new, name_col='Name', date_col='Leave Date', columns=None):
+    """Keys of rows present in one frame but not the other, counting duplicates"""
+    columns = columns or list(new.columns)
+    old_hash = pd.util.hash_pandas_object(old[columns], index=False).to_numpy()
+    new_hash = pd.util.hash_pandas_object(new[columns], index=False).to_numpy()
+    _, inverse = np.unique(np.concatenate([old_hash, new_hash]), return_inverse=True)
+    weights = np.concatenate([-np.ones(len(old_hash)), np.ones(len(new_hash))])
+    changed = np.bincount(inverse, weights=weights)[inverse] != 0
+    rows = pd.concat([old[[name_col, date_col]], new[[name_col, date_col]]], ignore_index=True)
+    return leave_keys(rows[changed], name_col, date_col)
+
+
+class DependencyCache:
+    """Views keyed by (name, *args) and invalidated by the leave keys they depend on"""
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries
+        self.version = None
+        self.frame = None
+        self.stats = {'hits': 0, 'misses': 0, 'invalidated': 0}
+        self._values = OrderedDict()
+        self._deps = {}
+        self._index = {}
+        self._generation = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, key, deps, build, *args, version=None):
+        """Cached build(*args); deps is a list of (employee, year, month) patterns.
+
+        version is that of the data build reads; when it is not the version
+        last synced, the view is built but neither served from nor stored in
+        the cache, so a late prefetch or a session on another version cannot
+        leave a stale value behind.
+        """
+        with self._lock:
+            if version is not None and version != self.version:
+                self.stats['misses'] += 1
+                return build(*args)
+            if key in self._values:
+                self._values.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._values[key]
+            self.stats['misses'] += 1
+            generation = self._generation
+        value = build(*args)
+        with self._lock:
+            # Skip storing a value computed from data invalidated mid-build
+            if generation == self._generation:
+                self._values[key] = value
+                self._deps[key] = deps
+                for pattern in deps:
+                    self._index.setdefault(pattern, set()).add(key)
+                while self.max_entries and len(self._values) > self.max_entries:
+                    self._drop(next(iter(self._values)))
+        return value
+
+    def _drop(self, key):
+        self._values.pop(key, None)
+        for pattern in self._deps.pop(key, ()):
+            keys = self._index.get(pattern)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[pattern]
+
+    def invalidate(self, changed=None):
+        """Drop views depending on any changed (employee, year, month); None drops all"""
+        with self._lock:
+            self._generation += 1
+            if changed is None:
+                dropped = len(self._values)
+                self._values.clear()
+                self._deps.clear()
+                self._index.clear()
+            else:
+                stale = set()
+                for employee, year, month in changed:
+                    for pattern in product((employee, ANY), (year, ANY), (month, ANY)):
+                        stale |= self._index.get(pattern, set())
+                for key in stale:
+                    self._drop(key)
+                dropped = len(stale)
+            self.stats['invalidated'] += dropped
+            return dropped
+
+    def sync(self, frame, version, name_col='Name', date_col='Leave Date', columns=None, changes=None):
+        """Adopt a new dataset version, invalidating only views its changed rows touch.
+
+        changes(old_version, new_version) can supply the changed keys (e.g.
+        SnapshotStore.changed_keys) instead of hashing both frames.
+        """
+        with self._lock:
+            if version == self.version:
+                return set()
+            if self.frame is None:
+                changed = None
+            elif changes is not None:
+                changed = changes(self.version, version)
+            else:
+                changed = changed_keys(self.frame, frame, name_col, date_col, columns)
+            self.invalidate(changed)
+            self.frame, self.version = frame, version
+            return changed
@@ -0,0 +1,294 @@
+"""iCalendar (.ics) leave feeds per team and per employee.
+
+Events are rendered once per distinct leave interval and reused by the next
+data version; whole feeds are cached per (scope, key, data version) and carry
+an ETag/Last-Modified pair so polling clients get a 304 instead of a rebuild.
+Teams come from partitions.derive_teams unless the owner passes team_of.
+
+    python ical_feed.py --out feeds/           # write every feed to disk
+    python ical_feed.py --serve 8502           # serve /calendar/<scope>/<key>.ics
+
+Scopes are "team", "employee" and "all" (the single feed all/all.ics). Inside
+the leave tracker app, LEAVE_TRACKER_ICS_PORT serves the app's own dataset:
+the app publishes each version with publish(intervals, version, modified) and
+request threads only read that immutable snapshot.
+"""
+import argparse
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+import numpy as np
+import pandas as pd
+
+from partitions import derive_teams, load_team_mapping
+
+PRODID = "-//YED//Leave Tracker//EN"
+SCOPES = ("all", "team", "employee")
+
+# Servers started by serve_in_background, by (host, port)
+_servers = {}
+_servers_lock = threading.Lock()
+
+
+def _escape(text):
+    return (str(text).replace("\\", "\\\\").replace(";", "\\;")
+            .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def _fold(line):
+    """Fold content lines at 75 octets as RFC 5545 requires"""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line
+    parts, start = [], 0
+    while start < len(raw):
+        end = min(start + (75 if not parts else 74), len(raw))
+        while end < len(raw) and (raw[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(raw[start:end].decode("utf-8"))
+        start = end
+    return "\r\n ".join(parts)
+
+
+def feed_key(value):
+    """URL/file-safe key for a team or employee"""
+    return str(value).strip().lower().replace(" ", "-")
+
+
+class IcalFeedBuilder:
+    """Builds and caches .ics feeds from an interval leave dataset"""
+
+    def __init__(self, max_feeds=256, team_of=None, mapping=None, mode=None):
+        # team_of(email) names an address's team; without it teams are derived
+        # from the team mapping or the addresses, as partitions does
+        self.max_feeds = max_feeds
+        self.team_of = team_of
+        self.mapping = load_team_mapping() if mapping is None and team_of is None else mapping
+        self.mode = mode
+        self._events = {}
+        self._previous_events = {}
+        self._feeds = OrderedDict()
+        self._groups = {}
+        self._dataset = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self):
+        return self._dataset[1] if self._dataset is not None else None
+
+    def publish(self, intervals, version, modified=None):
+        """Make (intervals, version, modified) the dataset served over HTTP"""
+        self._dataset = (intervals, version, modified)
+
+    def dataset(self):
+        """The published (intervals, version, modified); LookupError before the first publish"""
+        dataset = self._dataset
+        if dataset is None:
+            raise LookupError("no leave data has been published yet")
+        return dataset
+
+    def _event(self, email, name, leave_type, start, end, days, stamp):
+        uid = hashlib.sha1(f"{email}|{name}|{leave_type}|{start:%Y%m%d}|{end:%Y%m%d}|{days}".encode()).hexdigest()
+        event = self._events.get(uid)
+        if event is None:
+            event = self._previous_events.get(uid)
+        if event is None:
+            lines = [
+                "BEGIN:VEVENT",
+                f"UID:{uid}@leave-tracker",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART;VALUE=DATE:{start:%Y%m%d}",
+                f"DTEND;VALUE=DATE:{end + timedelta(days=1):%Y%m%d}",
+                f"SUMMARY:{_escape(f'{name} – {leave_type}')}",
+                f"DESCRIPTION:{_escape(f'{days:g} day(s) of {leave_type}')}",
+                "TRANSP:TRANSPARENT",
+                "END:VEVENT",
+            ]
+            event = "\r\n".join(_fold(line) for line in lines)
+        self._events[uid] = event
+        return event
+
+    def _grouped(self, intervals, version):
+        """Row positions per team and per employee, computed once per version.
+
+        Events rendered for the previous version stay reusable until the next
+        one, so the event cache holds at most two versions' intervals.
+        """
+        groups = self._groups.get(version)
+        if groups is None:
+            emails = intervals['Email'].fillna(intervals['Employee Name']).map(feed_key)
+            if self.team_of is None:
+                teams = derive_teams(intervals['Email'], self.mapping, self.mode).map(feed_key)
+            else:
+                teams = emails.map(lambda e: feed_key(self.team_of(e)))
+            groups = {
+                "all": {"all": np.arange(len(intervals))},
+                "employee": emails.groupby(emails).indices,
+                "team": teams.groupby(teams).indices,
+            }
+            self._groups = {version: groups}
+            self._previous_events, self._events = self._events, {}
+        return groups
+
+    def keys(self, intervals, version, scope):
+        return sorted(self._grouped(intervals, version)[scope])
+
+    def feed(self, intervals, version, scope, key, modified=None):
+        """(body, etag, last_modified) for one team or employee feed, or None if unknown"""
+        cache_key = (scope, key, version)
+        with self._lock:
+            cached = self._feeds.get(cache_key)
+            if cached is not None:
+                self._feeds.move_to_end(cache_key)
+                return cached
+            positions = self._grouped(intervals, version)[scope].get(key)
+            if positions is None:
+                return None
+            modified = (modified or datetime.now(timezone.utc)).replace(microsecond=0)
+            stamp = modified.strftime("%Y%m%dT%H%M%SZ")
+            rows = intervals.iloc[positions]
+            events = [
+                self._event(email, name, leave_type, pd.Timestamp(start), pd.Timestamp(end), float(days), stamp)
+                for email, name, leave_type, start, end, days in zip(
+                    rows['Email'], rows['Employee Name'], rows['Leave Type'],
+                    rows['Start Date'], rows['End Date'], rows['Days'])
+            ]
+            body = "\r\n".join([
+                "BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN",
+                _fold(f"X-WR-CALNAME:{_escape(f'Leave – {key}')}"),
+                *events,
+                "END:VCALENDAR",
+            ]) + "\r\n"
+            etag = '"' + hashlib.sha1(body.encode()).hexdigest()[:20] + '"'
+            cached = self._feeds[cache_key] = (body.encode("utf-8"), etag, modified)
+            while len(self._feeds) > self.max_feeds:
+                self._feeds.popitem(last=False)
+            return cached
+
+    def write_all(self, intervals, version, directory, modified=None):
+        """Write every team and employee feed under directory, skipping unchanged files"""
+        written = 0
+        for scope in SCOPES:
+            os.makedirs(os.path.join(directory, scope), exist_ok=True)
+            for key in self.keys(intervals, version, scope):
+                body, _, _ = self.feed(intervals, version, scope, key, modified)
+                path = os.path.join(directory, scope, f"{key}.ics")
+                if os.path.exists(path):
+                    with open(path, "rb") as fh:
+                        if fh.read() == body:
+                            continue
+                with open(path + ".tmp", "wb") as fh:
+                    fh.write(body)
+                os.replace(path + ".tmp", path)
+                written += 1
+        return written
+
+
+def make_handler(builder, get_dataset=None):
+    """Request handler class; get_dataset() returns (intervals, version, modified).
+
+    Without get_dataset the handler serves what the owner last published.
+    """
+    get_dataset = get_dataset or builder.dataset
+
+    class FeedHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = unquote(self.path.split("?", 1)[0]).strip("/").split("/")
+            if len(parts) != 3 or parts[0] != "calendar" or parts[1] not in SCOPES \
+                    or not parts[2].endswith(".ics"):
+                self.send_error(404)
+                return
+            try:
+                intervals, version, modified = get_dataset()
+            except LookupError:
+                self.send_error(503)
+                return
+            result = builder.feed(intervals, version, parts[1], parts[2][:-4], modified)
+            if result is None:
+                self.send_error(404)
+                return
+            body, etag, last_modified = result
+            if self._not_modified(etag, last_modified):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/calendar; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", format_datetime(last_modified, usegmt=True))
+            self.send_header("Cache-Control", "max-age=300")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _not_modified(self, etag, last_modified):
+            if_none_match = self.headers.get("If-None-Match")
+            if if_none_match is not None:
+                return etag in [t.strip() for t in if_none_match.split(",")] or if_none_match.strip() == "*"
+            if_modified_since = self.headers.get("If-Modified-Since")
+            if if_modified_since:
+                try:
+                    return last_modified <= parsedate_to_datetime(if_modified_since)
+                except (TypeError, ValueError):
+                    return False
+            return False
+
+        def log_message(self, format, *args):
+            pass
+
+    return FeedHandler
+
+
+def serve_in_background(builder, get_dataset=None, host="127.0.0.1", port=8502):
+    """Start the feed server on a daemon thread and return it.
+
+    Calling it again for the same host and port (e.g. after the app's caches
+    were cleared) points the running server at the new arguments instead of
+    binding the port twice.
+    """
+    with _servers_lock:
+        server = _servers.get((host, port))
+        if server is not None:
+            server.RequestHandlerClass = make_handler(builder, get_dataset)
+            return server
+        server = _servers[(host, port)] = ThreadingHTTPServer((host, port), make_handler(builder, get_dataset))
+    threading.Thread(target=server.serve_forever, name="ical-feed", daemon=True).start()
+    return server
+
+
+def _workbook_dataset():
+    from leave_data import read_tracker_workbook, workbook_path, workbook_version
+    from leave_intervals import coalesce_leave_days
+    path = workbook_path()
+    intervals = coalesce_leave_days(read_tracker_workbook(path))
+    modified = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+    return intervals, workbook_version(path), modified
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export leave calendars as iCalendar feeds")
+    parser.add_argument("--out", help="directory to write team/ and employee/ feeds into")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="serve feeds over HTTP on this port")
+    parser.add_argument("--host", default="127.0.0.1")
+    args = parser.parse_args(argv)
+
+    builder = IcalFeedBuilder()
+    dataset = _workbook_dataset()
+    if args.out:
+        print(f"{builder.write_all(*dataset[:2], args.out, dataset[2])} feed(s) written to {args.out}")
+    if args.serve:
+        builder.publish(*dataset)
+        server = ThreadingHTTPServer((args.host, args.serve), make_handler(builder))
+        print(f"Serving feeds on http://{args.host}:{args.serve}/calendar/<team|employee>/<key>.ics")
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Vectorised aggregations over interval leave records"""
+import numpy as np
+import pandas as pd
+
+
+def monthly_leave_days(df, name_col='Employee Name', start_col='Start Date',
+                       end_col='End Date', days_col='Days'):
+    """Leave days per employee and month, splitting each leave at month boundaries.
+
+    A leave's Days are spread evenly over its calendar span, so a Jan 30 - Feb 3
+    leave contributes 2 days to January and 3 to February.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=[name_col, 'Month', 'Days'])
+    starts = df[start_col].to_numpy().astype('datetime64[D]')
+    ends = df[end_col].to_numpy().astype('datetime64[D]')
+    first_month = starts.astype('datetime64[M]')
+    month_count = (ends.astype('datetime64[M]') - first_month).astype(np.int64) + 1
+
+    # One segment per (leave, month touched)
+    row = np.repeat(np.arange(len(df)), month_count)
+    offset = np.arange(len(row)) - np.repeat(np.cumsum(month_count) - month_count, month_count)
+    month = first_month[row] + offset.astype('timedelta64[M]')
+    seg_start = np.maximum(starts[row], month.astype('datetime64[D]'))
+    seg_end = np.minimum(ends[row], (month + 1).astype('datetime64[D]') - 1)
+    seg_days = (seg_end - seg_start).astype(np.int64) + 1
+
+    span = (ends - starts).astype(np.int64) + 1
+    weight = df[days_col].to_numpy(dtype=float) / span
+
+    segments = pd.DataFrame({
+        name_col: df[name_col].to_numpy()[row],
+        'Month': pd.PeriodIndex(month, freq='M').astype(str),
+        'Days': seg_days * weight[row],
+    })
+    return segments.groupby([name_col, 'Month'], as_index=False, sort=True)['Days'].sum()
+
+
+def monthly_leave_days_by_employee(df, name_col='Employee Name', **columns):
+    """monthly_leave_days split into one small frame per employee"""
+    cube = monthly_leave_days(df, name_col=name_col, **columns)
+    return {
+        name: group.drop(columns=[name_col]).reset_index(drop=True)
+        for name, group in cube.groupby(name_col, sort=False)
+    }
+
+
+def bin_monthly_days(monthly, max_bars=24):
+    """Re-bucket a Month/Days frame into quarters or years when it has too many bars"""
+    if len(monthly) <= max_bars:
+        return monthly
+    periods = pd.PeriodIndex(monthly['Month'], freq='M')
+    freq = 'Q' if periods.asfreq('Q').nunique() <= max_bars else 'Y'
+    binned = monthly.assign(Month=periods.asfreq(freq).astype(str))
+    return binned.groupby('Month', as_index=False, sort=True)['Days'].sum()
@@ -0,0 +1,363 @@
+"""Local JSON query API over the in-memory leave dataset.
+
+Answers the questions other tools used to scrape the workbook for, from
+indexes built once per data version; every answer is cached as JSON text per
+(data version, query), so repeated queries are a dict lookup.
+
+    GET  /api/version
+    GET  /api/out?date=2025-03-03[&team=...]             who is out on a day
+    GET  /api/out?start=2025-03-01&end=2025-03-31        ... or over a range
+    GET  /api/stats?employee=Jane Doe&year=2025          employee stats for a year
+    GET  /api/coverage?team=...&start=...&end=...        daily team coverage
+    POST /api/query  {"queries": [{"type": "out", "date": "2025-03-03"}, ...]}
+
+    python leave_api.py --serve 8503       # standalone, reloads when the workbook changes
+
+Inside the leave tracker app, LEAVE_TRACKER_API_PORT serves the app's own
+dataset instead: the app publishes each version with snapshot(rows, version)
+and request threads only read that immutable snapshot.
+"""
+import argparse
+import calendar
+import json
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from leave_data import DURATION_LABELS
+from partitions import derive_teams, load_team_mapping
+
+QUERY_TYPES = ("out", "stats", "coverage")
+MAX_BATCH = 500
+# Accepted JSON types of query parameters, as (types, description)
+FIELD_TYPES = {
+    "date": (str, "a date string"), "start": (str, "a date string"), "end": (str, "a date string"),
+    "team": (str, "a string"), "employee": (str, "a string"),
+    "year": ((int, str), "a number"), "weekends": (bool, "true or false"),
+}
+
+# Servers started by serve_in_background, by (host, port)
+_servers = {}
+_servers_lock = threading.Lock()
+
+
+class QueryError(ValueError):
+    """A malformed query; reported per query instead of failing the batch"""
+
+
+def _day(value, field):
+    try:
+        return np.datetime64(pd.Timestamp(value).date(), 'D')
+    except (TypeError, ValueError):
+        raise QueryError(f"'{field}' must be a date like 2025-03-03, got {value!r}")
+
+
+def _range(query):
+    if "date" in query:
+        start = end = _day(query["date"], "date")
+    elif "start" in query:
+        start = _day(query["start"], "start")
+        end = _day(query.get("end", query["start"]), "end")
+    else:
+        raise QueryError("give 'date' or 'start' (and optionally 'end')")
+    if end < start:
+        raise QueryError("'end' is before 'start'")
+    if (end - start).astype(int) > 3660:
+        raise QueryError("date ranges are limited to 10 years")
+    return start, end
+
+
+def _check_types(query):
+    for field, (types, description) in FIELD_TYPES.items():
+        value = query.get(field)
+        if value is not None and not isinstance(value, types):
+            raise QueryError(f"'{field}' must be {description}, got {value!r}")
+
+
+def _key(name):
+    return str(name).strip().casefold()
+
+
+class _Snapshot:
+    """Arrays and lookups for one data version, ordered by leave date"""
+
+    def __init__(self, rows, mapping=None, mode=None):
+        rows = rows.sort_values('Leave Date', kind='stable')
+        duration = rows['Duration']
+        self.names = rows['Name'].to_numpy(dtype=object)
+        self.emails = rows['Email'].to_numpy(dtype=object)
+        self.types = rows['Leave Type'].to_numpy(dtype=object)
+        self.dates = rows['Leave Date'].to_numpy().astype('datetime64[D]')
+        self.days = pd.to_numeric(duration.map(DURATION_LABELS).fillna(duration), errors='coerce').to_numpy(dtype=float)
+        self.teams = derive_teams(rows['Email'], mapping, mode).to_numpy(dtype=object)
+        keys = pd.Series([_key(n) for n in self.names])
+        self.by_employee = keys.groupby(keys).indices if len(keys) else {}
+        self.members = {team: sorted(set(self.names[self.teams == team])) for team in np.unique(self.teams)}
+
+    def bounds(self, start, end):
+        return (int(np.searchsorted(self.dates, start, 'left')),
+                int(np.searchsorted(self.dates, end + 1, 'left')))
+
+    def team_mask(self, lo, hi, team):
+        if team is None:
+            return np.ones(hi - lo, dtype=bool)
+        if team not in self.members:
+            raise QueryError(f"unknown team {team!r}")
+        return self.teams[lo:hi] == team
+
+    def out(self, query):
+        start, end = _range(query)
+        lo, hi = self.bounds(start, end)
+        positions = lo + np.flatnonzero(self.team_mask(lo, hi, query.get("team")))
+        return {
+            "start": str(start), "end": str(end),
+            "count": len(set(self.names[positions])),
+            "leaves": [
+                {"date": str(d), "name": n, "email": e, "leave_type": t, "days": float(x)}
+                for d, n, e, t, x in zip(self.dates[positions], self.names[positions], self.emails[positions],
+                                         self.types[positions], self.days[positions])
+            ],
+        }
+
+    def stats(self, query):
+        if not query.get("employee"):
+            raise QueryError("'employee' is required")
+        try:
+            year = int(query["year"])
+        except (KeyError, TypeError, ValueError):
+            raise QueryError("'year' must be a number")
+        positions = self.by_employee.get(_key(query["employee"]))
+        if positions is None:
+            raise QueryError(f"unknown employee {query['employee']!r}")
+        dates = self.dates[positions]
+        positions = positions[(dates >= np.datetime64(f"{year}-01-01")) & (dates < np.datetime64(f"{year + 1}-01-01"))]
+        days, types = self.days[positions], self.types[positions]
+        months = self.dates[positions].astype('datetime64[M]').astype(int) % 12
+        leave_types = pd.Series(days).groupby(types).sum().to_dict() if len(positions) else {}
+        return {
+            "employee": str(self.names[positions[0]]) if len(positions) else query["employee"],
+            "year": year,
+            "total_leaves": int(len(positions)),
+            "total_days": float(days.sum()),
+            "full_days": int((days == 1.0).sum()),
+            "half_days": int((days == 0.5).sum()),
+            "leave_types": {str(t): float(d) for t, d in leave_types.items()},
+            "monthly_days": {calendar.month_abbr[m + 1]: float(d)
+                             for m, d in enumerate(np.bincount(months, weights=days, minlength=12))},
+        }
+
+    def coverage(self, query):
+        team = query.get("team")
+        if team is None:
+            raise QueryError("'team' is required")
+        start, end = _range(query)
+        lo, hi = self.bounds(start, end)
+        positions = lo + np.flatnonzero(self.team_mask(lo, hi, team))
+        headcount = len(self.members[team])
+        span = (end - start).astype(int) + 1
+        offsets = (self.dates[positions] - start).astype(int)
+        absent = np.bincount(offsets, weights=self.days[positions], minlength=span)
+        calendar_days = start + np.arange(span)
+        keep = np.ones(span, dtype=bool) if query.get("weekends") else np.is_busday(calendar_days)
+        return {
+            "team": team, "headcount": headcount,
+            "days": [
+                {"date": str(d), "absent_days": float(a), "available": float(headcount - a),
+                 "coverage": round((headcount - a) / headcount, 4) if headcount else None}
+                for d, a in zip(calendar_days[keep], absent[keep])
+            ],
+        }
+
+
+class LeaveQueryService:
+    """Answers batched leave queries against the current data version"""
+
+    def __init__(self, get_rows=None, max_answers=4096, mapping=None, mode=None):
+        # get_rows() returns (day rows, version) and is called once per request;
+        # without it the owner publishes every version with snapshot(rows, version)
+        self.get_rows = get_rows
+        self.max_answers = max_answers
+        self.mapping = load_team_mapping() if mapping is None else mapping
+        self.mode = mode
+        self.stats = {'hits': 0, 'misses': 0}
+        self._snapshot = (None, None)
+        self._answers = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def version(self):
+        return self._snapshot[0]
+
+    def snapshot(self, rows=None, version=None):
+        """(version, indexes) of the current data, or of rows/version when the caller has them.
+
+        Raises LookupError when nothing has been published yet.
+        """
+        if version is None:
+            if self.get_rows is None:
+                version, snapshot = self._snapshot
+                if snapshot is None:
+                    raise LookupError("no leave data has been published yet")
+                return version, snapshot
+            rows, version = self.get_rows()
+        current_version, snapshot = self._snapshot
+        if version != current_version or snapshot is None:
+            snapshot = _Snapshot(rows, self.mapping, self.mode)
+            with self._lock:
+                self._snapshot = (version, snapshot)
+                # Answers are keyed by version, older ones can never be hit again
+                self._answers.clear()
+        return version, snapshot
+
+    def answer(self, query, version=None, snapshot=None):
+        """JSON text answering one query dict"""
+        if version is None:
+            version, snapshot = self.snapshot()
+        if not isinstance(query, dict) or query.get("type") not in QUERY_TYPES:
+            raise QueryError(f"each query needs a 'type' of {', '.join(QUERY_TYPES)}")
+        _check_types(query)
+        cache_key = (version, json.dumps(query, sort_keys=True, default=str))
+        with self._lock:
+            cached = self._answers.get(cache_key)
+            if cached is not None:
+                self._answers.move_to_end(cache_key)
+                self.stats['hits'] += 1
+                return cached
+            self.stats['misses'] += 1
+        body = json.dumps(getattr(snapshot, query["type"])(query))
+        with self._lock:
+            self._answers[cache_key] = body
+            while len(self._answers) > self.max_answers:
+                self._answers.popitem(last=False)
+        return body
+
+    def batch(self, queries):
+        """JSON text of {"version", "results"}; a bad query yields {"error"} in its slot"""
+        if not isinstance(queries, list):
+            raise QueryError("'queries' must be a list")
+        if len(queries) > MAX_BATCH:
+            raise QueryError(f"at most {MAX_BATCH} queries per request")
+        version, snapshot = self.snapshot()
+        results = []
+        for query in queries:
+            try:
+                results.append(self.answer(query, version, snapshot))
+            except QueryError as e:
+                results.append(json.dumps({"error": str(e)}))
+        return '{"version": %s, "results": [%s]}' % (json.dumps(str(version)), ", ".join(results))
+
+
+def make_handler(service):
+    """Request handler class answering /api/* from service"""
+
+    class QueryHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            name = url.path.rstrip("/")
+            if name == "/api/version":
+                try:
+                    version, _ = service.snapshot()
+                except LookupError as e:
+                    self._send(503, json.dumps({"error": str(e)}))
+                    return
+                self._send(200, json.dumps({"version": str(version)}))
+                return
+            if not name.startswith("/api/") or name[5:] not in QUERY_TYPES:
+                self._send(404, json.dumps({"error": "not found"}))
+                return
+            query = dict(parse_qsl(url.query), type=name[5:])
+            if query.get("weekends") is not None:
+                query["weekends"] = query["weekends"].lower() in ("1", "true", "yes")
+            try:
+                self._send(200, service.answer(query))
+            except QueryError as e:
+                self._send(400, json.dumps({"error": str(e)}))
+            except LookupError as e:
+                self._send(503, json.dumps({"error": str(e)}))
+            except Exception as e:
+                self._send(500, json.dumps({"error": f"{type(e).__name__}: {e}"}))
+
+        def do_POST(self):
+            if urlsplit(self.path).path.rstrip("/") != "/api/query":
+                self._send(404, json.dumps({"error": "not found"}))
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                queries = payload.get("queries") if isinstance(payload, dict) else payload
+                self._send(200, service.batch(queries))
+            except (ValueError, QueryError) as e:
+                self._send(400, json.dumps({"error": str(e)}))
+            except LookupError as e:
+                self._send(503, json.dumps({"error": str(e)}))
+            except Exception as e:
+                self._send(500, json.dumps({"error": f"{type(e).__name__}: {e}"}))
+
+        def _send(self, status, body):
+            body = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return QueryHandler
+
+
+def serve_in_background(service, host="127.0.0.1", port=8503):
+    """Start the query server on a daemon thread and return it.
+
+    Calling it again for the same host and port (e.g. after the app's caches
+    were cleared) points the running server at the new arguments instead of
+    binding the port twice.
+    """
+    with _servers_lock:
+        server = _servers.get((host, port))
+        if server is not None:
+            server.RequestHandlerClass = make_handler(service)
+            return server
+        server = _servers[(host, port)] = ThreadingHTTPServer((host, port), make_handler(service))
+    threading.Thread(target=server.serve_forever, name="leave-api", daemon=True).start()
+    return server
+
+
+def workbook_rows():
+    """get_rows for the standalone server: rereads the workbook only when it changes"""
+    from leave_data import read_tracker_workbook, workbook_path, workbook_version
+    cached = {}
+    lock = threading.Lock()
+
+    def get_rows():
+        path = workbook_path()
+        version = workbook_version(path)
+        with lock:
+            if cached.get("version") != version:
+                cached["rows"], cached["version"] = read_tracker_workbook(path), version
+            return cached["rows"], version
+
+    return get_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve leave queries as JSON")
+    parser.add_argument("--serve", type=int, default=8503, metavar="PORT")
+    parser.add_argument("--host", default="127.0.0.1")
+    args = parser.parse_args(argv)
+
+    service = LeaveQueryService(workbook_rows())
+    service.snapshot()
+    server = ThreadingHTTPServer((args.host, args.serve), make_handler(service))
+    print(f"Serving leave queries on http://{args.host}:{args.serve}/api/")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
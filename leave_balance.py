@@ -0,0 +1,237 @@
+"""Per-employee, per-type leave balances maintained incrementally"""
+import threading
+from datetime import date, datetime
+
+import pandas as pd
+
+# Yearly allocation per leave type. 'monthly' types accrue allocation/12 at the
+# start of each month, 'annual' types are credited in full on 1 January.
+# carry_over caps how much of last year's unused balance rolls forward.
+DEFAULT_POLICIES = {
+    'Earned Leave': {'allocation': 18, 'accrual': 'monthly', 'carry_over': 30},
+    'Casual Leave': {'allocation': 12, 'accrual': 'monthly', 'carry_over': 0},
+    'Sick Leave': {'allocation': 12, 'accrual': 'annual', 'carry_over': 0},
+    'Personal Leave': {'allocation': 6, 'accrual': 'annual', 'carry_over': 0},
+    'Emergency Leave': {'allocation': 3, 'accrual': 'annual', 'carry_over': 0},
+    'Joining Transfer Leave': {'allocation': 5, 'accrual': 'annual', 'carry_over': 0},
+}
+
+# Other spellings found in the data, counted under the policy's name
+LEAVE_TYPE_ALIASES = {
+    'Joining-Transfer Leave': 'Joining Transfer Leave',
+}
+
+BALANCE_COLUMNS = [
+    'Employee Name', 'Leave Type', 'Allocation', 'Accrued', 'Carry Over',
+    'Used', 'Pending', 'Available'
+]
+
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def canonical_leave_type(leave_type):
+    return LEAVE_TYPE_ALIASES.get(leave_type, leave_type)
+
+
+def _split_by_year(start, end, days):
+    """Spread a leave's days over the calendar years it touches"""
+    if start.year == end.year:
+        return {start.year: days}
+    total = (end - start).days + 1
+    parts = {}
+    for year in range(start.year, end.year + 1):
+        seg_start = max(start, date(year, 1, 1))
+        seg_end = min(end, date(year, 12, 31))
+        parts[year] = days * ((seg_end - seg_start).days + 1) / total
+    return parts
+
+
+class LeaveBalanceLedger:
+    """Running used/pending totals keyed by (employee, leave type, year).
+
+    Every record/approve/cancel touches a constant number of counters, so a
+    balance lookup never has to rescan the leave history.
+    """
+
+    def __init__(self, policies=None, start_year=None):
+        """start_year is when the policies took effect; without it an employee
+        accrues from the first year they appear in the data, whatever the type"""
+        self.policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        self.start_year = start_year
+        self._used = {}
+        self._pending = {}
+        self._first_year = {}
+        self._carry = {}
+        self.employees = set()
+        self.version = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_frame(cls, df, name_col='Employee Name', type_col='Leave Type',
+                   start_col='Start Date', end_col='End Date', days_col='Days',
+                   policies=None, start_year=None):
+        ledger = cls(policies, start_year)
+        ledger.record_frame(df, name_col, type_col, start_col, end_col, days_col)
+        return ledger
+
+    def record_frame(self, df, name_col='Employee Name', type_col='Leave Type',
+                     start_col='Start Date', end_col='End Date', days_col='Days'):
+        """Record a batch of approved leaves, e.g. freshly ingested rows"""
+        if df.empty:
+            return
+        end_values = df[end_col] if end_col else df[start_col]
+        for name, leave_type, start, end, days in zip(
+                df[name_col], df[type_col], df[start_col], end_values, df[days_col]):
+            self.record(name, leave_type, start, end, days)
+
+    def cancel_frame(self, df, name_col='Employee Name', type_col='Leave Type',
+                     start_col='Start Date', end_col='End Date', days_col='Days'):
+        """Remove a batch of previously recorded leaves"""
+        if df.empty:
+            return
+        end_values = df[end_col] if end_col else df[start_col]
+        for name, leave_type, start, end, days in zip(
+                df[name_col], df[type_col], df[start_col], end_values, df[days_col]):
+            self.cancel(name, leave_type, start, end, days)
+
+    def sync(self, frame, version, changes=None, name_col='Employee Name', type_col='Leave Type',
+             start_col='Start Date', end_col='End Date', days_col='Days'):
+        """Move to another data version; returns self.
+
+        changes(old_version, new_version) gives (added, removed) rows, e.g.
+        SnapshotStore.diff, so only the delta is recorded and cancelled.
+        Without it, or on the first sync, the ledger is rebuilt from frame.
+        """
+        columns = (name_col, type_col, start_col, end_col, days_col)
+        with self._lock:
+            if version == self.version:
+                return self
+            if changes is None or self.version is None:
+                self._used, self._pending, self._first_year, self._carry = {}, {}, {}, {}
+                self.record_frame(frame, *columns)
+            else:
+                added, removed = changes(self.version, version)
+                self.cancel_frame(removed, *columns)
+                self.record_frame(added, *columns)
+            self.employees = set(frame[name_col].dropna())
+            self.version = version
+        return self
+
+    def _bump(self, counters, employee, leave_type, start, end, days):
+        start, end = _to_date(start), _to_date(end)
+        if days is None:
+            days = (end - start).days + 1
+        self.employees.add(employee)
+        leave_type = canonical_leave_type(leave_type)
+        key = (employee, leave_type)
+        first = self._first_year.get(employee)
+        if first is None or start.year < first:
+            self._first_year[employee] = start.year
+            # Every type's carry-over chain now starts earlier
+            self._carry = {k: v for k, v in self._carry.items() if k[0] != employee}
+        for year, share in _split_by_year(start, end, float(days)).items():
+            counters[(employee, leave_type, year)] = counters.get((employee, leave_type, year), 0.0) + share
+        self._carry.pop(key, None)
+
+    def record(self, employee, leave_type, start, end=None, days=None, pending=False):
+        """Add one leave to the used (or pending) totals"""
+        end = start if end is None else end
+        self._bump(self._pending if pending else self._used,
+                   employee, leave_type, start, end, days)
+
+    def approve(self, employee, leave_type, start, end=None, days=None):
+        """Move a pending leave into the used totals"""
+        self.cancel(employee, leave_type, start, end, days, pending=True)
+        self.record(employee, leave_type, start, end, days)
+
+    def cancel(self, employee, leave_type, start, end=None, days=None, pending=False):
+        """Remove a previously recorded leave"""
+        end = start if end is None else end
+        if days is not None:
+            days = -float(days)
+        else:
+            days = -float((_to_date(end) - _to_date(start)).days + 1)
+        self._bump(self._pending if pending else self._used,
+                   employee, leave_type, start, end, days)
+
+    def accrued(self, leave_type, year, as_of):
+        policy = self.policies.get(canonical_leave_type(leave_type))
+        if policy is None or as_of.year < year:
+            return 0.0
+        allocation = float(policy['allocation'])
+        if as_of.year > year or policy.get('accrual') != 'monthly':
+            return allocation
+        return allocation * as_of.month / 12
+
+    def carry_over(self, employee, leave_type, year):
+        """Unused balance brought forward into `year`, capped by policy"""
+        leave_type = canonical_leave_type(leave_type)
+        policy = self.policies.get(leave_type)
+        key = (employee, leave_type)
+        first = self.start_year if self.start_year is not None else self._first_year.get(employee)
+        if policy is None or not policy.get('carry_over') or first is None or year <= first:
+            return 0.0
+        cache = self._carry.setdefault(key, {})
+        if year in cache:
+            return cache[year]
+        carry = cache.get(year - 1)
+        start = year - 1 if carry is not None else first
+        carry = 0.0 if carry is None else carry
+        for y in range(start, year):
+            remaining = (float(policy['allocation']) + carry
+                         - self._used.get((employee, leave_type, y), 0.0))
+            carry = min(float(policy['carry_over']), max(0.0, remaining))
+            cache[y + 1] = carry
+        return carry
+
+    def balance(self, employee, leave_type, as_of=None):
+        """Balance snapshot for the year of `as_of`, or None if the type is untracked"""
+        leave_type = canonical_leave_type(leave_type)
+        policy = self.policies.get(leave_type)
+        if policy is None:
+            return None
+        as_of = date.today() if as_of is None else _to_date(as_of)
+        year = as_of.year
+        accrued = self.accrued(leave_type, year, as_of)
+        carry = self.carry_over(employee, leave_type, year)
+        used = self._used.get((employee, leave_type, year), 0.0)
+        pending = self._pending.get((employee, leave_type, year), 0.0)
+        return {
+            'Employee Name': employee,
+            'Leave Type': leave_type,
+            'Allocation': float(policy['allocation']),
+            'Accrued': round(accrued, 2),
+            'Carry Over': round(carry, 2),
+            'Used': used,
+            'Pending': pending,
+            'Available': round(accrued + carry - used - pending, 2),
+        }
+
+    def can_take(self, employee, leave_type, days, as_of=None):
+        """Return (allowed, available) for a request of `days`"""
+        snapshot = self.balance(employee, leave_type, as_of)
+        if snapshot is None:
+            return True, None
+        return days <= snapshot['Available'], snapshot['Available']
+
+    def employee_frame(self, employee, as_of=None):
+        rows = [self.balance(employee, leave_type, as_of) for leave_type in self.policies]
+        return pd.DataFrame(rows, columns=BALANCE_COLUMNS)
+
+    def to_frame(self, as_of=None, leave_types=None):
+        """Balances for every known employee, one row per tracked leave type"""
+        leave_types = list(self.policies) if leave_types is None else list(dict.fromkeys(
+            canonical_leave_type(t) for t in leave_types if canonical_leave_type(t) in self.policies
+        ))
+        rows = [
+            self.balance(employee, leave_type, as_of)
+            for employee in sorted(self.employees)
+            for leave_type in leave_types
+        ]
+        return pd.DataFrame(rows, columns=BALANCE_COLUMNS)
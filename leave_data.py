@@ -0,0 +1,99 @@
+"""Reading the Excel leave tracker shared by both apps"""
+import hashlib
+import os
+from io import BytesIO
+
+import pandas as pd
+
+from leave_dedup import SubmissionDeduplicator, TRACKER_KEYS
+
+WORKBOOK_NAME = "Leave Tracker (YED).xlsx"
+TRACKER_COLUMNS = ['Email', 'Name', 'Leave Date', 'Leave Type', 'Duration']
+# Excel date cells arrive as datetimes; text cells must use this format
+TRACKER_DATE_FORMAT = "%Y-%m-%d"
+VALID_DURATIONS = (1.0, 0.5)
+DURATION_LABELS = {'Full Day': 1.0, 'Half Day': 0.5}
+
+
+def workbook_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), WORKBOOK_NAME)
+
+
+def validate_tracker_rows(raw, date_format=TRACKER_DATE_FORMAT):
+    """Split tracker rows into (valid, quarantined) without looping over rows.
+
+    Valid rows keep the index of raw. Quarantined rows keep their original
+    values plus 'Row' (the spreadsheet row number, header being row 1) and
+    'Reason'.
+    """
+    names = raw['Name'].astype("string").str.strip()
+    types = raw['Leave Type'].astype("string").str.strip()
+    dates = pd.to_datetime(raw['Leave Date'], format=date_format, errors='coerce')
+    duration = raw['Duration']
+    duration = pd.to_numeric(duration.map(DURATION_LABELS).fillna(duration), errors='coerce')
+
+    checks = [
+        (names.isna() | (names == ""), "missing employee name"),
+        (types.isna() | (types == ""), "missing leave type"),
+        (dates.isna(), "invalid leave date"),
+        (~duration.isin(VALID_DURATIONS), "duration must be 1 or 0.5"),
+    ]
+    reasons = pd.Series("", index=raw.index)
+    for failed, reason in checks:
+        failed = failed.fillna(False).astype(bool)
+        reasons = reasons.where(~failed, reasons + "; " + reason)
+    bad = (reasons != "").to_numpy()
+
+    valid = pd.DataFrame({
+        'Email': raw['Email'].astype("string").str.strip().astype(object),
+        'Name': names.astype(object),
+        'Leave Date': dates,
+        'Leave Type': types.astype(object),
+        'Duration': duration,
+    })[~bad]
+    quarantined = raw[bad].assign(Row=raw.index[bad] + 2, Reason=reasons[bad].str.lstrip("; "))
+    return valid, quarantined.reset_index(drop=True)
+
+
+def read_tracker_rows(file, date_format=TRACKER_DATE_FORMAT, dedup_policy=None):
+    """(valid rows, quarantined rows) from the form export, Duration in days.
+
+    Resubmitted rows are collapsed by SubmissionDeduplicator, ordered by the
+    form's completion time, and reported in the quarantine as duplicates.
+    """
+    if hasattr(file, "read"):
+        file = BytesIO(file.read())
+    raw = pd.read_excel(file, engine="openpyxl")
+    df = raw.iloc[:, 3:]
+    if df.shape[1] != len(TRACKER_COLUMNS):
+        raise ValueError(f"Expected {len(TRACKER_COLUMNS) + 3} columns in the tracker sheet, "
+                         f"found {df.shape[1] + 3}")
+    df.columns = TRACKER_COLUMNS
+    valid, quarantined = validate_tracker_rows(df, date_format)
+
+    submitted = pd.to_datetime(raw.iloc[:, 2], errors='coerce').to_numpy()[valid.index]
+    dedup = SubmissionDeduplicator(TRACKER_KEYS, dedup_policy)
+    valid, duplicates, _ = dedup.add(valid, order=submitted)
+    if not duplicates.empty:
+        duplicates = df.loc[duplicates.index].assign(Row=duplicates.index + 2, Reason="duplicate submission")
+        quarantined = pd.concat([quarantined, duplicates]).sort_values('Row')
+    return valid.reset_index(drop=True), quarantined.reset_index(drop=True)
+
+
+def read_tracker_workbook(file, date_format=TRACKER_DATE_FORMAT):
+    """Read the form export into one row per leave date, skipping invalid rows"""
+    return read_tracker_rows(file, date_format)[0]
+
+
+def data_version(frame, parent=""):
+    """Content hash of `frame` chained onto the version it was appended to"""
+    digest = hashlib.sha1(parent.encode())
+    if not frame.empty:
+        digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def workbook_version(path):
+    """Cheap version token for a workbook on disk: modification time and size"""
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
@@ -0,0 +1,101 @@
+"""Content-hash deduplication of repeated leave submissions.
+
+Rows are keyed by a stable 64-bit hash of their normalised key columns, so a
+resubmitted form row matches the original whatever its Id, timestamps or
+spacing. The policy decides which copy survives:
+
+    LEAVE_TRACKER_DEDUP=latest   the most recent submission wins (default)
+    LEAVE_TRACKER_DEDUP=first    the original submission wins
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+TRACKER_KEYS = ['Email', 'Leave Date', 'Leave Type', 'Duration']
+POLICIES = ("latest", "first")
+
+
+def dedup_policy(policy=None):
+    policy = (policy or os.environ.get("LEAVE_TRACKER_DEDUP") or "latest").lower()
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown dedup policy '{policy}'. Use one of: {', '.join(POLICIES)}")
+    return policy
+
+
+def key_hashes(frame, keys):
+    """uint64 content hash per row of the normalised key columns.
+
+    Text is stripped and case-folded, dates truncated to the day and numbers
+    compared as floats. A missing Email falls back to the Name so rows of
+    different people without an address never collapse.
+    """
+    normalised = {}
+    for key in keys:
+        column = frame[key]
+        if key == 'Email' and 'Name' in frame.columns:
+            column = column.fillna(frame['Name'])
+        if pd.api.types.is_datetime64_any_dtype(column):
+            column = column.dt.normalize()
+        elif pd.api.types.is_numeric_dtype(column):
+            column = column.astype(float)
+        else:
+            column = column.astype("string").str.strip().str.casefold()
+        normalised[key] = column.reset_index(drop=True)
+    return pd.util.hash_pandas_object(pd.DataFrame(normalised), index=False).to_numpy()
+
+
+class SubmissionDeduplicator:
+    """Drops repeated submissions batch by batch, remembering only key hashes.
+
+    add() looks each batch row up in the set of hashes already accepted, so an
+    incremental batch never rescans the history. Under 'latest', a batch row
+    that repeats an earlier one is kept and the earlier row's hash is returned
+    as superseded for the caller to drop.
+    """
+
+    def __init__(self, keys=TRACKER_KEYS, policy=None):
+        self.keys = list(keys)
+        self.policy = dedup_policy(policy)
+        self.dropped = 0
+        self._seen = set()
+
+    def __len__(self):
+        return len(self._seen)
+
+    @classmethod
+    def from_frame(cls, df, keys=TRACKER_KEYS, policy=None):
+        """Deduplicator seeded with rows that are already stored"""
+        dedup = cls(keys, policy)
+        dedup._seen.update(key_hashes(df, dedup.keys).tolist() if not df.empty else [])
+        return dedup
+
+    def add(self, batch, order=None):
+        """(rows to keep, duplicate rows dropped, hashes of stored rows superseded).
+
+        order (e.g. submission times) decides which copy within the batch is
+        the first or latest; without it the batch's row order is used.
+        """
+        if batch.empty:
+            return batch, batch, np.empty(0, dtype=np.uint64)
+        hashes = key_hashes(batch, self.keys)
+        if order is None:
+            rank = np.arange(len(batch))
+        else:
+            rank = np.argsort(np.asarray(order), kind='stable')
+        keep = 'last' if self.policy == "latest" else 'first'
+        winners = np.sort(rank[~pd.Series(hashes[rank]).duplicated(keep=keep).to_numpy()])
+
+        seen_before = np.fromiter((h in self._seen for h in hashes[winners].tolist()),
+                                  dtype=bool, count=len(winners))
+        if self.policy == "latest":
+            accepted, superseded = winners, hashes[winners][seen_before]
+        else:
+            accepted, superseded = winners[~seen_before], np.empty(0, dtype=np.uint64)
+        self._seen.update(hashes[accepted].tolist())
+        self.dropped += len(superseded)
+
+        dropped = np.ones(len(batch), dtype=bool)
+        dropped[accepted] = False
+        self.dropped += int(dropped.sum())
+        return batch.iloc[accepted], batch[dropped], superseded
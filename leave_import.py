@@ -0,0 +1,73 @@
+"""Bulk import of historical leave records from CSV, xlsx or Parquet files"""
+import os
+
+import pandas as pd
+
+from leave_balance import DEFAULT_POLICIES, canonical_leave_type
+
+LEAVE_COLUMNS = ['Employee Name', 'Leave Type', 'Start Date', 'End Date', 'Days']
+LEAVE_TYPES = list(DEFAULT_POLICIES)
+
+
+def read_leave_file(file, name=None):
+    """Read an uploaded or on-disk leave file, picking the reader from its extension"""
+    name = name or getattr(file, "name", None) or str(file)
+    ext = os.path.splitext(name)[1].lower()
+    if ext == ".csv":
+        return pd.read_csv(file)
+    if ext in (".xlsx", ".xlsm"):
+        return pd.read_excel(file, engine="openpyxl")
+    if ext == ".parquet":
+        return pd.read_parquet(file)
+    raise ValueError(f"Unsupported file type '{ext}'. Use .csv, .xlsx or .parquet")
+
+
+def validate_leave_records(raw, leave_types=None, date_format=None):
+    """Split raw rows into (accepted, rejected) without looping over rows.
+
+    Leave types are matched after mapping known alternative spellings (e.g.
+    'Joining-Transfer Leave') to the policy name. Rejected rows keep their
+    original columns plus 'Row' (the spreadsheet row number, header being row
+    1, as in leave_data) and 'Reason'.
+    """
+    raw = raw.rename(columns=lambda c: str(c).strip())
+    missing = [c for c in ['Employee Name', 'Leave Type', 'Start Date'] if c not in raw.columns]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    leave_types = LEAVE_TYPES if leave_types is None else leave_types
+    names = raw['Employee Name'].astype("string").str.strip()
+    types = raw['Leave Type'].astype("string").str.strip()
+    types = types.map(canonical_leave_type, na_action='ignore').astype("string")
+    start = pd.to_datetime(raw['Start Date'], format=date_format, errors='coerce')
+    end_raw = raw['End Date'] if 'End Date' in raw.columns else raw['Start Date']
+    end = pd.to_datetime(end_raw, format=date_format, errors='coerce')
+    span = (end - start).dt.days + 1
+    if 'Days' in raw.columns:
+        days = pd.to_numeric(raw['Days'], errors='coerce').fillna(span)
+    else:
+        days = span.astype(float)
+
+    checks = [
+        (names.isna() | (names == ""), "missing employee name"),
+        (~types.isin(leave_types).fillna(False), "unknown leave type"),
+        (start.isna(), "invalid start date"),
+        (end.isna(), "invalid end date"),
+        (start > end, "start date after end date"),
+        ((start <= end) & ((days <= 0) | (days > span)), "days outside leave period"),
+    ]
+    reasons = pd.Series("", index=raw.index)
+    for failed, reason in checks:
+        failed = failed.fillna(False).astype(bool)
+        reasons = reasons.where(~failed, reasons + "; " + reason)
+    bad = reasons != ""
+
+    accepted = pd.DataFrame({
+        'Employee Name': names[~bad].astype(object),
+        'Leave Type': types[~bad].astype(object),
+        'Start Date': start[~bad],
+        'End Date': end[~bad],
+        'Days': days[~bad],
+    }).reset_index(drop=True)
+    rejected = raw[bad].assign(Row=raw.index[bad] + 2, Reason=reasons[bad].str.lstrip("; "))
+    return accepted, rejected.reset_index(drop=True)
@@ -0,0 +1,113 @@
+"""Convert between the tracker's one-row-per-day layout and Start/End intervals"""
+import numpy as np
+import pandas as pd
+
+INTERVAL_COLUMNS = ['Email', 'Employee Name', 'Leave Type', 'Start Date', 'End Date', 'Days']
+DAY_COLUMNS = ['Email', 'Name', 'Leave Date', 'Leave Type', 'Duration']
+DURATION_DAYS = {'Full Day': 1.0, 'Half Day': 0.5}
+
+
+def leave_days(duration):
+    """Days of leave per row of a Duration column, as float32.
+
+    'Full Day' and 'Half Day' count 1 and 0.5, numbers count as themselves and
+    anything else (blank or unreadable) counts 0.
+    """
+    mapped = duration.map(DURATION_DAYS)
+    return pd.to_numeric(mapped.fillna(duration), errors='coerce').fillna(0).to_numpy(dtype=np.float32)
+
+
+def coalesce_leave_days(rows, bridge_weekends=True, holidays=None):
+    """Merge consecutive full-day rows of the same employee and leave type into intervals.
+
+    With bridge_weekends, Friday followed by Monday counts as consecutive. Weekend
+    and half-day rows are never merged, so every multi-day interval holds only
+    business days and expand_leave_intervals can restore the rows exactly.
+    """
+    if rows.empty:
+        return pd.DataFrame(columns=INTERVAL_COLUMNS)
+    key = 'Email' if 'Email' in rows.columns else 'Name'
+    days = leave_days(rows['Duration']).astype(float)
+    rows = rows.assign(_days=days).sort_values([key, 'Leave Type', '_days', 'Leave Date'], kind='stable')
+
+    dates = rows['Leave Date'].to_numpy().astype('datetime64[D]')
+    days = rows['_days'].to_numpy()
+    holidays = [] if holidays is None else np.asarray(holidays, dtype='datetime64[D]')
+    is_bus = np.is_busday(dates, holidays=holidays)
+    same = np.zeros(len(rows), dtype=bool)
+    same[1:] = (
+        (rows[key].to_numpy()[1:] == rows[key].to_numpy()[:-1])
+        & (rows['Leave Type'].to_numpy()[1:] == rows['Leave Type'].to_numpy()[:-1])
+        & (days[1:] == 1.0) & (days[:-1] == 1.0)
+    )
+    prev = np.empty_like(dates)
+    prev[1:] = dates[:-1]
+    prev[0] = dates[0]
+    if bridge_weekends:
+        expected = np.busday_offset(dates, -1, roll='forward', holidays=holidays)
+        follows = is_bus & np.roll(is_bus, 1) & (prev == expected)
+    else:
+        follows = prev == dates - np.timedelta64(1, 'D')
+    run = np.cumsum(~(same & follows))
+
+    grouped = rows.assign(_run=run).groupby('_run', sort=False)
+    intervals = pd.DataFrame({
+        'Email': grouped['Email'].first() if 'Email' in rows.columns else None,
+        'Employee Name': grouped['Name'].first(),
+        'Leave Type': grouped['Leave Type'].first(),
+        'Start Date': grouped['Leave Date'].min(),
+        'End Date': grouped['Leave Date'].max(),
+        'Days': grouped['_days'].sum(),
+    })
+    return intervals.sort_values(['Start Date', 'Employee Name']).reset_index(drop=True)[INTERVAL_COLUMNS]
+
+
+def interval_day_counts(intervals, bridge_weekends=True, holidays=None):
+    """Rows expand_leave_intervals produces for each interval, in order.
+
+    With bridge_weekends that is the interval's business days; single days and
+    intervals with no business day in them (e.g. Saturday-Sunday) keep their
+    calendar days, as the tracker keeps weekend rows.
+    """
+    starts = intervals['Start Date'].to_numpy().astype('datetime64[D]')
+    ends = intervals['End Date'].to_numpy().astype('datetime64[D]')
+    calendar_days = (ends - starts).astype(np.int64) + 1
+    if not bridge_weekends:
+        return calendar_days
+    holidays = [] if holidays is None else np.asarray(holidays, dtype='datetime64[D]')
+    business_days = np.busday_count(starts, ends + 1, holidays=holidays)
+    return np.where(business_days == 0, calendar_days, business_days)
+
+
+def expand_leave_intervals(intervals, bridge_weekends=True, holidays=None):
+    """Inverse of coalesce_leave_days: one row per leave date.
+
+    An interval's Days are spread evenly over its rows, at most a full day
+    each: a Friday-Monday leave counted as 4 calendar days is a full day on
+    Friday and on Monday.
+    """
+    if intervals.empty:
+        return pd.DataFrame(columns=DAY_COLUMNS)
+    starts = intervals['Start Date'].to_numpy().astype('datetime64[D]')
+    holidays = [] if holidays is None else np.asarray(holidays, dtype='datetime64[D]')
+    calendar_days = (intervals['End Date'].to_numpy().astype('datetime64[D]') - starts).astype(np.int64) + 1
+    count = interval_day_counts(intervals, bridge_weekends, holidays)
+
+    row = np.repeat(np.arange(len(intervals)), count)
+    step = np.arange(len(row)) - np.repeat(np.cumsum(count) - count, count)
+    dates = starts[row] + step.astype('timedelta64[D]')
+    if bridge_weekends:
+        # Rows of intervals counted in business days step over weekends and holidays
+        by_business = (count != calendar_days)[row]
+        dates[by_business] = np.busday_offset(starts[row][by_business], step[by_business],
+                                              roll='forward', holidays=holidays)
+
+    duration = np.minimum(intervals['Days'].to_numpy(dtype=float) / count, 1.0)
+    email = intervals['Email'].to_numpy()[row] if 'Email' in intervals.columns else None
+    return pd.DataFrame({
+        'Email': email,
+        'Name': intervals['Employee Name'].to_numpy()[row],
+        'Leave Date': dates.astype('datetime64[ns]'),
+        'Leave Type': intervals['Leave Type'].to_numpy()[row],
+        'Duration': duration[row],
+    })
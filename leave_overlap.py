@@ -0,0 +1,95 @@
+"""Per-employee sorted leave intervals for submission-time conflict checks"""
+from bisect import bisect_right
+from datetime import date, datetime
+
+import pandas as pd
+
+
+def _ordinal(value):
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    return pd.Timestamp(value).date().toordinal()
+
+
+def _key(name):
+    return str(name).strip().casefold()
+
+
+class LeaveIntervalIndex:
+    """Disjoint, sorted day intervals per employee.
+
+    Overlapping or touching leaves are merged on insert, so the blocks are
+    ordered by both start and end and a conflict check is a single bisect.
+    """
+
+    def __init__(self):
+        self._starts = {}
+        self._ends = {}
+        self._names = {}
+
+    def __len__(self):
+        return sum(len(starts) for starts in self._starts.values())
+
+    @classmethod
+    def from_frame(cls, df, name_col='Employee Name', start_col='Start Date', end_col='End Date'):
+        index = cls()
+        index.add_frame(df, name_col, start_col, end_col)
+        return index
+
+    def add_frame(self, df, name_col='Employee Name', start_col='Start Date', end_col='End Date'):
+        if df.empty:
+            return
+        # Inserting in start order keeps every insert at the tail of its list
+        df = df.sort_values(start_col)
+        end_values = df[end_col] if end_col else df[start_col]
+        for name, start, end in zip(df[name_col], df[start_col], end_values):
+            self.add(name, start, end)
+
+    def add(self, employee, start, end=None):
+        key = _key(employee)
+        self._names.setdefault(key, str(employee).strip())
+        starts = self._starts.setdefault(key, [])
+        ends = self._ends.setdefault(key, [])
+        lo = _ordinal(start)
+        hi = lo if end is None else _ordinal(end)
+
+        # Absorb every block that overlaps or touches [lo, hi]
+        i = bisect_right(starts, hi + 1)
+        j = i
+        while j > 0 and ends[j - 1] >= lo - 1:
+            j -= 1
+        if j < i:
+            lo = min(lo, starts[j])
+            hi = max(hi, ends[i - 1])
+        starts[j:i] = [lo]
+        ends[j:i] = [hi]
+
+    def overlapping(self, employee, start, end=None):
+        """Existing leave blocks of `employee` that intersect [start, end]"""
+        key = _key(employee)
+        starts = self._starts.get(key)
+        if not starts:
+            return []
+        ends = self._ends[key]
+        lo = _ordinal(start)
+        hi = lo if end is None else _ordinal(end)
+        i = bisect_right(starts, hi) - 1
+        blocks = []
+        while i >= 0 and ends[i] >= lo:
+            blocks.append((date.fromordinal(starts[i]), date.fromordinal(ends[i])))
+            i -= 1
+        return blocks[::-1]
+
+    def is_out(self, employee, start, end=None):
+        return bool(self.overlapping(employee, start, end))
+
+    def employees_out(self, start, end=None, members=None, exclude=None):
+        """Names of employees (optionally limited to `members`) out in [start, end]"""
+        keys = self._starts if members is None else {_key(m) for m in members}
+        skip = None if exclude is None else _key(exclude)
+        return sorted(
+            self._names[key] for key in keys
+            if key != skip and key in self._starts and self.is_out(key, start, end)
+        )
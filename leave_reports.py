@@ -0,0 +1,158 @@
+"""Batch leave reports for every employee and team in one run.
+
+Loads the workbook once, then fans the per-employee and per-team reports out
+over a process pool; each worker receives the dataset once at start-up, not
+per report. Charts reuse the app's stats panel logic; one xlsx sheet per
+scope summarises everyone.
+
+    python leave_reports.py --year 2025                       # yearly, PNG
+    python leave_reports.py --year 2025 --month 3 --format pdf --out reports/
+    python leave_reports.py --year 2025 --team example.com --workers 4
+"""
+import argparse
+import calendar
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import pandas as pd
+
+from ical_feed import feed_key
+from leave_data import DURATION_LABELS, read_tracker_workbook, workbook_path
+from leave_stats import period_stats, draw_monthly_distribution, draw_leave_types
+from partitions import derive_teams, load_team_mapping
+
+FORMATS = ("png", "pdf")
+
+# Set in each worker by _init_worker
+_rows = None
+_groups = None
+
+
+def load_report_rows(path=None, mapping=None):
+    """Tracker rows with the app's duration labels and a Team column"""
+    rows = read_tracker_workbook(path or workbook_path())
+    labels = {days: label for label, days in DURATION_LABELS.items()}
+    rows['Duration'] = rows['Duration'].map(labels)
+    rows['Team'] = derive_teams(rows['Email'], load_team_mapping() if mapping is None else mapping).to_numpy()
+    return rows
+
+
+def period_rows(rows, year, month=None):
+    dates = rows['Leave Date']
+    keep = dates.dt.year == year
+    if month:
+        keep &= dates.dt.month == month
+    return rows[keep]
+
+
+def period_label(year, month=None):
+    return f"{year}-{month:02d}" if month else str(year)
+
+
+def _init_worker(rows):
+    global _rows, _groups
+    import matplotlib
+    matplotlib.use("Agg")
+    _rows = rows
+    _groups = {
+        "employee": rows.groupby('Name').indices if not rows.empty else {},
+        "team": rows.groupby('Team').indices if not rows.empty else {},
+    }
+
+
+def _figure(stats, title, path, format):
+    import matplotlib.pyplot as plt
+    fig, (bar_ax, pie_ax) = plt.subplots(1, 2, figsize=(12, 4.5))
+    fig.suptitle(f"{title} — {stats['total_leaves']} leave(s), {stats['full_days']} full / "
+                 f"{stats['half_days']} half day(s); most common: {stats['most_common_type']}", fontsize=10)
+    draw_monthly_distribution(bar_ax, stats['monthly_distribution'])
+    bar_ax.set_title("Monthly Distribution")
+    if stats['leave_types']:
+        draw_leave_types(pie_ax, stats['leave_types'])
+        pie_ax.set_title("Leave Type Distribution")
+    else:
+        pie_ax.axis('off')
+        pie_ax.text(0.5, 0.5, "No leaves", ha='center', va='center')
+    fig.tight_layout()
+    fig.savefig(path, format=format)
+    plt.close(fig)
+
+
+def _report(task):
+    """Write one chart file; returns the summary row"""
+    scope, key, title, directory, format = task
+    positions = _groups[scope].get(key)
+    rows = _rows.iloc[positions] if positions is not None else _rows.iloc[:0]
+    stats = period_stats(rows)
+    path = os.path.join(directory, scope, f"{feed_key(key)}.{format}")
+    _figure(stats, title, path, format)
+    summary = {
+        'Total Leaves': stats['total_leaves'],
+        'Full Days': stats['full_days'],
+        'Half Days': stats['half_days'],
+        'Most Common Type': stats['most_common_type'],
+        'Report': os.path.relpath(path, directory),
+    }
+    summary.update(stats['leave_types'])
+    return summary
+
+
+def build_reports(rows, year, month=None, out="reports", format="png", workers=None, team=None):
+    """Write every employee and team report for the period; returns the xlsx path"""
+    people = rows[['Name', 'Email', 'Team']].drop_duplicates('Name').sort_values(['Team', 'Name'])
+    if team:
+        people = people[people['Team'] == team]
+    rows = period_rows(rows[rows['Name'].isin(people['Name'])], year, month)
+
+    label = period_label(year, month)
+    heading = f"{calendar.month_name[month]} {year}" if month else str(year)
+    directory = os.path.join(out, label)
+    for scope in ("employee", "team"):
+        os.makedirs(os.path.join(directory, scope), exist_ok=True)
+    tasks = [("employee", name, f"{name} – {heading}", directory, format) for name in people['Name']]
+    tasks += [("team", t, f"Team {t} – {heading}", directory, format) for t in people['Team'].unique()]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(rows)
+        results = [_report(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(rows,)) as pool:
+            results = list(pool.map(_report, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    employees = pd.concat([people.reset_index(drop=True),
+                           pd.DataFrame(results[:len(people)])], axis=1)
+    teams = pd.concat([pd.DataFrame({'Team': people['Team'].unique(),
+                                     'Headcount': people.groupby('Team', sort=False).size().to_numpy()}),
+                       pd.DataFrame(results[len(people):])], axis=1)
+    path = os.path.join(directory, f"leave_summary_{label}.xlsx")
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        employees.fillna({t: 0 for t in rows['Leave Type'].unique()}).to_excel(writer, sheet_name="Employees", index=False)
+        teams.fillna({t: 0 for t in rows['Leave Type'].unique()}).to_excel(writer, sheet_name="Teams", index=False)
+    return path, len(tasks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate leave reports for every employee and team")
+    parser.add_argument("--year", type=int, default=date.today().year)
+    parser.add_argument("--month", type=int, choices=range(1, 13), metavar="1-12",
+                        help="monthly report for this month (default: the whole year)")
+    parser.add_argument("--format", choices=FORMATS, default="png", help="chart file format")
+    parser.add_argument("--out", default="reports", help="output directory")
+    parser.add_argument("--team", help="only this team")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--workbook", help="tracker workbook (default: the one next to the apps)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    rows = load_report_rows(args.workbook)
+    path, count = build_reports(rows, args.year, args.month, args.out, args.format, args.workers, args.team)
+    print(f"{count} report(s) and {path} written in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
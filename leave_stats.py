@@ -0,0 +1,61 @@
+"""Employee leave statistics and their charts, shared by the app and batch reports"""
+import calendar
+from io import BytesIO
+
+import pandas as pd
+
+
+def period_stats(rows):
+    """Stats of the tracker rows of one employee (or team) over a period"""
+    stats = {}
+    stats['total_leaves'] = len(rows)
+    stats['full_days'] = rows[rows['Duration'] == 'Full Day'].shape[0]
+    stats['half_days'] = rows[rows['Duration'] == 'Half Day'].shape[0]
+
+    # Calculate leave type distribution
+    stats['leave_types'] = rows['Leave Type'].value_counts().to_dict()
+
+    # Calculate monthly distribution
+    monthly_counts = rows['Leave Date'].dt.month.value_counts().reindex(range(1, 13), fill_value=0)
+    monthly_counts.index = monthly_counts.index.map(lambda x: calendar.month_abbr[x])
+    stats['monthly_distribution'] = monthly_counts
+
+    # Calculate most common leave type
+    if stats['leave_types']:
+        stats['most_common_type'] = max(stats['leave_types'], key=stats['leave_types'].get)
+    else:
+        stats['most_common_type'] = "No leaves"
+
+    return stats
+
+
+def calculate_employee_stats(df, employee_name, year):
+    # Filter data for the selected employee and year
+    return period_stats(df[(df['Name'] == employee_name) & (df['Leave Date'].dt.year == year)])
+
+
+def render_png(draw, *args, format='png'):
+    # Deferred: matplotlib is only needed once an employee's charts are drawn
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=(8, 4))
+    draw(ax, *args)
+    plt.tight_layout()
+    with BytesIO() as buffer:
+        fig.savefig(buffer, format=format)
+        plt.close(fig)
+        return buffer.getvalue()
+
+
+def draw_monthly_distribution(ax, monthly_distribution):
+    monthly_distribution.plot(kind='bar', color='#4b86b4', ax=ax)
+    ax.tick_params(axis='x', labelrotation=45)
+
+
+def draw_leave_types(ax, leave_types):
+    pd.Series(leave_types).plot(
+        kind='pie',
+        autopct='%1.1f%%',
+        colors=['#3498db', '#2ecc71', '#e74c3c', '#f39c12'],
+        ax=ax
+    )
+    ax.set_ylabel('')
@@ -1,11 +1,28 @@
 import streamlit as st
 import pandas as pd
 import calendar
-from datetime import datetime
+from datetime import datetime, date, timezone
 import os
 from io import BytesIO
 import sys
-import matplotlib.pyplot as plt
+from leave_balance import LeaveBalanceLedger
+from leave_data import read_tracker_rows, workbook_version, TRACKER_COLUMNS
+from leave_intervals import coalesce_leave_days
+from ical_feed import IcalFeedBuilder, feed_key, serve_in_background
+from leave_api import LeaveQueryService, serve_in_background as serve_query_api
+from name_index import NameIndex, employee_search_box
+from partitions import PartitionedLeaves, ALL_TEAMS, derive_teams
+from absence_analytics import AbsenceAnalytics, render_absence_dashboard
+from dependency_cache import DependencyCache, ANY
+from pagination import sorted_history, paged_history_table
+from memory_report import cache_limit, trimmable, admin_requested, render_memory_admin, maybe_trim_caches
+from profiling import start_rerun_profile, finish_rerun_profile
+from assets import load_css
+from render_cache import MonthViewCache
+from snapshots import SnapshotStore
+from shared_dataset import SharedDataset, shared_dir
+from prefetch import Prefetcher, adjacent_months, current_week
+from leave_stats import calculate_employee_stats, render_png, draw_monthly_distribution, draw_leave_types
 
 def resource_path(relative_path):
     try:
@@ -14,68 +31,42 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-@st.cache_data
-def load_data(file):
+@trimmable
+@st.cache_data(max_entries=cache_limit('load_data', 8))
+def load_data(file, version=None):
+    """(valid rows, quarantined rows); bad rows are reported instead of blanking the tracker"""
     try:
-        if hasattr(file, "read"):
-            file_bytes = BytesIO(file.read())
-        else:
-            file_bytes = file
-
-        df = pd.read_excel(file_bytes, engine="openpyxl")
-        df = df.iloc[:, 3:]
-        df.columns = ['Email', 'Name', 'Leave Date', 'Leave Type', 'Duration']
-        df['Leave Date'] = pd.to_datetime(df['Leave Date'])
-        df['Duration'] = df['Duration'].map({1: 'Full Day', 0.5: 'Half Day'})
-        df['Details'] = df.apply(
-            lambda row: {
-                "name": row['Name'],
-                "type": row['Leave Type'],
-                "duration": row['Duration']
-            }, axis=1
-        )
-        return df
-
+        df, quarantined = read_tracker_rows(file)
     except Exception as e:
         st.error(f"⚠️ Error while loading file: {e}")
-        return pd.DataFrame()
+        return pd.DataFrame(columns=TRACKER_COLUMNS), pd.DataFrame()
 
-def display_calendar(df, year, month, filter_name):
+    # Durations are validated to 1 or 0.5, so every row gets a label
+    df['Duration'] = df['Duration'].map({1: 'Full Day', 0.5: 'Half Day'})
+    return df, quarantined
 
+def build_leave_dict(df):
+    """Tooltip dicts per leave date, built only for the rows of the month shown"""
+    leave_dict = {}
+    for day, name, leave_type, duration in zip(df['Leave Date'], df['Name'], df['Leave Type'], df['Duration']):
+        leave_dict.setdefault(day, []).append({"name": name, "type": leave_type, "duration": duration})
+    return leave_dict
+
+def month_cells(leave_dict, year, month, filter_name):
+    """HTML of every calendar grid cell, blanks before the 1st included"""
     # Precompute calendar data
     _, num_days = calendar.monthrange(year, month)
     days = [datetime(year, month, day) for day in range(1, num_days + 1)]
-    
-    # Create leave dictionary
-    leave_dict = df.groupby('Leave Date')['Details'].apply(list).to_dict()
-    
-    weekdays = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-
-    # Weekday headers
-    week_row = st.columns(7)
-    for i, day in enumerate(weekdays):
-        week_row[i].markdown(f"<div style='text-align: center; font-weight: bold; font-size: 11px; color: #34495e;'>{day}</div>", unsafe_allow_html=True)
-
-    # Calendar grid
-    day_idx = 0
-    row = st.columns(7)
     first_weekday = days[0].weekday()
     
     # Fill empty days at start of month
-    # Fill empty days at start of month
-    for i in range(first_weekday):
-        empty_html = """
+    empty_html = """
             <div style='height: 60px; visibility: hidden;'></div>
         """
-        row[i].markdown(empty_html, unsafe_allow_html=True)
-        day_idx += 1
-
+    cells = [empty_html] * first_weekday
 
     # Render each day
     for day in days:
-        if day_idx % 7 == 0:
-            row = st.columns(7)
-
         leaves_today = leave_dict.get(day, [])
         leave_applied = False
         hover_details = ""
@@ -115,36 +106,24 @@ def display_calendar(df, year, month, filter_name):
                 </div>
             """
 
-        row[weekday].markdown(cell_html, unsafe_allow_html=True)
-        day_idx += 1
+        cells.append(cell_html)
+    return cells
 
-def calculate_employee_stats(df, employee_name, year):
-    # Filter data for the selected employee and year
-    emp_df = df[(df['Name'] == employee_name) & (df['Leave Date'].dt.year == year)].copy()
-    
-    # Calculate basic stats
-    stats = {}
-    stats['total_leaves'] = len(emp_df)
-    stats['full_days'] = emp_df[emp_df['Duration'] == 'Full Day'].shape[0]
-    stats['half_days'] = emp_df[emp_df['Duration'] == 'Half Day'].shape[0]
-    
-    # Calculate leave type distribution
-    stats['leave_types'] = emp_df['Leave Type'].value_counts().to_dict()
-    
-    # Calculate monthly distribution
-    monthly_counts = emp_df['Leave Date'].dt.month.value_counts().reindex(range(1, 13), fill_value=0)
-    monthly_counts.index = monthly_counts.index.map(lambda x: calendar.month_abbr[x])
-    stats['monthly_distribution'] = monthly_counts
-    
-    # Calculate most common leave type
-    if stats['leave_types']:
-        stats['most_common_type'] = max(stats['leave_types'], key=stats['leave_types'].get)
-    else:
-        stats['most_common_type'] = "No leaves"
-    
-    return stats
+def display_calendar(cells):
+    weekdays = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
 
-def display_stats_panel(stats, employee_name, year):
+    # Weekday headers
+    week_row = st.columns(7)
+    for i, day in enumerate(weekdays):
+        week_row[i].markdown(f"<div style='text-align: center; font-weight: bold; font-size: 11px; color: #34495e;'>{day}</div>", unsafe_allow_html=True)
+
+    # Calendar grid, a new row every seven cells
+    for idx, cell_html in enumerate(cells):
+        if idx % 7 == 0:
+            row = st.columns(7)
+        row[idx % 7].markdown(cell_html, unsafe_allow_html=True)
+
+def display_stats_panel(stats, employee_name, year, views=None, version=None):
     with st.expander(f"📊 Leave Statistics for {employee_name}", expanded=True):
         # Create summary cards
         col1, col2, col3 = st.columns(3)
@@ -164,37 +143,49 @@ def display_stats_panel(stats, employee_name, year):
         with chart_col1:
             if stats['monthly_distribution'].sum() > 0:
                 st.subheader("Monthly Distribution")
-                fig, ax = plt.subplots(figsize=(8, 4))
-                stats['monthly_distribution'].plot(kind='bar', color='#4b86b4', ax=ax)
-                plt.xticks(rotation=45)
-                plt.tight_layout()
-                st.pyplot(fig)
+                st.image(views.get(('monthly_chart', employee_name, year), [(employee_name, year, ANY)],
+                                   render_png, draw_monthly_distribution, stats['monthly_distribution'],
+                                   version=version)
+                         if views is not None else render_png(draw_monthly_distribution, stats['monthly_distribution']))
             else:
                 st.info("No leave data for this year")
         
         with chart_col2:
             if stats['leave_types']:
                 st.subheader("Leave Type Distribution")
-                fig, ax = plt.subplots(figsize=(8, 4))
-                pd.Series(stats['leave_types']).plot(
-                    kind='pie', 
-                    autopct='%1.1f%%', 
-                    colors=['#3498db', '#2ecc71', '#e74c3c', '#f39c12'],
-                    ax=ax
-                )
-                ax.set_ylabel('')
-                st.pyplot(fig)
+                st.image(views.get(('leave_type_chart', employee_name, year), [(employee_name, year, ANY)],
+                                   render_png, draw_leave_types, stats['leave_types'], version=version)
+                         if views is not None else render_png(draw_leave_types, stats['leave_types']))
             else:
                 st.info("No leave type data available")
         
         # Display most common leave type
         st.markdown(f"**Most Common Leave Type:** `{stats['most_common_type']}`")
         
-        # Show raw data
+        # Show raw data, one page at a time
         with st.expander("View Leave Details"):
-            st.dataframe(df[df['Name'] == employee_name][['Leave Date', 'Leave Type', 'Duration']]
-                         .sort_values('Leave Date', ascending=False)
-                         .reset_index(drop=True))
+            history = (views.get(('history', employee_name), [(employee_name, ANY, ANY)], employee_history, employee_name,
+                                 version=version)
+                       if views is not None else employee_history(employee_name))
+            paged_history_table(history, f"leave_details_{employee_name}", 'Leave Date', ['Leave Date', 'Leave Type', 'Duration'],
+                                date_columns=['Leave Date'])
+
+def employee_history(employee_name):
+    return sorted_history(df.loc[df['Name'] == employee_name, ['Leave Date', 'Leave Type', 'Duration']], 'Leave Date')
+
+def balance_as_of(year):
+    today = datetime.today().date()
+    return today if year == today.year else date(year, 12, 31)
+
+def display_balance_panel(ledger, employee_name, year):
+    as_of = balance_as_of(year)
+    if employee_name != "All":
+        with st.expander(f"📒 Leave Balance for {employee_name} (as of {as_of:%d %b %Y})", expanded=True):
+            st.dataframe(ledger.employee_frame(employee_name, as_of).drop(columns=['Employee Name']),
+                         hide_index=True, use_container_width=True)
+    else:
+        with st.expander(f"📒 Leave Balances (as of {as_of:%d %b %Y})"):
+            st.dataframe(ledger.to_frame(as_of), hide_index=True, use_container_width=True)
 
 # ---------- Streamlit Layout ----------
 st.set_page_config(
@@ -203,314 +194,257 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS with guaranteed tooltip visibility
-st.markdown("""
-    <style>
-    :root {
-        --primary: #1f4e79;
-        --primary-light: #4b86b4;
-        --secondary: #3498db;
-        --accent: #e67e22;
-        --background: #f8f9fa;
-        --text: #2c3e50;
-        --text-light: #7f8c8d;
-        --border: #dfe6e9;
-    }
-    
-    html, body, .main, .block-container {
-        margin: 0;
-        padding: 0;
-        height: 100vh;
-        overflow: hidden !important;
-        background-color: var(--background);
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-    }
-    body::-webkit-scrollbar {
-        display: none;
-    }
-    header, footer, .stDeployButton {
-        display: none !important;
-    }
-    
-    /* Calendar styling */
-    .day-box {
-        border: 2px solid #34495e;  /* darker grey */
-        border-radius: 6px;
-        padding: 3px;
-        height: 60px;
-        font-size: 11px;
-        background-color: transparent !important;
-        color: var(--text);
-        position: relative;
-        transition: all 0.3s ease;
-        z-index: 100;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        box-shadow: 0 1px 2px rgba(0,0,0,0.05);
-    }
-
-    .day-box:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        z-index: 1000;
-    }
-
-    .leave-day {
-        background: linear-gradient(135deg, var(--primary), var(--primary-light)) !important;
-        color: white !important;
-        font-weight: bold;
-    }
-
-    /* GUARANTEED VISIBLE TOOLTIPS */
-    .hover-box {
-        display: none;
-        position: absolute;
-        top: calc(100% + 5px);
-        z-index: 9999;
-        background: white;
-        border: 1px solid var(--border);
-        padding: 12px;
-        border-radius: 8px;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-        font-size: 11px;
-        width: 180px;
-        color: var(--text);
-        max-height: 300px;
-        overflow-y: auto;
-    }
-
-    .hover-trigger:hover .hover-box {
-        display: block;
-        animation: fadeIn 0.3s ease;
-    }
-    
-    @keyframes fadeIn {
-        from { opacity: 0; }
-        to { opacity: 1; }
-    }
-    
-    /* Month buttons styling */
-    .stButton>button {
-        width: 100%;
-        padding: 4px 3px;
-        font-size: 10px;
-        transition: all 0.3s;
-        margin: 0px 0;
-        border-radius: 6px;
-        min-height: 26px;
-        background-color: white;
-        border: 1px solid var(--border);
-        color: var(--text);
-        font-weight: 500;
-    }
-    
-    .stButton>button:hover {
-        transform: translateY(-1px);
-        box-shadow: 0 2px 6px rgba(0,0,0,0.1);
-        background-color: #f8f9fa;
-    }
-    
-    /* Primary button (selected month) */
-    .stButton>button[kind="primary"] {
-        background: linear-gradient(135deg, var(--primary), var(--primary-light));
-        color: white;
-        border: none;
-        font-weight: 600;
-    }
-    
-    /* Status message styling */
-    .status-msg {
-        font-size: 11px;
-        color: var(--text-light);
-        text-align: center;
-        padding: 6px;
-        margin-top: 6px;
-        border-radius: 6px;
-        background-color: white;
-        border: 1px solid var(--border);
-    }
-    
-    /* Current month indicator */
-    .current-month-indicator {
-        font-size: 12px;
-        color: var(--accent);
-        text-align: center;
-        margin-top: -6px;
-        margin-bottom: 2px;
-        font-weight: bold;
-    }
-    
-    /* Header styling */
-    .app-title {
-    text-align: center;
-    font-size: 20px;
-    font-weight: 600;
-    color: #2c3e50; /* Dark Slate Gray */
-    letter-spacing: 0.5px;
-    margin-top: 0px;
-    margin-bottom: 5px;
-    
-     }
+# Opt-in per-session profiling (?profile=N or LEAVE_TRACKER_PROFILE=N)
+start_rerun_profile("leave_tracker")
 
-    
-    /* Footer styling */
-    .app-footer {
-        text-align: center; 
-        font-size: 10px; 
-        color: var(--text-light); 
-        margin-top: 10px;
-        padding: 8px;
-        background-color: white;
-        border-radius: 6px;
-        border: 1px solid var(--border);
-    }
-    
-    /* Sidebar styling */
-    .sidebar .sidebar-content {
-        background-color: white;
-        border-right: 1px solid var(--border);
-        z-index: 100;
-    }
-    
-    /* Section headers */
-    .section-header {
-        color: var(--primary);
-        font-weight: 600;
-        border-bottom: 2px solid var(--primary-light);
-        padding-bottom: 5px;
-        margin-bottom: 15px;
-    }
-    
-    /* Export button styling */
-    .export-btn {
-        background: linear-gradient(135deg, var(--primary), var(--primary-light)) !important;
-        color: white !important;
-        border: none !important;
-    }
-    
-    /* Refresh button styling */
-    .refresh-btn {
-        background: linear-gradient(135deg, #27ae60, #2ecc71) !important;
-        color: white !important;
-        border: none !important;
-    }
-    
-    /* Compact spacing */
-    .compact-spacing {
-        margin-top: -8px;
-        margin-bottom: -8px;
-    }
-    
-    /* Ensure calendar cells have proper stacking context */
-    .stColumn > div {
-        position: relative;
-        overflow: visible !important;
-    }
-            
-       /* Calendar section background */
-    div[data-testid="stHorizontalBlock"] > div:nth-child(1) > div {
-        background-color: #f0f8ff !important;
-        padding: 10px;
-        border-radius: 10px;
-        margin-right: 10px;
-    }
-    
-    /* Month selector section background */
-    div[data-testid="stHorizontalBlock"] > div:nth-child(2) > div {
-        background-color: #f8f8f8 !important;
-        padding: 10px;
-        border-radius: 10px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-    }
-     /* Fix ghost white box issue on Tuesday column */
-    .stColumn {
-    background-color: transparent !important;
-    }
-
-/* Ensure hidden day boxes are truly invisible and don't show borders */
-    .day-box[style*="visibility: hidden"] {
-    background-color: transparent !important;
-    border: none !important;
-    box-shadow: none !important;
-    padding: 0 !important;
-    margin: 0 !important;
-    height: 60px;
-    }
-
-/* Fix internal padding/margin issues in Tuesday's column */
-    .stColumn:nth-child(2) > div {
-    margin: 0 !important;
-    padding: 0 !important;
-    }
-            
-    .day-box[style*="visibility: hidden"] {
-    background-color: transparent !important;
-    border: none !important;
-    box-shadow: none !important;
-    padding: 0 !important;
-    margin: 0 !important;
-    height: 60px;
-    }
-
-/* Fix internal padding/margin issues in Tuesday's column */
-    .stColumn:nth-child(2) > div {
-    margin: 0 !important;
-    padding: 0 !important;
-    }
-            
-    .stButton button {
-    margin-top: 0 !important;
-    margin-bottom: 0 !important;
-    padding-top: 4px !important;
-    padding-bottom: 4px !important;
-    }
-            
-    /* Add this to your existing CSS */
-    .stButton > button {
-    margin: 1px 0 !important;
-    padding: 2px 0 !important;
-    min-height: 24px !important;
-    }
-
-    .current-month-indicator {
-    margin-top: -5px !important;
-    margin-bottom: 5px !important;
-    }
-            
-    
-    .app-title {
-    margin: 0 auto;  /* Center with auto margins */
-    padding: 0;
-    width: 100%;
-    text-align: center; /* Ensure text is centered */
-    }
-
-/* Remove top space from calendar container */
-   div[data-testid="stHorizontalBlock"] > div:nth-child(1) > div {
-    margin-top: 0 !important;
-   }
-            
-    </style>
-""", unsafe_allow_html=True)
+# Custom CSS with guaranteed tooltip visibility
+load_css("leave_tracker.css")
 
 # Header with integrated month selector title
 # Aligned header: main title and month section header
 
 # ---------- Load Excel ----------
+def workbook_file():
+    return os.path.join(os.path.dirname(__file__), "Leave Tracker (YED).xlsx")
+
 @st.cache_resource
-def load_excel_data():
-    file_path = os.path.join(os.path.dirname(__file__), "Leave Tracker (YED).xlsx")
-    if os.path.exists(file_path):
-        return load_data(file_path)
-    else:
+def get_snapshots():
+    """Numbered versions of every workbook load, shared by all sessions"""
+    return SnapshotStore()
+
+@st.cache_resource
+def get_shared_dataset():
+    """Dataset published by the shared_dataset loader, or None when this process loads its own"""
+    directory = shared_dir()
+    return SharedDataset(directory) if directory else None
+
+def load_dataset_info():
+    """Snapshot version and modification time of the workbook on disk.
+
+    A workbook state seen before maps straight to its version; a new one is
+    read and committed, bumping the version only if its rows changed. A read
+    that fails or finds no valid rows is never committed: the last good
+    version stays current. In shared mode the loader process does that and
+    this only reads its pointer.
+    """
+    shared = get_shared_dataset()
+    if shared is not None:
+        current = shared.current()
+        if current is None:
+            st.info("⏳ Waiting for the leave data to be published (python shared_dataset.py)...")
+            st.stop()
+        get_snapshots().refresh()
+        return current['version'], datetime.fromisoformat(current['modified'])
+    file_path = workbook_file()
+    if not os.path.exists(file_path):
         st.error("Leave Tracker Excel file not found.")
         st.stop()
-        return pd.DataFrame()
+    token = workbook_version(file_path)
+    snapshots = get_snapshots()
+    version = snapshots.version_of(token)
+    if version is None:
+        rows = load_data(file_path, token)[0]
+        if rows.empty:
+            if not snapshots.latest:
+                st.error("No valid leave rows found in the Leave Tracker Excel file.")
+                st.stop()
+            st.warning(f"⚠️ The workbook has no valid rows; showing the last good data (v{snapshots.latest}).")
+            version = snapshots.latest
+        else:
+            version = snapshots.commit(rows, source=token)
+    return version, datetime.fromtimestamp(os.path.getmtime(file_path), timezone.utc)
+
+@trimmable
+@st.cache_resource(max_entries=cache_limit('workbook', 2))
+def load_excel_data(version):
+    shared = get_shared_dataset()
+    if shared is not None and shared.has(version):
+        return shared.frame(version)
+    return get_snapshots().as_of(version)
+
+def load_quarantine():
+    """Rows of the workbook on disk that failed validation"""
+    shared = get_shared_dataset()
+    if shared is not None:
+        return shared.quarantine(shared.current()['version'])
+    file_path = workbook_file()
+    return load_data(file_path, workbook_version(file_path))[1]
+
+def ledger_rows(rows):
+    """Tracker rows with the numeric Days the balance ledger records"""
+    return rows.assign(Days=rows['Duration'].map({'Full Day': 1, 'Half Day': 0.5})).dropna(subset=['Days'])
+
+LEDGER_COLUMNS = dict(name_col='Name', start_col='Leave Date', end_col=None)
+
+@st.cache_resource
+def get_balance_ledger():
+    """Balances of the latest version, shared by all sessions and moved by row deltas"""
+    return LeaveBalanceLedger()
+
+def sync_balance_ledger(version):
+    ledger, snapshots = get_balance_ledger(), get_snapshots()
+    if ledger.version == version:
+        return ledger
+    changes = lambda old, new: tuple(ledger_rows(rows) for rows in snapshots.diff(old, new))
+    return ledger.sync(ledger_rows(load_excel_data(version)), version, changes, **LEDGER_COLUMNS)
+
+@trimmable
+@st.cache_resource(max_entries=cache_limit('as_of_views', 2))
+def load_balance_ledger(version):
+    """Balances of an earlier version, for as-of views"""
+    return LeaveBalanceLedger.from_frame(ledger_rows(load_excel_data(version)), **LEDGER_COLUMNS)
+
+@trimmable
+@st.cache_resource(max_entries=cache_limit('workbook', 2))
+def load_leave_intervals(version):
+    return coalesce_leave_days(load_excel_data(version)[TRACKER_COLUMNS])
+
+@st.cache_resource
+def get_ical_builder():
+    """Shared .ics feed cache; also served over HTTP when LEAVE_TRACKER_ICS_PORT is set.
+
+    Request threads only read the intervals published below for the latest
+    version; they never call Streamlit.
+    """
+    builder = IcalFeedBuilder(team_of=get_partitions().team_of)
+    port = os.environ.get("LEAVE_TRACKER_ICS_PORT")
+    if port:
+        serve_in_background(builder, port=int(port))
+    return builder
+
+@st.cache_resource
+def get_query_service():
+    """Shared JSON query API over this app's dataset; served when LEAVE_TRACKER_API_PORT is set.
+
+    Request threads only read the snapshot published below for the latest
+    version; they never call Streamlit.
+    """
+    service = LeaveQueryService()
+    port = os.environ.get("LEAVE_TRACKER_API_PORT")
+    if port:
+        serve_query_api(service, port=int(port))
+    return service
+
+@st.cache_resource
+def get_absence_analytics():
+    """Absence totals of the latest version, shared by all sessions and moved by row deltas"""
+    return AbsenceAnalytics()
+
+@trimmable
+@st.cache_resource(max_entries=cache_limit('as_of_views', 2))
+def load_absence_analytics(version):
+    """Absence totals of an earlier version, for as-of views"""
+    return AbsenceAnalytics().sync(load_excel_data(version)[TRACKER_COLUMNS], version)
+
+@st.cache_resource
+def get_partitions():
+    """Team partitions shared by all sessions; views are cached and versioned per team"""
+    return PartitionedLeaves()
+
+@st.cache_resource
+def get_derived_views():
+    """Month dicts, stats and charts shared by all sessions, invalidated per (employee, year, month)"""
+    return DependencyCache(max_entries=cache_limit('derived_views', 512))
+
+@st.cache_resource
+def get_month_views():
+    """Rendered month grids shared by all sessions"""
+    return MonthViewCache(cache_limit('month_views', 64))
+
+def month_leave_dict(frame, year, month):
+    if frame.empty:
+        return {}
+    dates = frame['Leave Date']
+    return build_leave_dict(frame[(dates.dt.year == year) & (dates.dt.month == month)])
+
+def month_view(views, month_views, partitions, team, name, year, month):
+    """Cached calendar cells of one month for a team/employee filter.
+
+    A team's month is keyed on that team's version, so it survives changes to
+    other teams; the whole-org month is invalidated per (year, month).
+    """
+    frame, version = partitions.snapshot(team)
+    if team == ALL_TEAMS:
+        leave_dict = views.get(('leave_dict', team, year, month), [(ANY, year, month)],
+                               month_leave_dict, frame, year, month, version=version)
+    else:
+        leave_dict = partitions.view(team, 'leave_dict', month_leave_dict, year, month)
+    return month_views.get(('leave_tracker', year, month, team, name, version),
+                           month_cells, leave_dict, year, month, name)
+
+@st.cache_resource
+def get_prefetcher():
+    """Background pool warming likely next views for all sessions"""
+    return Prefetcher()
+
+def prefetch_month(views, month_views, partitions, team, name, year, month):
+    # Runs on a prefetch thread: only thread-safe caches, no st.* calls
+    month_view(views, month_views, partitions, team, name, year, month)
+    if name != "All":
+        frame, version = partitions.snapshot(ALL_TEAMS)
+        views.get(('stats', name, year), [(name, year, ANY)],
+                  calculate_employee_stats, frame, name, year, version=version)
+
+def prefetch_whos_out(service, version):
+    # Only reads the published snapshot; a job for a superseded version does nothing
+    current, snapshot = service.snapshot()
+    if current != version:
+        return
+    monday, sunday = current_week()
+    for query in ({"type": "out", "date": date.today().isoformat()},
+                  {"type": "out", "start": monday.isoformat(), "end": sunday.isoformat()}):
+        service.answer(query, version, snapshot)
+
+@trimmable
+@st.cache_resource(max_entries=cache_limit('name_index', 4))
+def get_name_index(version):
+    """Searchable employee names, grouped by team, built once per data version"""
+    people = load_excel_data(version)[['Name', 'Email']].drop_duplicates('Name')
+    partitions = get_partitions()
+    teams = derive_teams(people['Email'], partitions.mapping, partitions.mode)
+    return NameIndex(people['Name'], dict(zip(people['Name'], teams)))
+
+@trimmable
+@st.cache_resource(max_entries=cache_limit('as_of_views', 2))
+def get_as_of_views(version):
+    """Partitions and derived views of an earlier version, kept apart from the shared live ones"""
+    df = load_excel_data(version)
+    partitions = PartitionedLeaves()
+    partitions.update(df, version)
+    views = DependencyCache(max_entries=cache_limit('derived_views', 512))
+    views.sync(df, version, columns=TRACKER_COLUMNS)
+    return partitions, views
 
 # Load data with spinner
 with st.spinner("🔄 Loading leave data..."):
-    df = load_excel_data()
+    latest_version, data_modified = load_dataset_info()
+    snapshots = get_snapshots()
+    # An earlier snapshot picked under "Version history" replaces the latest everywhere below
+    data_version = st.session_state.get("data_version_view") or latest_version
+    if data_version > latest_version:
+        data_version = latest_version
+    df = load_excel_data(data_version)
+    # The shared partitions, views, prefetches and API only ever follow the latest version
+    as_of_view = data_version != latest_version
+    ledger = load_balance_ledger(data_version) if as_of_view else sync_balance_ledger(data_version)
+    data_changed = False
+    if as_of_view:
+        partitions, views = get_as_of_views(data_version)
+    else:
+        partitions = get_partitions()
+        data_changed = partitions.source_version != data_version
+        if data_changed:
+            shared = get_shared_dataset()
+            partitions.update(df, data_version, teams=shared.teams(data_version)
+                              if shared is not None and shared.has(data_version) else None)
+        views = get_derived_views()
+        views.sync(df, data_version, columns=TRACKER_COLUMNS, changes=snapshots.changed_keys)
+        query_service = get_query_service()
+        if query_service.version != data_version:
+            query_service.snapshot(df, data_version)
+        ical_builder = get_ical_builder()
+        if ical_builder.version != data_version:
+            ical_builder.publish(load_leave_intervals(data_version), data_version, data_modified)
 
 # Initialize session state
 if 'selected_month' not in st.session_state:
@@ -522,12 +456,45 @@ if 'last_update' not in st.session_state:
 with st.sidebar:
     st.markdown("<div class='section-header'>🔍 Filter Calendar</div>", unsafe_allow_html=True)
     year = st.selectbox("Year", list(range(2024, 2027)), index=1)
-    all_names = ["All"] + sorted(df["Name"].unique())
-    filter_name = st.selectbox("Employee", all_names)
+    teams = partitions.teams()
+    filter_team = st.selectbox("Team", [ALL_TEAMS] + teams) if len(teams) > 1 else ALL_TEAMS
+    filter_name = employee_search_box(get_name_index(data_version), "All", key="employee_filter",
+                                      team=None if filter_team == ALL_TEAMS else filter_team)
+    if filter_name != "All":
+        emails = df.loc[df['Name'] == filter_name, 'Email']
+        if emails.empty:
+            filter_name = "All"
+        else:
+            filter_email = emails.iloc[0]
+            filter_team = partitions.team_of(filter_email)
     
     # Display data freshness
     st.markdown(f"<div class='status-msg'>Data loaded: {st.session_state.last_update}</div>", unsafe_allow_html=True)
     
+    # Earlier loads of the workbook: view the calendar as of one, or diff two
+    if snapshots.latest > 1:
+        with st.expander(f"🕘 Version history (v{data_version} of {snapshots.latest})"):
+            history = snapshots.versions().set_index('version')
+            label = lambda v: f"v{v} · {pd.Timestamp(history.at[v, 'created']).tz_convert(None):%d %b %Y %H:%M}"
+            choices = list(range(snapshots.latest, 0, -1))
+            st.selectbox("Show data as of", [None] + choices, key="data_version_view",
+                         format_func=lambda v: "Latest" if v is None else label(v))
+            compare = st.selectbox("Compare with", choices, index=min(1, len(choices) - 1),
+                                   format_func=label, key="data_version_compare")
+            added, removed = snapshots.diff(compare, data_version)
+            st.caption(f"{len(added)} row(s) added, {len(removed)} removed from v{compare} to v{data_version}")
+            for title, rows in (("Added", added), ("Removed", removed)):
+                if not rows.empty:
+                    st.markdown(f"**{title}**")
+                    st.dataframe(rows, hide_index=True, use_container_width=True)
+    
+    # Rows skipped by validation
+    quarantined = load_quarantine() if data_version == latest_version else pd.DataFrame()
+    if not quarantined.empty:
+        duplicates = int((quarantined['Reason'] == "duplicate submission").sum())
+        with st.expander(f"⚠️ {len(quarantined)} row(s) skipped ({duplicates} duplicate)"):
+            st.dataframe(quarantined[['Row', 'Reason'] + TRACKER_COLUMNS], hide_index=True, use_container_width=True)
+    
     # Export button
     if st.button("📥 Export to Excel", use_container_width=True, key="export_btn"):
         with BytesIO() as buffer:
@@ -541,6 +508,24 @@ with st.sidebar:
                 use_container_width=True,
                 key="download_btn"
             )
+    
+    # Calendar feed for the current filter
+    if filter_name == "All" and filter_team == ALL_TEAMS:
+        ics_scope, ics_key = "all", "all"
+    elif filter_name == "All":
+        ics_scope, ics_key = "team", feed_key(filter_team)
+    else:
+        ics_scope, ics_key = "employee", feed_key(filter_email)
+    ics_feed = get_ical_builder().feed(load_leave_intervals(data_version), data_version, ics_scope, ics_key, data_modified)
+    if ics_feed is not None:
+        st.download_button(
+            label="📅 Download Calendar (.ics)",
+            data=ics_feed[0],
+            file_name=f"leave_{ics_key}.ics",
+            mime="text/calendar",
+            use_container_width=True,
+            key="ics_btn"
+        )
 
 # ====== MODIFIED COLUMN SECTION ======
 # Create two-column layout with adjusted ratios
@@ -557,7 +542,8 @@ with left_col:
         """,
         unsafe_allow_html=True
     )
-    display_calendar(df, year, st.session_state.selected_month, filter_name)
+    display_calendar(month_view(views, get_month_views(), partitions, filter_team, filter_name,
+                                year, st.session_state.selected_month))
 
 # Right column: Month selector with vertical alignment fix
 with right_col:
@@ -591,12 +577,44 @@ with right_col:
             st.rerun()
 
 if filter_name != "All":
-    stats = calculate_employee_stats(df, filter_name, year)
-    display_stats_panel(stats, filter_name, year)
+    stats = views.get(('stats', filter_name, year), [(filter_name, year, ANY)],
+                      calculate_employee_stats, partitions.frame(filter_team), filter_name, year,
+                      version=data_version)
+    display_stats_panel(stats, filter_name, year, views, data_version)
+display_balance_panel(ledger, filter_name, year)
+
+absence_panel = st.expander("📈 Absence Trends", key="absence_panel", on_change="rerun")
+with absence_panel:
+    # Computed (and the chart library loaded) only while the panel is open
+    if absence_panel.open:
+        team_members = None if filter_team == ALL_TEAMS else partitions.frame(filter_team)['Name'].unique()
+        analytics = (load_absence_analytics(data_version) if as_of_view else
+                     get_absence_analytics().sync(df[TRACKER_COLUMNS], data_version, snapshots.diff))
+        render_absence_dashboard(analytics, balance_as_of(year), team_members, key="absence")
+
+# Memory admin view (?admin=memory)
+if admin_requested():
+    with st.expander("🧠 Memory Admin", expanded=True):
+        render_memory_admin()
+maybe_trim_caches()
+
+# Warm the months either side, and after a data change the landing view and who's out this week
+prefetcher = get_prefetcher()
+for near_year, near_month in ([] if as_of_view else adjacent_months(year, st.session_state.selected_month)):
+    prefetcher.submit(('month', near_year, near_month, filter_team, filter_name, data_version),
+                      prefetch_month, views, get_month_views(), partitions, filter_team, filter_name,
+                      near_year, near_month)
+if data_changed:
+    prefetcher.submit(('month', year, datetime.now().month, ALL_TEAMS, "All", data_version),
+                      prefetch_month, views, get_month_views(), partitions, ALL_TEAMS, "All",
+                      year, datetime.now().month)
+    prefetcher.submit(('whos_out', data_version), prefetch_whos_out, get_query_service(), data_version)
 
 # Footer with status information
 st.markdown(f"""
     <div class="app-footer">
         Showing: <strong>{filter_name}</strong> | Last refresh: {st.session_state.last_update}
     </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+finish_rerun_profile(year=year, month=st.session_state.selected_month, employee=filter_name, team=filter_team)
\ No newline at end of file
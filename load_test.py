@@ -0,0 +1,280 @@
+"""Concurrent-session load test for the leave tracker apps.
+
+Starts the app with `streamlit run` (or targets a running server with --url)
+and connects many sessions to it at once, each a websocket client speaking
+Streamlit's own protocol, as a browser tab does. Every session sends its
+widget changes and waits for the rerun to finish, so with more sessions than
+the server can serve at once the reruns queue and the latency percentiles
+show it. Reports rerun latency, throughput, errors and the server's memory.
+
+    python load_test.py --app leave_tracker.py --sessions 20 --iterations 15
+    python load_test.py --app v1848BRH.py --sessions 10 --think 0.5 --json results.json --max-p95 0.5
+    python load_test.py --url ws://localhost:8501 --app leave_tracker.py --sessions 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import date, timedelta
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.Common_pb2 import StringArray
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STREAM_PATH = "/_stcore/stream"
+
+
+class Session:
+    """One browser tab: a websocket to the server and the widgets of its last run"""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.widgets = []
+        self.errors = []
+
+    def widget(self, kind, key=None, label=None):
+        for element_kind, element in self.widgets:
+            if element_kind != kind:
+                continue
+            # Widget ids end with the user key ("$$ID-<hash>-<key>")
+            if key is not None and element.id.split("-", 2)[-1] == key:
+                return element
+            if label is not None and element.label == label:
+                return element
+        return None
+
+    async def rerun(self, *states):
+        """Send widget states and wait for the rerun (and any st.rerun it asks for) to finish"""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.widget_states.widgets.extend(states)
+        await self.ws.send(msg.SerializeToString())
+        widgets = []
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self.ws.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_kind = element.WhichOneof("type")
+                if element_kind == "exception":
+                    self.errors.append(f"{element.exception.type}: {element.exception.message}")
+                elif hasattr(getattr(element, element_kind), "id"):
+                    widgets.append((element_kind, getattr(element, element_kind)))
+            elif kind == "script_finished":
+                if forward.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    widgets = []
+                    continue
+                self.widgets = widgets
+                return
+
+
+def trigger(widget):
+    return WidgetState(id=widget.id, trigger_value=True)
+
+
+def choose(widget, option):
+    return WidgetState(id=widget.id, string_value=option)
+
+
+def pick_date(widget, day):
+    return WidgetState(id=widget.id, string_array_value=StringArray(data=[day.isoformat()]))
+
+
+# ---------- Scripted user actions ----------
+async def click_month(session, rng):
+    await session.rerun(trigger(session.widget("button", key=f"month_{rng.randint(1, 12)}")))
+    return "month_click"
+
+
+async def change_employee_filter(session, rng):
+    employee = session.widget("selectbox", key="employee_filter")
+    await session.rerun(choose(employee, rng.choice(employee.options)))
+    return "employee_filter"
+
+
+async def open_page(session, label):
+    if session.widget("button", label=label) is not None:
+        await session.rerun(trigger(session.widget("button", label=label)))
+
+
+async def change_tracker_month(session, rng):
+    if session.widget("selectbox", key="tracker_month") is None:
+        await open_page(session, "📊 View Tracker")
+    month = session.widget("selectbox", key="tracker_month")
+    await session.rerun(choose(month, rng.choice(month.options)))
+    return "month_select"
+
+
+async def open_employee_detail(session, rng):
+    if session.widget("selectbox", key="tracker_employee") is None:
+        await open_page(session, "📊 View Tracker")
+    employee = session.widget("selectbox", key="tracker_employee")
+    await session.rerun(choose(employee, rng.choice(employee.options[1:])))
+    return "employee_detail"
+
+
+async def submit_leave(session, rng):
+    if session.widget("button", label="Submit Leave Application") is None:
+        await open_page(session, "📝 Apply Leave")
+    start = date(2025, 1, 1) + timedelta(days=rng.randint(0, 364))
+    end = start + timedelta(days=rng.randint(0, 3))
+    await session.rerun(
+        WidgetState(id=session.widget("text_input", label="Employee Name*").id,
+                    string_value=f"Load Test {rng.randint(1, 50)}"),
+        pick_date(session.widget("date_input", label="Start Date*"), start),
+        pick_date(session.widget("date_input", label="End Date*"), end),
+        trigger(session.widget("button", label="Submit Leave Application")),
+    )
+    return "submit_leave"
+
+
+SCENARIOS = {
+    "leave_tracker.py": [click_month, click_month, change_employee_filter],
+    "v1848BRH.py": [change_tracker_month, open_employee_detail, submit_leave],
+}
+
+
+async def run_session(url, actions, seed, iterations, think, start_delay):
+    rng = random.Random(seed)
+    timings = []
+    await asyncio.sleep(start_delay)
+    async with websockets.connect(url + STREAM_PATH, subprotocols=["streamlit"], max_size=None) as ws:
+        session = Session(ws)
+        started = time.perf_counter()
+        await session.rerun()
+        timings.append(("initial_load", time.perf_counter() - started))
+        for _ in range(iterations):
+            if think:
+                await asyncio.sleep(rng.uniform(0, think))
+            action = rng.choice(actions)
+            started = time.perf_counter()
+            try:
+                name = await action(session, rng)
+            except Exception as e:
+                name = action.__name__
+                session.errors.append(f"{name}: {type(e).__name__}: {e}")
+            timings.append((name, time.perf_counter() - started))
+    return {"timings": timings, "errors": session.errors}
+
+
+async def run_sessions(url, app, sessions, iterations, think, ramp, seed):
+    actions = SCENARIOS[os.path.basename(app)]
+    return await asyncio.gather(*(
+        run_session(url, actions, seed + i, iterations, think, ramp * i / max(1, sessions))
+        for i in range(sessions)
+    ))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app, timeout):
+    """`streamlit run app` on a free port; returns (process, ws url) once it is healthy"""
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", app, "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=APP_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return server, f"ws://127.0.0.1:{port}"
+        except OSError:
+            if server.poll() is not None:
+                break
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"streamlit run {app} did not become healthy within {timeout}s")
+
+
+def server_rss_bytes(pid):
+    """Resident memory of the server process, or None where /proc is not available"""
+    try:
+        with open(f"/proc/{pid}/status") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def summarize(results, wall_time, rss):
+    latencies = np.array([t for r in results for _, t in r["timings"]])
+    by_action = {}
+    for r in results:
+        for name, t in r["timings"]:
+            by_action.setdefault(name, []).append(t)
+    return {
+        "sessions": len(results),
+        "reruns": int(latencies.size),
+        "errors": int(sum(len(r["errors"]) for r in results)),
+        "error_samples": sorted({e.splitlines()[0][:200] for r in results for e in r["errors"]})[:10],
+        "wall_time_s": round(wall_time, 3),
+        "throughput_rps": round(latencies.size / wall_time, 2),
+        "latency_s": {
+            f"p{p}": round(float(np.percentile(latencies, p)), 4) for p in (50, 90, 95, 99)
+        },
+        "latency_by_action_p95_s": {
+            name: round(float(np.percentile(values, 95)), 4) for name, values in sorted(by_action.items())
+        },
+        "server_rss_bytes": rss,
+        "rss_per_session_bytes": None if rss is None else int(rss / len(results)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="leave_tracker.py", choices=sorted(SCENARIOS))
+    parser.add_argument("--url", help="running server, e.g. ws://localhost:8501 (default: start one)")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent sessions")
+    parser.add_argument("--iterations", type=int, default=10, help="scripted actions per session")
+    parser.add_argument("--think", type=float, default=0.0, help="max random pause between actions, seconds")
+    parser.add_argument("--ramp", type=float, default=0.0, help="seconds over which sessions connect")
+    parser.add_argument("--timeout", type=float, default=60, help="server start-up timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the summary to this file")
+    parser.add_argument("--max-p95", type=float, help="exit non-zero if p95 latency exceeds this")
+    args = parser.parse_args(argv)
+
+    app = os.path.join(APP_DIR, args.app)
+    server, url = (None, args.url.rstrip("/")) if args.url else start_server(app, args.timeout)
+    try:
+        started = time.perf_counter()
+        results = asyncio.run(run_sessions(url, app, args.sessions, args.iterations,
+                                           args.think, args.ramp, args.seed))
+        wall_time = time.perf_counter() - started
+        rss = server_rss_bytes(server.pid) if server is not None else None
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    summary = summarize(results, wall_time, rss)
+
+    print(json.dumps(summary, indent=2))
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(summary, fh, indent=2)
+    if args.max_p95 is not None and summary["latency_s"]["p95"] > args.max_p95:
+        print(f"p95 latency {summary['latency_s']['p95']}s exceeds budget {args.max_p95}s", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""Memory accounting for Streamlit caches, sessions and allocation sites.
+
+Cache limits are read from the environment so a deployment can cap memory
+without code changes:
+
+    LEAVE_CACHE_MAX_ENTRIES=8               default max_entries for every cache
+    LEAVE_CACHE_MAX_ENTRIES_FIGURES=32      per-cache override (name upper-cased)
+    LEAVE_CACHE_MAX_MB=512                  clear the largest data caches above this (MiB)
+    LEAVE_TRACKER_TRACEMALLOC=1             record allocation sites from startup
+    LEAVE_TRACKER_ADMIN_TOKEN=secret        enables the admin view; required as ?token=
+"""
+import hmac
+import os
+import sys
+import time
+import tracemalloc
+import types
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+_last_trim = [0.0]
+# Data-keyed cached functions trim_caches may clear; singletons owning servers,
+# thread pools or shared state are never registered
+_trimmable = {}
+
+if os.environ.get("LEAVE_TRACKER_TRACEMALLOC") and not tracemalloc.is_tracing():
+    tracemalloc.start(10)
+
+
+def _env_number(name, cast):
+    value = os.environ.get(name)
+    try:
+        return cast(value) if value else None
+    except ValueError:
+        return None
+
+
+def cache_limit(name, default=None):
+    """max_entries for the named cache: per-cache env var, then global, then default"""
+    for var in (f"LEAVE_CACHE_MAX_ENTRIES_{name.upper()}", "LEAVE_CACHE_MAX_ENTRIES"):
+        value = _env_number(var, int)
+        if value is not None:
+            return value
+    return default
+
+
+def trimmable(cached):
+    """Register a data-keyed st.cache_data/st.cache_resource function for trimming"""
+    _trimmable[f"{cached.__module__}.{cached.__qualname__}"] = cached
+    return cached
+
+
+def deep_sizeof(obj, _seen=None):
+    """Approximate bytes held by obj, counting shared objects once"""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen or isinstance(obj, _SKIP_TYPES):
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True, index=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        # ndarray.__sizeof__ already includes the buffer when the array owns it
+        return sys.getsizeof(obj)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, s), seen) for s in obj.__slots__ if hasattr(obj, s))
+    return size
+
+
+def _function_caches(module_name, attr):
+    try:
+        module = __import__(module_name, fromlist=[attr])
+        registry = getattr(module, attr)
+        with registry._caches_lock:
+            return [cache for caches in registry._function_caches.values() for cache in caches.values()]
+    except Exception:
+        return []
+
+
+def _cache_entries():
+    """(kind, function, key, bytes) for every in-memory cache entry.
+
+    Streamlit has no public API to list cache entries, so this reads its
+    internals and is only used to measure; anything unexpected yields nothing.
+    """
+    entries = []
+    for cache in _function_caches("streamlit.runtime.caching.cache_data_api", "_data_caches"):
+        mem_cache = getattr(cache.storage, "_mem_cache", None)
+        if mem_cache is None:
+            continue
+        for key, value in list(mem_cache.items()):
+            entries.append(("cache_data", cache.display_name, key, len(value)))
+    for cache in _function_caches("streamlit.runtime.caching.cache_resource_api", "_resource_caches"):
+        mem_cache = getattr(cache, "_mem_cache", None)
+        if mem_cache is None:
+            continue
+        for key, result in list(mem_cache.items()):
+            entries.append(("cache_resource", cache.display_name, key,
+                            deep_sizeof(getattr(result, "value", result))))
+    return entries
+
+
+def cache_entry_sizes():
+    """One row per cached value across st.cache_data and st.cache_resource"""
+    rows = [(kind, name, key[:12], size) for kind, name, key, size in _cache_entries()]
+    df = pd.DataFrame(rows, columns=["Kind", "Function", "Key", "Bytes"])
+    return df.sort_values("Bytes", ascending=False).reset_index(drop=True)
+
+
+def session_sizes():
+    """Per-session, per-key st.session_state footprint for every active session"""
+    rows = []
+    try:
+        from streamlit.runtime import Runtime
+        if Runtime.exists():
+            for info in Runtime.instance()._session_mgr.list_active_sessions():
+                state = info.session.session_state
+                for key, value in state.filtered_state.items():
+                    rows.append((info.session.id[:8], key, deep_sizeof(value)))
+    except Exception:
+        pass
+    df = pd.DataFrame(rows, columns=["Session", "Key", "Bytes"])
+    return df.sort_values("Bytes", ascending=False).reset_index(drop=True)
+
+
+def top_allocations(limit=15):
+    """Largest live allocation sites, when tracemalloc is running"""
+    if not tracemalloc.is_tracing():
+        return pd.DataFrame(columns=["Site", "KiB", "Blocks"])
+    stats = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ]).statistics("lineno")[:limit]
+    return pd.DataFrame(
+        [(f"{s.traceback[0].filename}:{s.traceback[0].lineno}", round(s.size / 1024, 1), s.count) for s in stats],
+        columns=["Site", "KiB", "Blocks"]
+    )
+
+
+def trim_caches(max_bytes):
+    """Clear the largest trimmable caches (see trimmable) until the total is under max_bytes"""
+    sizes = {}
+    for _, name, _, size in _cache_entries():
+        if name in _trimmable:
+            sizes[name] = sizes.get(name, 0) + size
+    total = sum(sizes.values())
+    cleared = 0
+    for name, size in sorted(sizes.items(), key=lambda item: item[1], reverse=True):
+        if total <= max_bytes:
+            break
+        _trimmable[name].clear()
+        total -= size
+        cleared += 1
+    return cleared
+
+
+def maybe_trim_caches(interval_seconds=30):
+    """Apply LEAVE_CACHE_MAX_MB at most once per interval"""
+    max_mb = _env_number("LEAVE_CACHE_MAX_MB", float)
+    now = time.monotonic()
+    if max_mb is None or now - _last_trim[0] < interval_seconds:
+        return 0
+    _last_trim[0] = now
+    return trim_caches(int(max_mb * 1024 * 1024))
+
+
+def _fmt_bytes(n):
+    return f"{n / 1024:.0f} KiB" if n < 1024 * 1024 else f"{n / 1024 / 1024:.1f} MiB"
+
+
+def admin_requested():
+    """?admin=memory&token=...; without LEAVE_TRACKER_ADMIN_TOKEN the view does not exist"""
+    params = st.query_params
+    token = os.environ.get("LEAVE_TRACKER_ADMIN_TOKEN")
+    if not token or params.get("admin") != "memory":
+        return False
+    return hmac.compare_digest(params.get("token", ""), token)
+
+
+def render_memory_admin():
+    """Admin panel listing cache entries, session footprints and allocation sites"""
+    caches = cache_entry_sizes()
+    sessions = session_sizes()
+    allocations = top_allocations()
+
+    st.markdown("### 🧠 Memory Usage")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Cache Entries", _fmt_bytes(caches['Bytes'].sum()), f"{len(caches)} entries", delta_color="off")
+    per_session = sessions.groupby("Session")["Bytes"].sum()
+    col2.metric("Session State", _fmt_bytes(per_session.sum()), f"{len(per_session)} sessions", delta_color="off")
+    col3.metric("Cache Budget", f"{os.environ.get('LEAVE_CACHE_MAX_MB', '∞')} MiB")
+
+    st.markdown("#### Cache entries")
+    st.dataframe(caches, use_container_width=True, hide_index=True)
+    st.markdown("#### Session state")
+    st.dataframe(sessions, use_container_width=True, hide_index=True)
+    st.markdown("#### Top allocation sites")
+    if allocations.empty:
+        st.info("Start the app with LEAVE_TRACKER_TRACEMALLOC=1 to record allocation sites.")
+    else:
+        st.dataframe(allocations, use_container_width=True, hide_index=True)
@@ -0,0 +1,102 @@
+"""Precomputed employee name index with prefix/fuzzy search and paging"""
+import difflib
+import math
+from bisect import bisect_left
+
+import streamlit as st
+
+
+class NameIndex:
+    """Sorted name and word-prefix index built once per data version.
+
+    search() answers prefix queries with two bisects, falling back to fuzzy
+    matching only when nothing starts with the query.
+    """
+
+    def __init__(self, names, teams=None):
+        unique = {str(n).strip() for n in names if isinstance(n, str) and n.strip()}
+        self.names = sorted(unique, key=str.casefold)
+        self.keys = [n.casefold() for n in self.names]
+        self.teams = {n: (teams or {}).get(n, "") for n in self.names}
+        tokens = []
+        self._fuzzy_terms = {}
+        for i, key in enumerate(self.keys):
+            words = key.split()
+            for word in words[1:]:
+                tokens.append((word, i))
+            for term in [key] + words:
+                self._fuzzy_terms.setdefault(term, set()).add(i)
+        tokens.sort()
+        self._token_keys = [t for t, _ in tokens]
+        self._token_ids = [i for _, i in tokens]
+
+    def __len__(self):
+        return len(self.names)
+
+    def _prefix_range(self, keys, query):
+        return bisect_left(keys, query), bisect_left(keys, query + "\uffff")
+
+    def matches(self, query, team=None):
+        """Names matching query: full-name prefix first, then word prefix, then fuzzy"""
+        query = (query or "").strip().casefold()
+        if not query:
+            ids = range(len(self.names))
+        else:
+            lo, hi = self._prefix_range(self.keys, query)
+            ids = list(range(lo, hi))
+            seen = set(ids)
+            lo, hi = self._prefix_range(self._token_keys, query)
+            for i in sorted({self._token_ids[j] for j in range(lo, hi)} - seen):
+                ids.append(i)
+            if not ids:
+                close = difflib.get_close_matches(query, self._fuzzy_terms, n=20, cutoff=0.6)
+                ids = sorted({i for term in close for i in self._fuzzy_terms[term]})
+        names = [self.names[i] for i in ids]
+        if team:
+            names = [n for n in names if self.teams[n] == team]
+        return names
+
+    def search(self, query, page=1, page_size=50, team=None):
+        """(names on the requested page, total matches, page count)"""
+        names = self.matches(query, team)
+        pages = max(1, math.ceil(len(names) / page_size))
+        page = min(max(1, page), pages)
+        return names[(page - 1) * page_size:page * page_size], len(names), pages
+
+    def grouped(self, names):
+        """Group a result list by team, preserving order within each team"""
+        groups = {}
+        for name in names:
+            groups.setdefault(self.teams[name], []).append(name)
+        return groups
+
+    def team_names(self):
+        return sorted({t for t in self.teams.values() if t})
+
+
+def employee_search_box(index, all_label, key, label="Employee", page_size=50, container=st, team=None):
+    """Search box plus a paged selectbox of matching names; returns the selection"""
+    query = container.text_input(f"Search {label}", placeholder="Type a name...", key=f"{key}_query")
+    matches = index.matches(query, team)
+    pages = max(1, math.ceil(len(matches) / page_size))
+    page_key = f"{key}_page"
+    st.session_state[page_key] = min(st.session_state.get(page_key, 1), pages)
+    if pages > 1:
+        container.number_input(f"Page (of {pages}, {len(matches)} matches)", 1, pages, key=page_key)
+    page = st.session_state[page_key]
+    names = matches[(page - 1) * page_size:page * page_size]
+
+    show_team = len(index.team_names()) > 1
+    if show_team:
+        names = [n for group in index.grouped(names).values() for n in group]
+    options = [all_label] + names
+    current = st.session_state.get(key)
+    if current and current != all_label and current not in index.teams:
+        # Chosen in another data version (e.g. an as-of view) and not in this one
+        st.session_state[key] = current = all_label
+    if current and current not in options:
+        options.insert(1, current)
+    return container.selectbox(
+        label, options, key=key,
+        format_func=lambda n: f"{n} · {index.teams[n]}" if show_team and n in index.teams else n
+    )
@@ -0,0 +1,86 @@
+"""Server-side paging, sorting and date-range filtering for leave history tables"""
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+def sorted_history(frame, date_col):
+    """frame ordered by date_col once, so any date range is two searchsorted calls"""
+    return frame.sort_values(date_col, kind='stable').reset_index(drop=True)
+
+
+def date_bounds(history, date_col, start=None, end=None):
+    """Positional [lo, hi) range of rows dated start..end (inclusive)"""
+    dates = history[date_col].to_numpy()
+    lo = int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), 'left')) if start is not None else 0
+    hi = (int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end) + pd.Timedelta(days=1)), 'left'))
+          if end is not None else len(history))
+    return lo, max(lo, hi)
+
+
+def page_slice(history, date_col, start=None, end=None, sort_col=None, ascending=False,
+               page=1, page_size=25):
+    """(rows on the page, matching rows, page count) from a sorted_history frame.
+
+    Only the requested page is materialised: date order is a positional slice,
+    other sort columns argsort just the rows inside the date range.
+    """
+    lo, hi = date_bounds(history, date_col, start, end)
+    total = hi - lo
+    pages = max(1, math.ceil(total / page_size))
+    page = min(max(1, page), pages)
+    first = (page - 1) * page_size
+    last = min(first + page_size, total)
+
+    if sort_col in (None, date_col):
+        positions = np.arange(lo + first, lo + last) if ascending else np.arange(hi - 1 - first, hi - 1 - last, -1)
+    else:
+        order = np.argsort(history[sort_col].to_numpy()[lo:hi], kind='stable')
+        if not ascending:
+            order = order[::-1]
+        positions = lo + order[first:last]
+    return history.iloc[positions], total, pages
+
+
+def paged_history_table(history, key, date_col, columns, date_columns=(), page_size=25, container=st):
+    """Date-range, sort and page controls over a sorted_history frame; renders one page.
+
+    key should identify whose history it is (e.g. include the employee). A
+    range chosen for other data is reset whenever the history's date bounds
+    change, so it can never silently hide rows.
+    """
+    if history.empty:
+        container.info("No leave records to show")
+        return
+
+    col1, col2, col3 = container.columns([2, 1, 1])
+    first_day, last_day = history[date_col].iloc[0].date(), history[date_col].iloc[-1].date()
+    if st.session_state.get(f"{key}_bounds") != (first_day, last_day):
+        st.session_state[f"{key}_bounds"] = (first_day, last_day)
+        st.session_state[f"{key}_range"] = (first_day, last_day)
+        st.session_state[f"{key}_page"] = 1
+    # The range's value lives in session state (set above), not in value=
+    date_range = col1.date_input("Date range", min_value=first_day, max_value=last_day, key=f"{key}_range")
+    start, end = (tuple(date_range) + (None, None))[:2] if isinstance(date_range, (tuple, list)) else (date_range, None)
+    sort_col = col2.selectbox("Sort by", columns, index=columns.index(date_col) if date_col in columns else 0,
+                              key=f"{key}_sort")
+    descending = col3.selectbox("Order", ["Descending", "Ascending"], key=f"{key}_order") == "Descending"
+
+    page_key = f"{key}_page"
+    lo, hi = date_bounds(history, date_col, start, end)
+    pages = max(1, math.ceil((hi - lo) / page_size))
+    st.session_state[page_key] = min(st.session_state.get(page_key, 1), pages)
+    if pages > 1:
+        container.number_input(f"Page (of {pages}, {hi - lo} records)", 1, pages, key=page_key)
+    rows, total, _ = page_slice(history, date_col, start, end, sort_col, not descending,
+                                st.session_state[page_key], page_size)
+
+    display = rows[columns].copy()
+    for column in date_columns:
+        display[column] = display[column].dt.strftime('%Y-%m-%d')
+    container.dataframe(display, use_container_width=True, hide_index=True)
+    if total:
+        first = (st.session_state[page_key] - 1) * page_size + 1
+        container.caption(f"Showing {first}–{first + len(display) - 1} of {total}")
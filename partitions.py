@@ -0,0 +1,118 @@
+"""Team partitions of the leave dataset with per-partition versions and caches.
+
+Teams come from an explicit Email,Team CSV (team_mapping.csv next to the apps
+or LEAVE_TRACKER_TEAM_MAP), otherwise from the email address: its domain by
+default, or the local-part prefix before the first '.', '_' or '-' when
+LEAVE_TRACKER_TEAM_FROM=prefix.
+"""
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from leave_data import data_version
+
+ALL_TEAMS = "All Teams"
+TEAM_MAP_NAME = "team_mapping.csv"
+
+
+def load_team_mapping(path=None):
+    path = path or os.environ.get("LEAVE_TRACKER_TEAM_MAP") or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), TEAM_MAP_NAME)
+    if not os.path.exists(path):
+        return {}
+    mapping = pd.read_csv(path)
+    return dict(zip(mapping['Email'].str.strip().str.lower(), mapping['Team'].str.strip()))
+
+
+def derive_teams(emails, mapping=None, mode=None):
+    """Vectorised team lookup for a Series of email addresses"""
+    mode = mode or os.environ.get("LEAVE_TRACKER_TEAM_FROM", "domain")
+    emails = emails.fillna("").astype(str).str.strip().str.lower()
+    if mode == "prefix":
+        local = emails.str.split("@").str[0]
+        derived = local.map(lambda s: re.split(r"[._-]", s)[0] if re.search(r"[._-]", s) else "other")
+    else:
+        derived = emails.str.split("@").str[-1].replace("", "other")
+    if mapping:
+        derived = emails.map(mapping).fillna(derived)
+    return derived
+
+
+class PartitionedLeaves:
+    """Leave rows split by team, each partition with its own content version.
+
+    update() re-hashes the partitions of a new dataset; cached views, and
+    anything keyed on version(team), survive for every team whose rows did not
+    change. ALL_TEAMS stands for the whole dataset and changes with any team.
+    """
+
+    def __init__(self, mapping=None, mode=None, max_views=512):
+        self.mapping = load_team_mapping() if mapping is None else mapping
+        self.mode = mode
+        self.max_views = max_views
+        self.frames = {}
+        self.versions = {}
+        self.full = pd.DataFrame()
+        self.source_version = None
+        self.team_of_email = {}
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, df, source_version=None, email_col='Email', teams=None):
+        """Repartition df and drop cached views of teams whose rows changed; returns those teams.
+
+        teams, one per row of df, skips deriving them (e.g. as published by
+        shared_dataset).
+        """
+        teams = derive_teams(df[email_col], self.mapping, self.mode) if teams is None else pd.Series(teams)
+        frames = {team: frame for team, frame in df.groupby(teams.to_numpy(), sort=True)}
+        versions = {team: data_version(frame) for team, frame in frames.items()}
+        team_of_email = dict(zip(df[email_col].str.strip().str.lower(), teams))
+        with self._lock:
+            changed = {t for t in set(versions) | set(self.versions) if versions.get(t) != self.versions.get(t)}
+            if changed or source_version != self.source_version:
+                changed.add(ALL_TEAMS)
+            for key in [k for k in self._views if k[0] in changed]:
+                del self._views[key]
+            self.frames, self.versions, self.full = frames, versions, df
+            self.source_version = source_version
+            self.team_of_email = team_of_email
+        return changed
+
+    def version(self, team):
+        """Content version of a team's rows; the dataset version for ALL_TEAMS"""
+        return self.source_version if team == ALL_TEAMS else self.versions.get(team)
+
+    def teams(self):
+        return list(self.frames)
+
+    def team_of(self, email):
+        return self.team_of_email.get(str(email).strip().lower(), "other")
+
+    def frame(self, team):
+        return self.full if team == ALL_TEAMS else self.frames.get(team, pd.DataFrame())
+
+    def snapshot(self, team):
+        """(frame, version) of one team (or ALL_TEAMS), read together"""
+        with self._lock:
+            return self.frame(team), self.version(team)
+
+    def view(self, team, name, build, *args):
+        """Cached build(frame, *args) for one team (or ALL_TEAMS), rebuilt only when its rows change"""
+        key = (team, name, args)
+        with self._lock:
+            if key in self._views:
+                self._views.move_to_end(key)
+                return self._views[key]
+            frame, version = self.frame(team), self.version(team)
+        value = build(frame, *args)
+        with self._lock:
+            # Skip storing a view built from rows replaced mid-build
+            if self.version(team) == version:
+                self._views[key] = value
+                while self.max_views and len(self._views) > self.max_views:
+                    self._views.popitem(last=False)
+        return value
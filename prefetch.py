@@ -0,0 +1,80 @@
+"""Background warm-up of the views a user is likely to open next.
+
+After each render the apps queue the previous and next month, and when the
+data changes the landing view and this week's "who's out", on a small shared
+thread pool. Jobs build through the same thread-safe caches the page reads
+(DependencyCache, MonthViewCache, the query API), so the next click is a
+cache hit. Queued keys are deduplicated and failures are only logged: a
+prefetch is never more than an optimisation.
+
+    LEAVE_TRACKER_PREFETCH=0             disable
+    LEAVE_TRACKER_PREFETCH_WORKERS=1     background threads (default 1)
+
+Jobs must not call st.* functions: they run outside any script run.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+def prefetch_enabled():
+    return os.environ.get("LEAVE_TRACKER_PREFETCH", "1").lower() not in ("0", "false", "no")
+
+
+def adjacent_months(year, month):
+    """(year, month) of the previous and next month"""
+    previous = (year - 1, 12) if month == 1 else (year, month - 1)
+    following = (year + 1, 1) if month == 12 else (year, month + 1)
+    return [previous, following]
+
+
+def current_week(today=None):
+    """Monday and Sunday of the week containing today"""
+    today = today or date.today()
+    monday = today - timedelta(days=today.weekday())
+    return monday, monday + timedelta(days=6)
+
+
+class Prefetcher:
+    """Runs keyed jobs on a background pool, at most one queued job per key"""
+
+    def __init__(self, workers=None):
+        workers = workers or int(os.environ.get("LEAVE_TRACKER_PREFETCH_WORKERS") or 1)
+        self.enabled = prefetch_enabled()
+        self.stats = {'submitted': 0, 'skipped': 0, 'failed': 0}
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="prefetch")
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def submit(self, key, job, *args):
+        """Queue job(*args) unless an identical key is still pending"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            if key in self._pending:
+                self.stats['skipped'] += 1
+                return None
+            self._pending.add(key)
+            self.stats['submitted'] += 1
+        return self._pool.submit(self._run, key, job, args)
+
+    def _run(self, key, job, args):
+        try:
+            return job(*args)
+        except Exception:
+            self.stats['failed'] += 1
+            logger.warning("Prefetch of %r failed", key, exc_info=True)
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def shutdown(self, wait=False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,142 @@
+"""Opt-in profiling of a session's next few reruns.
+
+Arm it for one browser session with ?profile=5&token=<LEAVE_TRACKER_ADMIN_TOKEN>
+(without the admin token set, ?profile is ignored), or for every new session
+with LEAVE_TRACKER_PROFILE=5. Either way at most MAX_RUNS reruns are profiled. Each profiled rerun writes a .prof (pstats) file, or
+an .html flamegraph when LEAVE_TRACKER_PROFILER=pyinstrument and pyinstrument
+is installed, next to a .json file recording the filters and session state.
+
+    LEAVE_TRACKER_PROFILE_DIR=profiles     output directory (default ./profiles)
+
+Reruns cut short by st.rerun()/st.stop() are saved at the start of the next
+rerun and marked as interrupted.
+"""
+import cProfile
+import hmac
+import json
+import os
+import time
+from datetime import date, datetime
+
+import streamlit as st
+
+_STATE_KEY = "_profile"
+_RUNS_KEY = "_profile_runs"
+MAX_RUNS = 20
+
+
+def _profile_dir():
+    return os.environ.get("LEAVE_TRACKER_PROFILE_DIR") or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "profiles")
+
+
+def _run_count(value):
+    return min(int(value), MAX_RUNS) if value.isdigit() else 1
+
+
+def _requested_runs():
+    """Reruns to profile if this session has just been armed, else 0"""
+    params = st.query_params
+    if "profile" in params:
+        token = os.environ.get("LEAVE_TRACKER_ADMIN_TOKEN")
+        value = params.get("profile")
+        del params["profile"]
+        if not token or not hmac.compare_digest(params.get("token", ""), token):
+            return 0
+        return _run_count(value)
+    env_runs = os.environ.get("LEAVE_TRACKER_PROFILE")
+    if env_runs and not st.session_state.get("_profile_env_armed"):
+        st.session_state["_profile_env_armed"] = True
+        return _run_count(env_runs)
+    return 0
+
+
+def _session_snapshot():
+    """Scalar session_state values, e.g. the page, month and employee selection"""
+    snapshot = {}
+    for key, value in st.session_state.to_dict().items():
+        if str(key).startswith("_") or str(key).startswith("FormSubmitter"):
+            continue
+        if isinstance(value, (str, int, float, bool)) or value is None:
+            snapshot[str(key)] = value
+        elif isinstance(value, (date, datetime)):
+            snapshot[str(key)] = value.isoformat()
+    return snapshot
+
+
+class _Run:
+    def __init__(self, app):
+        self.app = app
+        self.started = time.perf_counter()
+        self.stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        self.backend = "cprofile"
+        self.profiler = None
+        if os.environ.get("LEAVE_TRACKER_PROFILER") == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+                self.profiler, self.backend = Profiler(async_mode="disabled"), "pyinstrument"
+            except ImportError:
+                pass
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+
+    def start(self):
+        try:
+            if self.backend == "pyinstrument":
+                self.profiler.start()
+            else:
+                self.profiler.enable()
+            return True
+        except (RuntimeError, ValueError):
+            # Another session holds the process-wide profiler
+            return False
+
+    def save(self, filters, interrupted=False):
+        elapsed = time.perf_counter() - self.started
+        directory = _profile_dir()
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{self.app}-{self.stamp}")
+        if self.backend == "pyinstrument":
+            self.profiler.stop()
+            path = base + ".html"
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(self.profiler.output_html())
+        else:
+            self.profiler.disable()
+            path = base + ".prof"
+            self.profiler.dump_stats(path)
+        meta = {
+            "app": self.app,
+            "profile": os.path.basename(path),
+            "backend": self.backend,
+            "started": self.stamp,
+            "rerun_seconds": round(elapsed, 4),
+            "interrupted": interrupted,
+            "filters": filters,
+            "session_state": _session_snapshot(),
+        }
+        with open(base + ".json", "w", encoding="utf-8") as fh:
+            json.dump(meta, fh, indent=2, default=str)
+        return path
+
+
+def start_rerun_profile(app):
+    """Call at the top of the script: begins profiling this rerun when armed"""
+    state = st.session_state
+    pending = state.pop(_STATE_KEY, None)
+    if pending is not None:
+        pending.save({}, interrupted=True)
+    remaining = min(state.get(_RUNS_KEY, 0) + _requested_runs(), MAX_RUNS)
+    if remaining <= 0:
+        return
+    run = _Run(app)
+    if run.start():
+        state[_STATE_KEY] = run
+        remaining -= 1
+    state[_RUNS_KEY] = remaining
+
+
+def finish_rerun_profile(**filters):
+    """Call at the end of the script with the filter state worth recording"""
+    run = st.session_state.pop(_STATE_KEY, None)
+    return run.save(filters) if run is not None else None
@@ -0,0 +1,44 @@
+"""Rendered calendar months shared by all sessions.
+
+A month grid depends only on (year, month, filter, data version) and today's
+date for the highlight, so its cell HTML is built once and every session
+viewing the same month gets it from a bounded LRU instead of rebuilding each
+day cell and tooltip on every rerun.
+"""
+import threading
+from collections import OrderedDict
+from datetime import date
+
+
+class MonthViewCache:
+    """LRU of rendered month views keyed by filter and data version"""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0}
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._views)
+
+    def get(self, key, build, *args):
+        """Cached build(*args); today's date is part of the key"""
+        key = tuple(key) + (date.today(),)
+        with self._lock:
+            if key in self._views:
+                self._views.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._views[key]
+            self.stats['misses'] += 1
+        value = build(*args)
+        with self._lock:
+            self._views[key] = value
+            self._views.move_to_end(key)
+            while self.max_entries and len(self._views) > self.max_entries:
+                self._views.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._views.clear()
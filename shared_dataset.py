@@ -0,0 +1,204 @@
+"""One parsed copy of the leave dataset shared by every app process.
+
+When several Streamlit processes serve the tracker, each one would otherwise
+parse the workbook and hold its own DataFrame. In shared mode a single loader
+process parses it, numbers the version through the SnapshotStore and writes
+the rows, plus their Team column as the partition index, as an uncompressed
+Arrow IPC file. App processes memory-map that file, so every worker reads the
+same page-cache pages (zero-copy) and none of them parses Excel. CURRENT.json
+is only replaced (atomically) once a version's files are complete, so a worker
+sees the old version or the new one, never half of one.
+
+    LEAVE_TRACKER_SHARED_DIR=/dev/shm/leave_tracker    enable; set for the loader and the apps
+    python shared_dataset.py --watch 5                 loader: publish now and on every change
+
+Older version files are kept for a while (KEEP) so workers still reading one
+are not cut off; unlinked files stay valid for processes that mapped them.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from leave_data import DURATION_LABELS, TRACKER_COLUMNS, read_tracker_rows, workbook_path, workbook_version
+from partitions import derive_teams, load_team_mapping
+from snapshots import SnapshotStore
+
+POINTER = "CURRENT.json"
+KEEP = 3
+
+
+def shared_dir():
+    return os.environ.get("LEAVE_TRACKER_SHARED_DIR") or None
+
+
+def _write_arrow(frame, path):
+    import pyarrow as pa
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    with pa.OSFile(path + ".tmp", "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(path + ".tmp", path)
+
+
+def _map_arrow(path):
+    """Frame over a memory-mapped IPC file; column buffers are not copied"""
+    import pyarrow as pa
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+class SharedDataset:
+    """Published dataset versions in a shared directory, attached on demand"""
+
+    def __init__(self, directory, max_frames=2):
+        self.directory = directory
+        self.max_frames = max_frames
+        self._pointer = None
+        self._pointer_stamp = None
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def current(self):
+        """The published pointer (version, rows, source, modified), or None before the first publish"""
+        try:
+            stamp = os.stat(self._path(POINTER)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if stamp != self._pointer_stamp:
+                with open(self._path(POINTER), encoding="utf-8") as fh:
+                    self._pointer = json.load(fh)
+                self._pointer_stamp = stamp
+            return self._pointer
+
+    def has(self, version):
+        return version in self._frames or os.path.exists(self._path(f"v{version:06d}.arrow"))
+
+    def _attach(self, version):
+        with self._lock:
+            frame = self._frames.get(version)
+            if frame is not None:
+                self._frames.move_to_end(version)
+                return frame
+        frame = _map_arrow(self._path(f"v{version:06d}.arrow"))
+        with self._lock:
+            self._frames[version] = frame
+            while len(self._frames) > self.max_frames:
+                self._frames.popitem(last=False)
+        return frame
+
+    def frame(self, version):
+        """Tracker rows of a published version"""
+        return self._attach(version)[TRACKER_COLUMNS]
+
+    def teams(self, version):
+        """Team of every row of frame(version), as derived by the loader"""
+        return self._attach(version)['Team']
+
+    def quarantine(self, version):
+        path = self._path(f"q{version:06d}.arrow")
+        return _map_arrow(path) if os.path.exists(path) else pd.DataFrame()
+
+    def publish(self, frame, version, teams=None, quarantined=None, source=None, modified=None):
+        """Write a version's files, then point CURRENT at it.
+
+        A version's rows never change, so an existing row file is left as is
+        (workers may have it mapped); the quarantine is always rewritten.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        rows_path, quarantine_path = self._path(f"v{version:06d}.arrow"), self._path(f"q{version:06d}.arrow")
+        if not os.path.exists(rows_path):
+            frame = frame[TRACKER_COLUMNS].reset_index(drop=True)
+            teams = derive_teams(frame['Email'], load_team_mapping()) if teams is None else teams
+            _write_arrow(frame.assign(Team=pd.Series(teams).to_numpy()), rows_path)
+        if quarantined is not None and not quarantined.empty:
+            # Quarantined cells are whatever was typed in the sheet; keep them as text
+            _write_arrow(quarantined.astype({c: "string" for c in quarantined.columns if c != 'Row'}),
+                         quarantine_path)
+        elif os.path.exists(quarantine_path):
+            os.remove(quarantine_path)
+        pointer = {
+            'version': version,
+            'rows': len(frame),
+            'source': source,
+            'modified': (modified or datetime.now(timezone.utc)).isoformat(),
+            'published': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+        with open(self._path(POINTER + ".tmp"), "w", encoding="utf-8") as fh:
+            json.dump(pointer, fh, indent=1)
+        os.replace(self._path(POINTER + ".tmp"), self._path(POINTER))
+        self._prune(version)
+        return pointer
+
+    def _prune(self, version):
+        for name in os.listdir(self.directory):
+            if name[:1] in "vq" and name.endswith(".arrow") and name[1:-6].isdigit():
+                if int(name[1:-6]) <= version - KEEP:
+                    try:
+                        os.remove(self._path(name))
+                    except OSError:
+                        pass  # still mapped on a platform that refuses to unlink it
+
+
+def publish_workbook(shared, snapshots, path=None, mapping=None):
+    """Parse the workbook and publish it unless this state is already current; returns the pointer.
+
+    A workbook that cannot be read, or has no valid rows, is not published:
+    the current version stays in place.
+    """
+    path = path or workbook_path()
+    token = workbook_version(path)
+    current = shared.current()
+    if current and current['source'] == token:
+        return current
+    try:
+        rows, quarantined = read_tracker_rows(path)
+    except Exception as e:
+        print(f"Not published, the workbook could not be read: {e}", file=sys.stderr, flush=True)
+        return current
+    if rows.empty:
+        print("Not published, the workbook has no valid rows", file=sys.stderr, flush=True)
+        return current
+    labels = {days: label for label, days in DURATION_LABELS.items()}
+    rows['Duration'] = rows['Duration'].map(labels)
+    version = snapshots.commit(rows, source=token)
+    teams = derive_teams(rows['Email'], load_team_mapping() if mapping is None else mapping)
+    return shared.publish(rows, version, teams, quarantined, token,
+                          datetime.fromtimestamp(os.path.getmtime(path), timezone.utc))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish the leave dataset for all app processes")
+    parser.add_argument("--dir", default=shared_dir(), help="shared directory (default: LEAVE_TRACKER_SHARED_DIR)")
+    parser.add_argument("--workbook", help="tracker workbook (default: the one next to the apps)")
+    parser.add_argument("--watch", type=float, metavar="SECONDS",
+                        help="keep running and republish when the workbook changes")
+    args = parser.parse_args(argv)
+    if not args.dir:
+        parser.error("--dir or LEAVE_TRACKER_SHARED_DIR is required")
+
+    shared, snapshots = SharedDataset(args.dir), SnapshotStore()
+    while True:
+        started = time.perf_counter()
+        previous = shared.current()
+        pointer = publish_workbook(shared, snapshots, args.workbook)
+        if pointer is not previous:
+            print(f"v{pointer['version']}: {pointer['rows']} row(s) published to {args.dir} "
+                  f"in {time.perf_counter() - started:.2f}s", flush=True)
+        if not args.watch:
+            return 0
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""Versioned snapshots of the leave dataset, stored as row deltas.
+
+Every load of the workbook that changes its rows becomes a numbered version
+(1, 2, ...). A version is saved as a small Parquet delta holding the rows
+added (+1) and removed (-1) since the previous version, and manifest.json
+records when it was taken and which workbook state it came from. Any version
+is rebuilt by replaying deltas, so the app can show the data as of an earlier
+load and diff two loads, and the version number doubles as the cache key of
+everything derived from the data.
+
+    LEAVE_TRACKER_SNAPSHOT_DIR=snapshots     deltas and manifest (default ./snapshots)
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from dependency_cache import leave_keys
+from leave_data import TRACKER_COLUMNS
+
+MANIFEST = "manifest.json"
+
+
+def snapshot_dir():
+    return os.environ.get("LEAVE_TRACKER_SNAPSHOT_DIR") or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "snapshots")
+
+
+def row_hashes(frame, columns=TRACKER_COLUMNS):
+    """Content hash per row, independent of string dtype and datetime unit"""
+    normalised = pd.DataFrame({
+        column: (frame[column].astype('datetime64[ns]') if pd.api.types.is_datetime64_any_dtype(frame[column])
+                 else frame[column].astype(object))
+        for column in columns
+    })
+    return pd.util.hash_pandas_object(normalised, index=False).to_numpy()
+
+
+def _net_rows(ops, sign):
+    """Rows whose net count (sum of _op per hash) has the given sign, once per unit of count"""
+    net = ops.groupby('_hash')['_op'].sum() * sign
+    rows = ops[ops['_op'].to_numpy() == sign]
+    keep = rows.groupby('_hash').cumcount().to_numpy() < net.reindex(rows['_hash']).to_numpy()
+    return rows[keep]
+
+
+class SnapshotStore:
+    """Append-only versions of a leave frame with as-of and diff queries"""
+
+    def __init__(self, directory=None, columns=TRACKER_COLUMNS, max_frames=4):
+        self.directory = directory or snapshot_dir()
+        self.columns = list(columns)
+        self.max_frames = max_frames
+        self.manifest = []
+        self._sources = {}
+        self._deltas = {}
+        self._frames = OrderedDict()
+        self._lock = threading.RLock()
+        self._manifest_stamp = None
+        self.refresh()
+
+    def refresh(self):
+        """Re-read the manifest if another process (e.g. the shared_dataset loader) committed since"""
+        path = os.path.join(self.directory, MANIFEST)
+        try:
+            stamp = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        with self._lock:
+            if stamp == self._manifest_stamp:
+                return
+            with open(path, encoding="utf-8") as fh:
+                self.manifest = json.load(fh)
+            self._manifest_stamp = stamp
+            self._sources = {source: entry['version'] for entry in self.manifest for source in entry['sources']}
+
+    @property
+    def latest(self):
+        return self.manifest[-1]['version'] if self.manifest else 0
+
+    def version_of(self, source):
+        """Version recorded for a source token (e.g. a workbook_version), or None"""
+        return self._sources.get(source)
+
+    def versions(self):
+        """One row per version: when it was taken, rows added/removed and total rows"""
+        return pd.DataFrame(self.manifest, columns=['version', 'created', 'added', 'removed', 'rows', 'sources'])
+
+    def _delta(self, version):
+        delta = self._deltas.get(version)
+        if delta is None:
+            delta = self._deltas[version] = pd.read_parquet(
+                os.path.join(self.directory, f"v{version:06d}.parquet"))
+        return delta
+
+    def _write_manifest(self):
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + ".tmp", "w", encoding="utf-8") as fh:
+            json.dump(self.manifest, fh, indent=1)
+        os.replace(path + ".tmp", path)
+        self._manifest_stamp = os.stat(path).st_mtime_ns
+
+    def _remember(self, version, frame):
+        self._frames[version] = frame
+        self._frames.move_to_end(version)
+        while len(self._frames) > self.max_frames:
+            self._frames.popitem(last=False)
+
+    def commit(self, frame, source=None):
+        """Record frame as a new version if its rows changed; returns the version number"""
+        with self._lock:
+            if source is not None and source in self._sources:
+                return self._sources[source]
+            frame = frame[self.columns].reset_index(drop=True)
+            latest = self.latest
+            previous = self.as_of(latest) if latest else frame.iloc[:0]
+            ops = pd.concat([
+                previous.assign(_hash=row_hashes(previous, self.columns), _op=np.int8(-1)),
+                frame.assign(_hash=row_hashes(frame, self.columns), _op=np.int8(1)),
+            ], ignore_index=True)
+            delta = pd.concat([_net_rows(ops, 1), _net_rows(ops, -1)], ignore_index=True)
+
+            if latest and delta.empty:
+                version = latest
+                if source is not None:
+                    self.manifest[-1]['sources'].append(source)
+            else:
+                version = latest + 1
+                os.makedirs(self.directory, exist_ok=True)
+                delta.to_parquet(os.path.join(self.directory, f"v{version:06d}.parquet"), index=False)
+                self._deltas[version] = delta
+                self.manifest.append({
+                    'version': version,
+                    'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                    'added': int((delta['_op'] > 0).sum()),
+                    'removed': int((delta['_op'] < 0).sum()),
+                    'rows': len(frame),
+                    'sources': [source],
+                })
+            if source is not None:
+                self._sources[source] = version
+            self._write_manifest()
+            if version != latest:
+                self._remember(version, frame)
+            return version
+
+    def resolve(self, version=None, when=None):
+        """Version number for an explicit version, the last one taken at or before `when`, or the latest"""
+        if version is not None:
+            if not 1 <= version <= self.latest:
+                raise KeyError(f"Unknown data version {version}")
+            return version
+        if when is not None:
+            when = pd.Timestamp(when)
+            when = when.tz_localize(timezone.utc) if when.tzinfo is None else when
+            taken = [e['version'] for e in self.manifest if pd.Timestamp(e['created']) <= when]
+            if not taken:
+                raise KeyError(f"No data version taken by {when}")
+            return taken[-1]
+        return self.latest
+
+    def as_of(self, version=None, when=None):
+        """The dataset at a version (or time), rebuilt from deltas when not cached"""
+        with self._lock:
+            version = self.resolve(version, when)
+            frame = self._frames.get(version)
+            if frame is not None:
+                self._frames.move_to_end(version)
+                return frame
+            ops = pd.concat([self._delta(v) for v in range(1, version + 1)], ignore_index=True)
+            frame = _net_rows(ops, 1)[self.columns].reset_index(drop=True)
+            frame = frame.astype({c: object for c in self.columns
+                                  if not pd.api.types.is_datetime64_any_dtype(frame[c])})
+            self._remember(version, frame)
+            return frame
+
+    def diff(self, old, new):
+        """(rows added, rows removed) going from version old to version new"""
+        with self._lock:
+            old, new = self.resolve(old), self.resolve(new)
+            if old == new:
+                empty = self.as_of(new).iloc[:0]
+                return empty, empty
+            low, high = sorted((old, new))
+            ops = pd.concat([self._delta(v) for v in range(low + 1, high + 1)], ignore_index=True)
+            added, removed = _net_rows(ops, 1), _net_rows(ops, -1)
+            if old > new:
+                added, removed = removed, added
+            return (added[self.columns].reset_index(drop=True), removed[self.columns].reset_index(drop=True))
+
+    def changed_keys(self, old, new, name_col='Name', date_col='Leave Date'):
+        """(employee, year, month) keys touched between two versions, for DependencyCache.invalidate"""
+        added, removed = self.diff(old, new)
+        return leave_keys(pd.concat([added, removed], ignore_index=True), name_col, date_col)
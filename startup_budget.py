@@ -0,0 +1,102 @@
+"""Cold-start time budget for the leave tracker apps.
+
+Runs each app's first rerun in a fresh interpreter through AppTest, reports
+interpreter + Streamlit import time, first-rerun time and any deferred heavy
+modules that were imported anyway, and exits non-zero when over budget.
+
+    python startup_budget.py
+    python startup_budget.py --app v1848BRH.py --budget 1.5 --repeat 5 --json startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Seconds for the first rerun of a fresh process
+DEFAULT_BUDGETS = {
+    "leave_tracker.py": 1.5,
+    "v1848BRH.py": 1.5,
+}
+
+# Modules the initial page must not pull in; they load when a chart is shown
+DEFERRED_MODULES = {
+    "leave_tracker.py": ["matplotlib.pyplot", "altair"],
+    "v1848BRH.py": ["plotly.express", "altair"],
+}
+
+
+def _child(app):
+    import warnings
+    warnings.filterwarnings("ignore")
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    imported = time.perf_counter()
+    at = AppTest.from_file(os.path.join(APP_DIR, app), default_timeout=120).run()
+    finished = time.perf_counter()
+    print(json.dumps({
+        "streamlit_import_s": imported - started,
+        "first_run_s": finished - imported,
+        "errors": [e.message.splitlines()[0] for e in at.exception],
+        "loaded": sorted(m for m in DEFERRED_MODULES[app] if m in sys.modules),
+    }))
+
+
+def measure(app):
+    """One cold start of app in a new interpreter"""
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", app],
+                          capture_output=True, text=True, cwd=APP_DIR)
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"{app} failed to start:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_s"] = wall
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", action="append", choices=sorted(DEFAULT_BUDGETS),
+                        help="app to measure (repeatable, default: all)")
+    parser.add_argument("--budget", type=float, help="first-rerun budget in seconds for every app")
+    parser.add_argument("--repeat", type=int, default=3, help="cold starts per app; the median is reported")
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(args.child)
+        return 0
+
+    report, failed = {}, False
+    for app in args.app or sorted(DEFAULT_BUDGETS):
+        runs = [measure(app) for _ in range(max(1, args.repeat))]
+        budget = args.budget or DEFAULT_BUDGETS[app]
+        summary = {
+            key: round(statistics.median(r[key] for r in runs), 3)
+            for key in ("process_s", "streamlit_import_s", "first_run_s")
+        }
+        summary.update({
+            "budget_s": budget,
+            "eager_modules": sorted({m for r in runs for m in r["loaded"]}),
+            "errors": sorted({e for r in runs for e in r["errors"]}),
+        })
+        summary["ok"] = (summary["first_run_s"] <= budget and not summary["eager_modules"]
+                         and not summary["errors"])
+        failed |= not summary["ok"]
+        report[app] = summary
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from absence_analytics import AbsenceAnalytics
+
+
+def _rows(*entries):
+    return pd.DataFrame({
+        'Name': [name for name, _, _ in entries],
+        'Leave Date': pd.to_datetime([day for _, day, _ in entries]),
+        'Leave Type': [leave_type for _, _, leave_type in entries],
+        'Duration': 1.0,
+    })
+
+
+def _diff(frames):
+    def changes(old, new):
+        before, after = frames[old], frames[new]
+        merged = before.merge(after, how='outer', indicator=True)
+        return (merged[merged['_merge'] == 'right_only'].drop(columns='_merge'),
+                merged[merged['_merge'] == 'left_only'].drop(columns='_merge'))
+    return changes
+
+
+def test_friday_monday_sickness_is_one_spell():
+    analytics = AbsenceAnalytics().sync(_rows(
+        ("Asha", "2025-01-03", "Sick Leave"),
+        ("Asha", "2025-01-06", "Sick Leave"),
+        ("Asha", "2025-01-15", "Sick Leave"),
+        ("Asha", "2025-01-20", "Casual Leave"),
+    ), "v1")
+    scores = analytics.bradford("2025-01-31").loc["Asha"]
+    assert scores['Sick Spells'] == 2
+    assert scores['Sick Days'] == 3
+    assert scores['Bradford Factor'] == 12
+    assert analytics.rolling_rates("2025-01-31", windows=(30,)).loc["Asha", 'Days 30d'] == 4
+
+
+def test_sync_applies_deltas_like_a_rebuild():
+    v1 = _rows(("Asha", "2025-01-06", "Sick Leave"), ("Ben", "2025-02-03", "Casual Leave"))
+    v2 = pd.concat([v1.iloc[1:], _rows(("Asha", "2024-12-30", "Sick Leave"),
+                                       ("Cleo", "2025-03-03", "Sick Leave"))], ignore_index=True)
+    frames = {"v1": v1, "v2": v2}
+    synced = AbsenceAnalytics().sync(v1, "v1").sync(v2, "v2", _diff(frames))
+    rebuilt = AbsenceAnalytics().sync(v2, "v2")
+
+    pd.testing.assert_frame_equal(synced.summary("2025-03-31").set_index('Employee Name').sort_index(),
+                                  rebuilt.summary("2025-03-31").set_index('Employee Name').sort_index())
+    np.testing.assert_allclose(synced.org_trend(30).loc["2025-01-01":].to_numpy(),
+                               rebuilt.org_trend(30).loc["2025-01-01":].to_numpy())
+
+
+def test_org_trend_uses_roster_headcount():
+    analytics = AbsenceAnalytics().sync(_rows(("Asha", "2025-01-06", "Casual Leave")), "v1")
+    analytics.add_employees(["Ben", "Cleo", "Dev"])
+    trend = analytics.org_trend(window=1)
+    assert trend.loc["2025-01-06"] == 0.25
+    assert analytics.org_trend(window=1, headcount=2).loc["2025-01-06"] == 0.5
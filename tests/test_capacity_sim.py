@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from capacity_sim import CapacitySimulator
+
+
+def _rows(*entries):
+    return pd.DataFrame({
+        'Name': [name for name, _, _ in entries],
+        'Leave Date': pd.to_datetime([day for _, day, _ in entries]),
+        'Leave Type': "Casual Leave",
+        'Duration': [duration for _, _, duration in entries],
+    })
+
+
+ROWS = _rows(("Asha", "2025-03-03", "Full Day"), ("Ben", "2025-03-03", "Half Day"),
+             ("Ravi", "2025-03-04", "Full Day"))
+
+
+def test_roster_scopes_rows_and_sets_headcount():
+    simulator = CapacitySimulator(ROWS, roster=["Asha", "ben", "Cleo"])
+    assert simulator.headcount == 3
+    result = simulator.simulate("2025-03-03", "2025-03-04", scenarios=10, seed=0).set_index('Date')
+    assert result.loc["2025-03-03", 'Booked Absent'] == 1.5
+    assert result.loc["2025-03-04", 'Booked Absent'] == 0.0
+
+
+def test_explicit_headcount_counts_members_without_leave():
+    assert CapacitySimulator(ROWS, roster=["Asha"], headcount=10).headcount == 10
+    assert CapacitySimulator(ROWS, headcount=8).headcount == 8
+    with pytest.raises(ValueError):
+        CapacitySimulator(ROWS)
+
+
+def test_pending_requests_net_of_booked_leave():
+    simulator = CapacitySimulator(ROWS, roster=["Asha", "Ben"], headcount=4)
+    pending = pd.DataFrame({
+        'Employee Name': ["Asha", "Ben"], 'Leave Type': "Casual Leave",
+        'Start Date': ["2025-03-03", "2025-03-03"], 'End Date': ["2025-03-04", "2025-03-03"], 'Days': [2.0, 1.0],
+    })
+    result = simulator.simulate("2025-03-03", "2025-03-04", pending, scenarios=50, min_staff=3, seed=0)
+    assert result['Pending Absent'].tolist() == [0.5, 1.0]
+    assert result['Expected Available'].max() <= 3.0
+    assert result['P(Below Minimum)'].iloc[0] == 1.0
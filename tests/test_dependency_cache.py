@@ -0,0 +1,66 @@
+import pandas as pd
+
+from dependency_cache import ANY, DependencyCache, changed_keys
+
+
+def _rows(names, dates):
+    return pd.DataFrame({'Name': names, 'Leave Date': pd.to_datetime(dates), 'Duration': 1.0})
+
+
+def test_get_caches_until_a_dependency_changes():
+    cache = DependencyCache()
+    calls = []
+    build = lambda month: calls.append(month) or month
+    cache.get(("month", 2025, 3), [(ANY, 2025, 3)], build, 3)
+    cache.get(("stats", "Asha"), [("Asha", 2025, ANY)], build, "Asha")
+    cache.get(("month", 2025, 3), [(ANY, 2025, 3)], build, 3)
+    assert calls == [3, "Asha"]
+    assert cache.stats['hits'] == 1
+
+    assert cache.invalidate({("Ravi", 2025, 4)}) == 0
+    assert cache.invalidate({("Ravi", 2025, 3)}) == 1
+    assert len(cache) == 1
+    assert cache.invalidate() == 1
+
+
+def test_changed_keys_counts_duplicates():
+    old = _rows(["Asha", "Asha"], ["2025-03-03", "2025-03-03"])
+    new = _rows(["Asha", "Ravi"], ["2025-03-03", "2025-04-01"])
+    assert changed_keys(old, new) == {("Asha", 2025, 3), ("Ravi", 2025, 4)}
+    assert changed_keys(new, new) == set()
+
+
+def test_sync_invalidates_only_touched_views():
+    cache = DependencyCache()
+    old = _rows(["Asha", "Ravi"], ["2025-03-03", "2025-04-01"])
+    assert cache.sync(old, 1) is None
+    cache.get("asha", [("Asha", ANY, ANY)], lambda: 1)
+    cache.get("ravi", [("Ravi", ANY, ANY)], lambda: 2)
+    assert cache.sync(old, 1) == set()
+    new = pd.concat([old, _rows(["Ravi"], ["2025-04-02"])], ignore_index=True)
+    assert cache.sync(new, 2) == {("Ravi", 2025, 4)}
+    assert len(cache) == 1 and cache.version == 2
+
+
+def test_value_built_across_an_invalidation_is_not_stored():
+    cache = DependencyCache()
+    cache.get("view", [], cache.invalidate)
+    assert len(cache) == 0
+
+
+def test_max_entries_evicts_least_recent():
+    cache = DependencyCache(max_entries=2)
+    for key in "abc":
+        cache.get(key, [(key, ANY, ANY)], str, key)
+    assert len(cache) == 2
+    assert cache.invalidate({("a", 2025, 1)}) == 0
+
+
+def test_views_of_another_version_are_not_stored():
+    cache = DependencyCache()
+    cache.sync(_rows(["Asha"], ["2025-03-03"]), 2)
+    assert cache.get("view", [], str, "old", version=1) == "old"
+    assert len(cache) == 0
+    assert cache.get("view", [], str, "new", version=2) == "new"
+    assert cache.get("view", [], str, "old", version=1) == "old"
+    assert cache.get("view", [], str, "other", version=2) == "new"
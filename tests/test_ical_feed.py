@@ -0,0 +1,93 @@
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from ical_feed import IcalFeedBuilder, _fold, make_handler
+
+MODIFIED = datetime(2025, 3, 1, 9, 30, tzinfo=timezone.utc)
+
+
+def _intervals(rows):
+    df = pd.DataFrame(rows, columns=['Email', 'Employee Name', 'Leave Type', 'Start Date', 'End Date', 'Days'])
+    df['Start Date'] = pd.to_datetime(df['Start Date'])
+    df['End Date'] = pd.to_datetime(df['End Date'])
+    return df
+
+
+INTERVALS = _intervals([
+    ["asha@ops.example.com", "Asha Rao", "Sick Leave", "2025-01-06", "2025-01-07", 2],
+    ["ravi@dev.example.com", "Ravi Kumar", "Casual Leave", "2025-02-03", "2025-02-03", 1],
+    ["meera@dev.example.com", "Meera", "Casual Leave", "2025-02-04", "2025-02-04", 0.5],
+])
+
+
+def test_fold_limits_lines_to_75_octets_without_splitting_characters():
+    line = "SUMMARY:" + "é" * 60
+    folded = _fold(line)
+    parts = folded.split("\r\n ")
+    assert len(parts) > 1
+    assert all(len(part.encode("utf-8")) <= 75 for part in parts)
+    assert "".join(parts) == line
+    assert _fold("SHORT:line") == "SHORT:line"
+
+
+def test_team_employee_and_all_feeds():
+    builder = IcalFeedBuilder(mapping={})
+    assert builder.keys(INTERVALS, 1, "team") == ["dev.example.com", "ops.example.com"]
+    assert builder.keys(INTERVALS, 1, "all") == ["all"]
+    body, etag, modified = builder.feed(INTERVALS, 1, "team", "dev.example.com", MODIFIED)
+    text = body.decode("utf-8")
+    assert text.count("BEGIN:VEVENT") == 2
+    assert "DTSTART;VALUE=DATE:20250203" in text and "DTEND;VALUE=DATE:20250204" in text
+    assert builder.feed(INTERVALS, 1, "team", "dev.example.com", MODIFIED)[1] == etag
+    assert builder.feed(INTERVALS, 1, "all", "all", MODIFIED)[0].count(b"BEGIN:VEVENT") == 3
+    assert builder.feed(INTERVALS, 1, "employee", "nobody@example.com") is None
+
+    mapped = IcalFeedBuilder(team_of=lambda email: "platform" if email.startswith("ravi") else "other")
+    assert mapped.keys(INTERVALS, 1, "team") == ["other", "platform"]
+
+
+def test_event_cache_keeps_only_the_last_versions():
+    builder = IcalFeedBuilder(mapping={})
+    builder.feed(INTERVALS, 1, "all", "all", MODIFIED)
+    builder.feed(INTERVALS.iloc[:1], 2, "all", "all", MODIFIED)
+    builder.feed(INTERVALS.iloc[:1], 3, "all", "all", MODIFIED)
+    assert len(builder._events) + len(builder._previous_events) <= 2
+
+
+@pytest.fixture
+def feed_server():
+    builder = IcalFeedBuilder(mapping={})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(builder))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield builder, f"http://127.0.0.1:{server.server_address[1]}/calendar"
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url, **headers):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), b""
+
+
+def test_http_etag_and_not_modified(feed_server):
+    builder, base = feed_server
+    assert _get(f"{base}/all/all.ics")[0] == 503
+    builder.publish(INTERVALS, 1, MODIFIED)
+
+    status, headers, body = _get(f"{base}/employee/asha@ops.example.com.ics")
+    assert status == 200 and b"Asha Rao" in body
+    assert _get(f"{base}/employee/asha@ops.example.com.ics", **{"If-None-Match": headers["ETag"]})[0] == 304
+    assert _get(f"{base}/employee/asha@ops.example.com.ics",
+                **{"If-Modified-Since": headers["Last-Modified"]})[0] == 304
+    assert _get(f"{base}/employee/asha@ops.example.com.ics", **{"If-None-Match": '"stale"'})[0] == 200
+    assert _get(f"{base}/team/unknown.ics")[0] == 404
+    assert _get(f"{base}/other/all.ics")[0] == 404
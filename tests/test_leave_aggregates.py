@@ -0,0 +1,49 @@
+import pandas as pd
+
+from leave_aggregates import bin_monthly_days, monthly_leave_days, monthly_leave_days_by_employee
+
+
+def _leaves(rows):
+    df = pd.DataFrame(rows, columns=['Employee Name', 'Start Date', 'End Date', 'Days'])
+    df['Start Date'] = pd.to_datetime(df['Start Date'])
+    df['End Date'] = pd.to_datetime(df['End Date'])
+    return df
+
+
+def test_leave_is_split_at_month_boundaries():
+    monthly = monthly_leave_days(_leaves([
+        ["Asha", "2025-01-30", "2025-02-03", 5],
+        ["Asha", "2025-02-10", "2025-02-10", 0.5],
+        ["Ravi", "2024-12-31", "2025-03-01", 61],
+    ]))
+    days = {(n, m): d for n, m, d in monthly.itertuples(index=False)}
+    assert days[("Asha", "2025-01")] == 2.0
+    assert days[("Asha", "2025-02")] == 3.5
+    assert days[("Ravi", "2024-12")] == 1.0
+    assert days[("Ravi", "2025-02")] == 28.0
+    assert days[("Ravi", "2025-03")] == 1.0
+    assert monthly['Days'].sum() == 66.5
+
+
+def test_days_are_spread_over_the_calendar_span():
+    monthly = monthly_leave_days(_leaves([["Asha", "2025-03-31", "2025-04-01", 1]]))
+    assert monthly['Days'].tolist() == [0.5, 0.5]
+
+
+def test_by_employee_and_binning():
+    by_employee = monthly_leave_days_by_employee(_leaves([
+        ["Asha", "2025-01-06", "2025-01-06", 1],
+        ["Ravi", "2025-02-03", "2025-02-04", 2],
+    ]))
+    assert sorted(by_employee) == ["Asha", "Ravi"]
+    assert by_employee["Ravi"].to_dict('records') == [{'Month': "2025-02", 'Days': 2.0}]
+
+    monthly = pd.DataFrame({'Month': [f"{y}-{m:02d}" for y in (2023, 2024, 2025) for m in range(1, 13)],
+                            'Days': 1.0})
+    binned = bin_monthly_days(monthly, max_bars=24)
+    assert len(binned) == 12 and binned['Days'].tolist() == [3.0] * 12
+    assert bin_monthly_days(monthly, max_bars=4)['Month'].tolist() == ["2023", "2024", "2025"]
+
+
+def test_empty():
+    assert monthly_leave_days(_leaves([])).empty
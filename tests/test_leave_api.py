@@ -0,0 +1,107 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from leave_api import LeaveQueryService, QueryError, make_handler
+
+
+def _rows():
+    return pd.DataFrame({
+        'Email': ["asha@ops.example.com", "asha@ops.example.com", "ravi@dev.example.com", "meera@dev.example.com"],
+        'Name': ["Asha Rao", "Asha Rao", "Ravi Kumar", "Meera"],
+        'Leave Date': pd.to_datetime(["2025-03-03", "2025-03-04", "2025-03-03", "2025-04-01"]),
+        'Leave Type': ["Sick Leave", "Sick Leave", "Casual Leave", "Casual Leave"],
+        'Duration': ["Full Day", "Half Day", 1.0, 1.0],
+    })
+
+
+def _service():
+    service = LeaveQueryService(mapping={})
+    service.snapshot(_rows(), "v1")
+    return service
+
+
+def test_out_stats_and_coverage():
+    service = _service()
+    out = json.loads(service.answer({"type": "out", "date": "2025-03-03"}))
+    assert out["count"] == 2
+    team_out = json.loads(service.answer({"type": "out", "start": "2025-03-01", "end": "2025-03-31",
+                                          "team": "ops.example.com"}))
+    assert [leave["days"] for leave in team_out["leaves"]] == [1.0, 0.5]
+
+    stats = json.loads(service.answer({"type": "stats", "employee": "asha rao", "year": "2025"}))
+    assert stats["employee"] == "Asha Rao" and stats["total_days"] == 1.5 and stats["half_days"] == 1
+    assert stats["monthly_days"]["Mar"] == 1.5
+
+    coverage = json.loads(service.answer({"type": "coverage", "team": "dev.example.com",
+                                          "start": "2025-03-01", "end": "2025-03-09"}))
+    assert coverage["headcount"] == 2
+    assert len(coverage["days"]) == 5
+    assert coverage["days"][0] == {"date": "2025-03-03", "absent_days": 1.0, "available": 1.0, "coverage": 0.5}
+
+
+def test_answers_are_cached_per_version():
+    service = _service()
+    query = {"type": "out", "date": "2025-03-03"}
+    service.answer(query)
+    service.answer(query)
+    assert service.stats == {'hits': 1, 'misses': 1}
+    service.snapshot(_rows().iloc[:1], "v2")
+    assert json.loads(service.answer(query))["count"] == 1
+
+
+def test_batch_reports_bad_queries_per_slot():
+    service = _service()
+    body = json.loads(service.batch([
+        {"type": "out", "date": "2025-03-03"},
+        {"type": "out", "date": "2025-01-01", "team": ["x"]},
+        {"type": "stats", "employee": {"name": "Asha"}, "year": 2025},
+        {"type": "out", "start": "2025-03-05", "end": "2025-03-01"},
+        {"type": "coverage", "team": "nobody", "date": "2025-03-03"},
+        "out",
+    ]))
+    assert body["version"] == "v1"
+    assert body["results"][0]["count"] == 2
+    assert [set(result) for result in body["results"][1:]] == [{"error"}] * 5
+    with pytest.raises(QueryError):
+        service.batch({"type": "out"})
+
+
+@pytest.fixture
+def api_server():
+    service = LeaveQueryService(mapping={})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(service))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield service, f"http://127.0.0.1:{server.server_address[1]}/api"
+    server.shutdown()
+    server.server_close()
+
+
+def _request(url, payload=None):
+    data = None if payload is None else json.dumps(payload).encode()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_http_endpoints(api_server):
+    service, base = api_server
+    assert _request(f"{base}/version")[0] == 503
+    assert _request(f"{base}/query", [{"type": "out", "date": "2025-03-03"}])[0] == 503
+    service.snapshot(_rows(), "v1")
+
+    assert _request(f"{base}/version") == (200, {"version": "v1"})
+    status, body = _request(f"{base}/out?date=2025-03-03&team=dev.example.com")
+    assert status == 200 and body["count"] == 1
+    assert _request(f"{base}/stats?employee=Asha%20Rao")[0] == 400
+    status, body = _request(f"{base}/query", [{"type": "out", "date": "2025-01-01", "team": ["x"]}])
+    assert status == 200 and "error" in body["results"][0]
+    assert _request(f"{base}/query", {"queries": "out"})[0] == 400
+    assert _request(f"{base}/unknown")[0] == 404
@@ -0,0 +1,107 @@
+from datetime import date
+
+import pandas as pd
+
+from leave_balance import LeaveBalanceLedger
+
+
+def test_monthly_accrual_and_used():
+    ledger = LeaveBalanceLedger()
+    ledger.record("Asha", "Earned Leave", date(2025, 3, 3), date(2025, 3, 4))
+    snapshot = ledger.balance("Asha", "Earned Leave", date(2025, 6, 15))
+    assert snapshot['Accrued'] == 9.0
+    assert snapshot['Used'] == 2.0
+    assert snapshot['Available'] == 7.0
+
+
+def test_leave_spanning_new_year_is_split():
+    ledger = LeaveBalanceLedger()
+    ledger.record("Asha", "Sick Leave", date(2024, 12, 30), date(2025, 1, 2))
+    assert ledger.balance("Asha", "Sick Leave", date(2024, 12, 31))['Used'] == 2.0
+    assert ledger.balance("Asha", "Sick Leave", date(2025, 1, 31))['Used'] == 2.0
+
+
+def test_unused_leave_type_still_carries_over():
+    # Asha never took Earned Leave, but has been around since 2023
+    ledger = LeaveBalanceLedger()
+    ledger.record("Asha", "Casual Leave", date(2023, 5, 2))
+    assert ledger.carry_over("Asha", "Earned Leave", 2024) == 18.0
+    assert ledger.carry_over("Asha", "Earned Leave", 2025) == 30.0
+
+
+def test_start_year_applies_before_first_leave():
+    ledger = LeaveBalanceLedger(start_year=2023)
+    ledger.record("Asha", "Earned Leave", date(2025, 2, 3))
+    assert ledger.carry_over("Asha", "Earned Leave", 2025) == 30.0
+    assert LeaveBalanceLedger().carry_over("Asha", "Earned Leave", 2025) == 0.0
+
+
+def test_earlier_leave_restarts_the_carry_chain():
+    ledger = LeaveBalanceLedger()
+    ledger.record("Asha", "Earned Leave", date(2024, 2, 5), days=5)
+    assert ledger.carry_over("Asha", "Earned Leave", 2025) == 13.0
+    ledger.record("Asha", "Casual Leave", date(2023, 7, 3))
+    assert ledger.carry_over("Asha", "Earned Leave", 2025) == 30.0
+
+
+def test_cancel_and_approve():
+    ledger = LeaveBalanceLedger()
+    ledger.record("Asha", "Casual Leave", date(2025, 4, 7), pending=True)
+    assert ledger.balance("Asha", "Casual Leave", date(2025, 4, 30))['Pending'] == 1.0
+    ledger.approve("Asha", "Casual Leave", date(2025, 4, 7))
+    snapshot = ledger.balance("Asha", "Casual Leave", date(2025, 4, 30))
+    assert (snapshot['Pending'], snapshot['Used']) == (0.0, 1.0)
+    ledger.cancel("Asha", "Casual Leave", date(2025, 4, 7))
+    assert ledger.balance("Asha", "Casual Leave", date(2025, 4, 30))['Used'] == 0.0
+
+
+def test_untracked_type():
+    ledger = LeaveBalanceLedger()
+    assert ledger.balance("Asha", "Sabbatical", date(2025, 1, 1)) is None
+    assert ledger.can_take("Asha", "Sabbatical", 40) == (True, None)
+    assert ledger.can_take("Asha", "Emergency Leave", 4, date(2025, 1, 1)) == (False, 3.0)
+
+
+def test_from_frame_to_frame():
+    df = pd.DataFrame({
+        'Employee Name': ["Asha", "Ravi"],
+        'Leave Type': ["Sick Leave", "Sick Leave"],
+        'Start Date': pd.to_datetime(["2025-01-06", "2025-02-03"]),
+        'End Date': pd.to_datetime(["2025-01-07", "2025-02-03"]),
+        'Days': [2, 1],
+    })
+    frame = LeaveBalanceLedger.from_frame(df).to_frame(date(2025, 3, 1), leave_types=["Sick Leave"])
+    assert frame['Employee Name'].tolist() == ["Asha", "Ravi"]
+    assert frame['Available'].tolist() == [10.0, 11.0]
+
+
+def test_leave_type_spellings_share_one_policy():
+    ledger = LeaveBalanceLedger()
+    ledger.record("Asha", "Joining-Transfer Leave", date(2025, 1, 6))
+    frame = ledger.employee_frame("Asha", date(2025, 1, 31))
+    assert frame['Leave Type'].tolist().count("Joining Transfer Leave") == 1
+    assert "Joining-Transfer Leave" not in frame['Leave Type'].tolist()
+    assert ledger.balance("Asha", "Joining-Transfer Leave", date(2025, 1, 31))['Used'] == 1.0
+
+
+def _day_rows(names, dates, days):
+    return pd.DataFrame({'Name': names, 'Leave Type': "Earned Leave",
+                         'Leave Date': pd.to_datetime(dates), 'Days': days})
+
+
+def test_sync_applies_deltas_like_a_rebuild():
+    columns = dict(name_col='Name', start_col='Leave Date', end_col=None)
+    v1 = _day_rows(["Asha", "Ravi"], ["2024-03-04", "2025-02-03"], [1.0, 1.0])
+    v2 = _day_rows(["Asha", "Meera"], ["2023-05-02", "2025-02-04"], [1.0, 0.5])
+    versions = {1: v1, 2: v2}
+
+    def changes(old, new):
+        # Whole frames as the delta, as if every row changed
+        return versions[new], versions[old]
+
+    ledger = LeaveBalanceLedger().sync(v1, 1, changes, **columns)
+    ledger.sync(v2, 2, changes, **columns)
+    rebuilt = LeaveBalanceLedger.from_frame(v2, **columns)
+    as_of = date(2025, 6, 30)
+    pd.testing.assert_frame_equal(ledger.to_frame(as_of), rebuilt.to_frame(as_of))
+    assert ledger.employees == {"Asha", "Meera"}
@@ -0,0 +1,44 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from leave_data import read_tracker_rows, validate_tracker_rows
+
+
+def _raw():
+    return pd.DataFrame({
+        'Email': [" asha@example.com ", "ben@example.com", "cleo@example.com", "dev@example.com", None],
+        'Name': ["Asha ", "Ben", "  ", "Dev", None],
+        'Leave Date': [datetime(2025, 1, 6), "2025-01-07", "2025-01-08", "07/01/2025", "2025-01-09"],
+        'Leave Type': ["Casual Leave", "Sick Leave", "Casual Leave", "Casual Leave", None],
+        'Duration': ["Full Day", 0.5, 1, "Half Day", 2],
+    })
+
+
+def test_valid_rows_are_normalised_and_keep_their_index():
+    valid, _ = validate_tracker_rows(_raw())
+    assert list(valid.index) == [0, 1]
+    assert list(valid['Name']) == ["Asha", "Ben"]
+    assert list(valid['Email']) == ["asha@example.com", "ben@example.com"]
+    assert list(valid['Leave Date']) == [pd.Timestamp("2025-01-06"), pd.Timestamp("2025-01-07")]
+    assert list(valid['Duration']) == [1.0, 0.5]
+
+
+def test_invalid_rows_are_quarantined_with_every_reason():
+    _, quarantined = validate_tracker_rows(_raw())
+    assert list(quarantined['Row']) == [4, 5, 6]
+    assert list(quarantined['Reason']) == [
+        "missing employee name",
+        "invalid leave date",
+        "missing employee name; missing leave type; duration must be 1 or 0.5",
+    ]
+    assert quarantined.loc[1, 'Leave Date'] == "07/01/2025"
+
+
+def test_read_tracker_rows_checks_the_column_count(tmp_path):
+    path = tmp_path / "tracker.xlsx"
+    pd.DataFrame({'Id': [1], 'Start': [datetime(2025, 1, 1)], 'Email': ["asha@example.com"]}).to_excel(
+        path, index=False)
+    with pytest.raises(ValueError, match="Expected 8 columns"):
+        read_tracker_rows(path)
@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from leave_dedup import SubmissionDeduplicator, dedup_policy, key_hashes
+
+
+def _rows(emails, dates, types=None):
+    return pd.DataFrame({
+        'Email': emails,
+        'Name': ["Asha"] * len(emails),
+        'Leave Date': pd.to_datetime(dates),
+        'Leave Type': types or ["Sick Leave"] * len(emails),
+        'Duration': [1.0] * len(emails),
+    })
+
+
+def test_key_hashes_normalise_text_and_time():
+    rows = _rows(["Asha@Example.com ", "asha@example.com"], ["2025-01-06 09:30", "2025-01-06 00:00"])
+    hashes = key_hashes(rows, ['Email', 'Leave Date', 'Leave Type', 'Duration'])
+    assert hashes[0] == hashes[1]
+
+
+def test_latest_policy_supersedes_stored_row():
+    stored = _rows(["asha@example.com"], ["2025-01-06"])
+    dedup = SubmissionDeduplicator.from_frame(stored, policy="latest")
+    kept, dropped, superseded = dedup.add(_rows(["asha@example.com", "asha@example.com"],
+                                                ["2025-01-06", "2025-01-07"]))
+    assert len(kept) == 2 and dropped.empty
+    assert len(superseded) == 1
+
+
+def test_first_policy_drops_repeats():
+    dedup = SubmissionDeduplicator(policy="first")
+    batch = _rows(["asha@example.com"] * 3, ["2025-01-06", "2025-01-06", "2025-01-07"])
+    kept, dropped, _ = dedup.add(batch, order=[3, 1, 2])
+    assert kept.index.tolist() == [1, 2]
+    assert dropped.index.tolist() == [0]
+    kept, dropped, _ = dedup.add(batch.iloc[:1])
+    assert kept.empty and len(dropped) == 1
+    assert dedup.dropped == 2
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        dedup_policy("newest")
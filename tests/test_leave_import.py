@@ -0,0 +1,45 @@
+import io
+
+import pandas as pd
+import pytest
+
+from leave_import import LEAVE_TYPES, read_leave_file, validate_leave_records
+
+
+def test_accepted_types_follow_the_balance_policies():
+    assert "Casual Leave" in LEAVE_TYPES
+    assert "Joining-Transfer Leave" not in LEAVE_TYPES
+
+
+def test_validation_splits_accepted_and_rejected():
+    raw = pd.DataFrame({
+        'Employee Name': ["Asha", " ", "Ravi", "Meera", "Asha", "Ravi"],
+        'Leave Type': ["Casual Leave", "Sick Leave", "Sabbatical", "Joining-Transfer Leave",
+                       "Earned Leave", "Sick Leave"],
+        'Start Date': ["2025-01-06", "2025-01-06", "2025-01-06", "2025-02-03", "2025-03-05", "bad"],
+        'End Date': ["2025-01-07", "2025-01-06", "2025-01-06", "2025-02-03", "2025-03-04", "2025-03-04"],
+        'Days': [None, 1, 1, 1, 1, 1],
+    })
+    accepted, rejected = validate_leave_records(raw)
+    assert accepted['Employee Name'].tolist() == ["Asha", "Meera"]
+    assert accepted['Days'].tolist() == [2.0, 1.0]
+    assert accepted['Leave Type'].tolist() == ["Casual Leave", "Joining Transfer Leave"]
+    # Spreadsheet rows: the header is row 1
+    assert rejected['Row'].tolist() == [3, 4, 6, 7]
+    assert rejected['Reason'].tolist() == [
+        "missing employee name", "unknown leave type", "start date after end date", "invalid start date"]
+
+
+def test_days_must_fit_the_period():
+    raw = pd.DataFrame({'Employee Name': ["Asha"], 'Leave Type': ["Sick Leave"],
+                        'Start Date': ["2025-01-06"], 'End Date': ["2025-01-07"], 'Days': [3]})
+    assert validate_leave_records(raw)[1]['Reason'].tolist() == ["days outside leave period"]
+
+
+def test_missing_columns_and_file_types():
+    with pytest.raises(ValueError):
+        validate_leave_records(pd.DataFrame({'Employee Name': ["Asha"]}))
+    with pytest.raises(ValueError):
+        read_leave_file(io.BytesIO(b""), name="leaves.txt")
+    csv = io.BytesIO(b"Employee Name,Leave Type,Start Date\nAsha,Sick Leave,2025-01-06\n")
+    assert len(validate_leave_records(read_leave_file(csv, name="leaves.csv"))[0]) == 1
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from leave_intervals import coalesce_leave_days, expand_leave_intervals, interval_day_counts, leave_days
+
+
+def _days(dates, durations=None, leave_type="Casual Leave"):
+    return pd.DataFrame({
+        'Email': "asha@example.com",
+        'Name': "Asha",
+        'Leave Date': pd.to_datetime(dates),
+        'Leave Type': leave_type,
+        'Duration': durations or [1.0] * len(dates),
+    })
+
+
+def _interval(start, end, days):
+    return pd.DataFrame({
+        'Email': ["asha@example.com"],
+        'Employee Name': ["Asha"],
+        'Leave Type': ["Casual Leave"],
+        'Start Date': pd.to_datetime([start]),
+        'End Date': pd.to_datetime([end]),
+        'Days': [days],
+    })
+
+
+def test_friday_monday_coalesces_and_roundtrips():
+    rows = _days(["2025-01-02", "2025-01-03", "2025-01-06", "2025-01-08"], [1.0, 1.0, 1.0, 0.5])
+    intervals = coalesce_leave_days(rows)
+    assert intervals['Days'].tolist() == [3.0, 0.5]
+    expanded = expand_leave_intervals(intervals).sort_values('Leave Date', ignore_index=True)
+    assert expanded['Leave Date'].tolist() == rows['Leave Date'].tolist()
+    assert expanded['Duration'].tolist() == rows['Duration'].tolist()
+
+
+def test_weekend_only_leave():
+    intervals = _interval("2025-01-04", "2025-01-05", 2)
+    assert interval_day_counts(intervals).tolist() == [2]
+    expanded = expand_leave_intervals(intervals)
+    assert expanded['Leave Date'].dt.day.tolist() == [4, 5]
+    assert expanded['Duration'].tolist() == [1.0, 1.0]
+
+
+def test_calendar_days_over_a_weekend_are_capped_at_a_full_day():
+    # Friday to Monday entered as 4 calendar days: two business-day rows
+    expanded = expand_leave_intervals(_interval("2025-01-03", "2025-01-06", 4))
+    assert expanded['Leave Date'].dt.day.tolist() == [3, 6]
+    assert expanded['Duration'].tolist() == [1.0, 1.0]
+
+
+def test_no_bridging_keeps_calendar_days():
+    intervals = _interval("2025-01-03", "2025-01-06", 4)
+    assert interval_day_counts(intervals, bridge_weekends=False).tolist() == [4]
+    assert len(expand_leave_intervals(intervals, bridge_weekends=False)) == 4
+
+
+def test_leave_days():
+    duration = pd.Series(["Full Day", "Half Day", 0.5, None, "n/a"], dtype=object)
+    days = leave_days(duration)
+    assert days.dtype == np.float32
+    assert days.tolist() == [1.0, 0.5, 0.5, 0.0, 0.0]
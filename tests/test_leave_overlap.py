@@ -0,0 +1,39 @@
+from datetime import date
+
+import pandas as pd
+
+from leave_overlap import LeaveIntervalIndex
+
+
+def test_touching_and_overlapping_leaves_merge():
+    index = LeaveIntervalIndex()
+    index.add("Asha", date(2025, 3, 3), date(2025, 3, 4))
+    index.add("Asha", date(2025, 3, 5))
+    index.add("Asha", date(2025, 3, 10), date(2025, 3, 12))
+    assert len(index) == 2
+    index.add("Asha", date(2025, 3, 4), date(2025, 3, 11))
+    assert len(index) == 1
+    assert index.overlapping("asha ", date(2025, 3, 1), date(2025, 3, 31)) == [
+        (date(2025, 3, 3), date(2025, 3, 12))]
+
+
+def test_overlapping_bounds():
+    index = LeaveIntervalIndex()
+    index.add("Asha", date(2025, 3, 3), date(2025, 3, 4))
+    index.add("Asha", date(2025, 3, 10))
+    assert not index.is_out("Asha", date(2025, 3, 5), date(2025, 3, 9))
+    assert index.overlapping("Asha", date(2025, 3, 4), date(2025, 3, 10)) == [
+        (date(2025, 3, 3), date(2025, 3, 4)), (date(2025, 3, 10), date(2025, 3, 10))]
+    assert index.overlapping("Ravi", date(2025, 3, 4)) == []
+
+
+def test_employees_out():
+    df = pd.DataFrame({
+        'Employee Name': ["Asha", "Ravi", "Meera"],
+        'Start Date': pd.to_datetime(["2025-03-03", "2025-03-04", "2025-04-01"]),
+        'End Date': pd.to_datetime(["2025-03-05", "2025-03-04", "2025-04-01"]),
+    })
+    index = LeaveIntervalIndex.from_frame(df)
+    assert index.employees_out(date(2025, 3, 4)) == ["Asha", "Ravi"]
+    assert index.employees_out(date(2025, 3, 4), exclude="asha") == ["Ravi"]
+    assert index.employees_out(date(2025, 3, 1), date(2025, 4, 30), members=["Meera"]) == ["Meera"]
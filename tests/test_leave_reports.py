@@ -0,0 +1,43 @@
+import pandas as pd
+
+from leave_reports import build_reports, period_label, period_rows
+
+
+def _rows():
+    return pd.DataFrame({
+        'Email': ["asha@ops.example", "asha@ops.example", "ravi@dev.example", "meera@dev.example"],
+        'Name': ["Asha", "Asha", "Ravi", "Meera"],
+        'Leave Date': pd.to_datetime(["2025-03-03", "2025-04-01", "2025-03-10", "2024-12-31"]),
+        'Leave Type': ["Sick Leave", "Casual Leave", "Casual Leave", "Casual Leave"],
+        'Duration': ["Full Day", "Half Day", "Full Day", "Full Day"],
+        'Team': ["ops.example", "ops.example", "dev.example", "dev.example"],
+    })
+
+
+def test_period_rows_and_label():
+    assert len(period_rows(_rows(), 2025)) == 3
+    assert list(period_rows(_rows(), 2025, 3)['Name']) == ["Asha", "Ravi"]
+    assert period_label(2025, 3) == "2025-03" and period_label(2025) == "2025"
+
+
+def test_build_reports_writes_every_chart_and_summary(tmp_path):
+    path, count = build_reports(_rows(), 2025, out=str(tmp_path), workers=1)
+    assert count == 5
+    employees = pd.read_excel(path, sheet_name="Employees").set_index('Name')
+    assert employees.loc["Asha", 'Total Leaves'] == 2
+    assert employees.loc["Asha", 'Half Days'] == 1
+    assert employees.loc["Meera", 'Total Leaves'] == 0
+    assert employees.loc["Ravi", 'Sick Leave'] == 0
+    teams = pd.read_excel(path, sheet_name="Teams").set_index('Team')
+    assert teams.loc["dev.example", 'Headcount'] == 2
+    assert teams.loc["dev.example", 'Total Leaves'] == 1
+    for report in list(employees['Report']) + list(teams['Report']):
+        assert (tmp_path / "2025" / report).stat().st_size > 0
+
+
+def test_build_reports_for_one_team_and_month(tmp_path):
+    path, count = build_reports(_rows(), 2025, 3, out=str(tmp_path), workers=1, team="ops.example")
+    assert count == 2
+    employees = pd.read_excel(path, sheet_name="Employees")
+    assert list(employees['Name']) == ["Asha"] and employees['Total Leaves'].tolist() == [1]
+    assert (tmp_path / "2025-03" / "team").is_dir()
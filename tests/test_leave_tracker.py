@@ -0,0 +1,21 @@
+from streamlit.testing.v1 import AppTest
+
+from leave_data import DURATION_LABELS, read_tracker_workbook, workbook_path
+from snapshots import SnapshotStore
+
+
+def test_as_of_version_missing_the_selected_employee(tmp_path, monkeypatch):
+    monkeypatch.setenv("LEAVE_TRACKER_SNAPSHOT_DIR", str(tmp_path))
+    rows = read_tracker_workbook(workbook_path())
+    rows['Duration'] = rows['Duration'].map({days: label for label, days in DURATION_LABELS.items()})
+    missing = rows['Name'].iloc[-1]
+    SnapshotStore(str(tmp_path)).commit(rows[rows['Name'] != missing])
+
+    at = AppTest.from_file("../leave_tracker.py", default_timeout=60)
+    at.run()
+    assert not at.exception
+    at.session_state['employee_filter'] = missing
+    at.session_state['data_version_view'] = 1
+    at.run()
+    assert not at.exception
+    assert at.session_state['employee_filter'] == "All"
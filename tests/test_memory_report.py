@@ -0,0 +1,27 @@
+from streamlit.testing.v1 import AppTest
+
+
+def _admin_app():
+    import streamlit as st
+
+    from memory_report import admin_requested
+
+    st.session_state['admin'] = admin_requested()
+
+
+def _admin(monkeypatch, token, params):
+    if token is None:
+        monkeypatch.delenv("LEAVE_TRACKER_ADMIN_TOKEN", raising=False)
+    else:
+        monkeypatch.setenv("LEAVE_TRACKER_ADMIN_TOKEN", token)
+    at = AppTest.from_function(_admin_app)
+    at.query_params.update(params)
+    at.run()
+    return at.session_state['admin']
+
+
+def test_admin_view_needs_a_configured_token(monkeypatch):
+    assert not _admin(monkeypatch, None, {'admin': "memory"})
+    assert not _admin(monkeypatch, "s3cret", {'admin': "memory"})
+    assert not _admin(monkeypatch, "s3cret", {'admin': "memory", 'token': "guess"})
+    assert _admin(monkeypatch, "s3cret", {'admin': "memory", 'token': "s3cret"})
@@ -0,0 +1,30 @@
+from streamlit.testing.v1 import AppTest
+
+from name_index import NameIndex
+
+
+def test_search_prefix_word_and_fuzzy():
+    index = NameIndex(["Asha Rao", "Ravi Kumar", "Meera Ravindran", " ", None],
+                      teams={"Asha Rao": "ops", "Ravi Kumar": "dev"})
+    assert len(index) == 3
+    assert index.matches("ra") == ["Ravi Kumar", "Asha Rao", "Meera Ravindran"]
+    assert index.matches("kumr") == ["Ravi Kumar"]
+    assert index.matches("", team="ops") == ["Asha Rao"]
+    assert index.search("", page=5, page_size=2) == (["Ravi Kumar"], 3, 2)
+    assert index.team_names() == ["dev", "ops"]
+
+
+def _search_app():
+    import streamlit as st
+
+    from name_index import NameIndex, employee_search_box
+
+    st.session_state['selected'] = employee_search_box(NameIndex(["Asha Rao"]), "All", "employee_filter")
+
+
+def test_selection_missing_from_the_viewed_version_falls_back_to_all():
+    at = AppTest.from_function(_search_app)
+    at.session_state['employee_filter'] = "Ravi Kumar"
+    at.run()
+    assert not at.exception
+    assert at.session_state['selected'] == "All"
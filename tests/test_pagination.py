@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from pagination import date_bounds, page_slice, sorted_history
+
+
+def _history(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'Leave Date': pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 120, n), unit='D'),
+        'Leave Type': rng.choice(["Casual Leave", "Sick Leave", "Earned Leave"], n),
+        'Duration': rng.choice([0.5, 1.0], n),
+    })
+    return sorted_history(frame, 'Leave Date')
+
+
+def test_date_bounds_are_inclusive():
+    history = _history()
+    lo, hi = date_bounds(history, 'Leave Date', "2025-02-01", "2025-02-28")
+    dates = history['Leave Date']
+    assert (hi - lo) == dates.between("2025-02-01", "2025-02-28").sum()
+    lo, hi = date_bounds(history, 'Leave Date', "2025-03-01", "2025-02-01")
+    assert lo == hi
+
+
+def test_pages_in_date_order_cover_the_range_once():
+    history = _history()
+    in_range = history[history['Leave Date'].between("2025-01-15", "2025-03-31")]
+    for ascending in (True, False):
+        pages = []
+        rows, total, count = page_slice(history, 'Leave Date', "2025-01-15", "2025-03-31",
+                                        ascending=ascending, page=1, page_size=7)
+        assert total == len(in_range) and count == -(-total // 7)
+        for page in range(1, count + 1):
+            pages.append(page_slice(history, 'Leave Date', "2025-01-15", "2025-03-31",
+                                    ascending=ascending, page=page, page_size=7)[0])
+        combined = pd.concat(pages)
+        expected = in_range if ascending else in_range.iloc[::-1]
+        pd.testing.assert_frame_equal(combined, expected)
+
+
+def test_other_sort_columns_sort_only_the_range():
+    history = _history()
+    rows, total, _ = page_slice(history, 'Leave Date', "2025-02-01", None, sort_col='Duration',
+                                ascending=True, page=1, page_size=len(history))
+    assert rows['Leave Date'].min() >= pd.Timestamp("2025-02-01")
+    assert rows['Duration'].is_monotonic_increasing
+    assert len(rows) == total
+
+
+def test_page_is_clamped():
+    history = _history(10)
+    last, _, pages = page_slice(history, 'Leave Date', page=99, page_size=4)
+    assert pages == 3 and len(last) == 2
+    first, _, _ = page_slice(history, 'Leave Date', page=0, page_size=4)
+    assert len(first) == 4
+    empty, total, pages = page_slice(history, 'Leave Date', "2030-01-01", page_size=4)
+    assert empty.empty and total == 0 and pages == 1
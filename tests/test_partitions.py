@@ -0,0 +1,64 @@
+import pandas as pd
+
+from partitions import ALL_TEAMS, PartitionedLeaves, derive_teams
+
+
+def _rows(*entries):
+    return pd.DataFrame({
+        'Email': [email for email, _ in entries],
+        'Name': [email.split("@")[0] for email, _ in entries],
+        'Leave Date': pd.to_datetime([day for _, day in entries]),
+    })
+
+
+def test_derive_teams_by_domain_prefix_and_mapping():
+    emails = pd.Series([" Asha@Sales.example ", "ben.k@ops.example", "cleo@ops.example", None])
+    assert list(derive_teams(emails, mode="domain")) == ["sales.example", "ops.example", "ops.example", "other"]
+    assert list(derive_teams(emails, mode="prefix")) == ["other", "ben", "other", "other"]
+    mapping = {"cleo@ops.example": "Platform"}
+    assert list(derive_teams(emails, mapping, mode="domain"))[2] == "Platform"
+
+
+def test_update_versions_only_changed_teams():
+    partitions = PartitionedLeaves(mapping={}, mode="domain")
+    first = _rows(("asha@a.example", "2025-01-06"), ("ben@b.example", "2025-01-07"))
+    assert partitions.update(first, "v1") == {"a.example", "b.example", ALL_TEAMS}
+    a_version, b_version = partitions.version("a.example"), partitions.version("b.example")
+    assert partitions.version(ALL_TEAMS) == "v1"
+
+    second = pd.concat([first, _rows(("ava@a.example", "2025-01-08"))], ignore_index=True)
+    assert partitions.update(second, "v2") == {"a.example", ALL_TEAMS}
+    assert partitions.version("a.example") != a_version
+    assert partitions.version("b.example") == b_version
+    assert partitions.team_of("AVA@a.example") == "a.example"
+
+
+def test_views_rebuild_only_for_changed_team():
+    partitions = PartitionedLeaves(mapping={}, mode="domain")
+    builds = []
+
+    def names(frame, year):
+        builds.append(year)
+        return sorted(frame['Name'])
+
+    first = _rows(("asha@a.example", "2025-01-06"), ("ben@b.example", "2025-01-07"))
+    partitions.update(first, "v1")
+    assert partitions.view("a.example", 'names', names, 2025) == ["asha"]
+    assert partitions.view("b.example", 'names', names, 2025) == ["ben"]
+    assert partitions.view(ALL_TEAMS, 'names', names, 2025) == ["asha", "ben"]
+    assert len(builds) == 3
+
+    partitions.update(pd.concat([first, _rows(("ava@a.example", "2025-01-08"))], ignore_index=True), "v2")
+    assert partitions.view("b.example", 'names', names, 2025) == ["ben"]
+    assert len(builds) == 3
+    assert partitions.view("a.example", 'names', names, 2025) == ["asha", "ava"]
+    assert partitions.view(ALL_TEAMS, 'names', names, 2025) == ["asha", "ava", "ben"]
+    assert len(builds) == 5
+
+
+def test_views_are_bounded():
+    partitions = PartitionedLeaves(mapping={}, mode="domain", max_views=2)
+    partitions.update(_rows(("asha@a.example", "2025-01-06")), "v1")
+    for month in range(1, 5):
+        partitions.view("a.example", 'month', lambda frame, m: m, month)
+    assert len(partitions._views) == 2
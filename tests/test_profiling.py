@@ -0,0 +1,40 @@
+from streamlit.testing.v1 import AppTest
+
+
+def _profiled_app():
+    import streamlit as st
+
+    from profiling import finish_rerun_profile, start_rerun_profile
+
+    start_rerun_profile("app")
+    st.session_state['path'] = finish_rerun_profile()
+
+
+def _profile(monkeypatch, tmp_path, token, params):
+    monkeypatch.setenv("LEAVE_TRACKER_PROFILE_DIR", str(tmp_path))
+    monkeypatch.delenv("LEAVE_TRACKER_PROFILE", raising=False)
+    if token is None:
+        monkeypatch.delenv("LEAVE_TRACKER_ADMIN_TOKEN", raising=False)
+    else:
+        monkeypatch.setenv("LEAVE_TRACKER_ADMIN_TOKEN", token)
+    at = AppTest.from_function(_profiled_app)
+    at.query_params.update(params)
+    at.run()
+    return at
+
+
+def test_profile_param_needs_a_configured_token(monkeypatch, tmp_path):
+    for token, params in ((None, {'profile': "2"}),
+                          ("s3cret", {'profile': "2"}),
+                          ("s3cret", {'profile': "2", 'token': "guess"})):
+        at = _profile(monkeypatch, tmp_path, token, params)
+        assert at.session_state['path'] is None
+    assert not any(tmp_path.iterdir())
+
+
+def test_profiled_runs_are_capped(monkeypatch, tmp_path):
+    from profiling import MAX_RUNS, _RUNS_KEY
+
+    at = _profile(monkeypatch, tmp_path, "s3cret", {'profile': "100000", 'token': "s3cret"})
+    assert at.session_state['path'] is not None
+    assert at.session_state[_RUNS_KEY] == MAX_RUNS - 1
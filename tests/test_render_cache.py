@@ -0,0 +1,22 @@
+from render_cache import MonthViewCache
+
+
+def test_hits_and_lru_eviction():
+    cache = MonthViewCache(max_entries=2)
+    calls = []
+    build = lambda month: calls.append(month) or f"<grid {month}>"
+    assert cache.get((2025, 1, "All", 1), build, 1) == "<grid 1>"
+    cache.get((2025, 2, "All", 1), build, 2)
+    cache.get((2025, 1, "All", 1), build, 1)
+    cache.get((2025, 3, "All", 1), build, 3)
+    cache.get((2025, 2, "All", 1), build, 2)
+    assert calls == [1, 2, 3, 2]
+    assert cache.stats == {'hits': 1, 'misses': 4}
+    assert len(cache) == 2
+
+
+def test_clear():
+    cache = MonthViewCache()
+    cache.get((2025, 1, "All", 1), str, 1)
+    cache.clear()
+    assert len(cache) == 0
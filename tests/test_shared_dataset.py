@@ -0,0 +1,49 @@
+import os
+
+import pandas as pd
+
+from shared_dataset import SharedDataset, publish_workbook
+from snapshots import SnapshotStore
+
+
+def _workbook(path, names, dates):
+    pd.DataFrame({
+        'Id': range(1, len(names) + 1),
+        'Start time': pd.Timestamp("2025-01-02 09:00"),
+        'Completion time': pd.Timestamp("2025-01-02 09:01"),
+        'Email': [f"{n.lower()}@example.com" for n in names],
+        'Name': names,
+        'Leave Date': dates,
+        'Leave type': "Casual Leave",
+        'Duration': 1,
+    }).to_excel(path, index=False)
+    return str(path)
+
+
+def test_publish_and_attach(tmp_path):
+    path = _workbook(tmp_path / "tracker.xlsx", ["Asha", "Ravi"], ["2025-01-06", "2025-01-07"])
+    shared = SharedDataset(str(tmp_path / "shared"))
+    snapshots = SnapshotStore(str(tmp_path / "snapshots"))
+    pointer = publish_workbook(shared, snapshots, path, mapping={})
+    assert pointer['version'] == 1 and pointer['rows'] == 2
+    assert publish_workbook(shared, snapshots, path, mapping={}) is shared.current()
+    frame = shared.frame(1)
+    assert frame['Name'].tolist() == ["Asha", "Ravi"]
+    assert frame['Duration'].tolist() == ["Full Day", "Full Day"]
+    assert len(shared.teams(1)) == 2
+
+
+def test_failed_load_keeps_the_published_version(tmp_path):
+    path = _workbook(tmp_path / "tracker.xlsx", ["Asha"], ["2025-01-06"])
+    shared = SharedDataset(str(tmp_path / "shared"))
+    snapshots = SnapshotStore(str(tmp_path / "snapshots"))
+    published = publish_workbook(shared, snapshots, path, mapping={})
+
+    with open(path, "wb") as fh:
+        fh.write(b"not a workbook")
+    assert publish_workbook(shared, snapshots, path, mapping={}) == published
+
+    _workbook(path, ["Asha"], ["not a date"])
+    assert publish_workbook(shared, snapshots, path, mapping={}) == published
+    assert snapshots.latest == 1
+    assert sorted(os.listdir(tmp_path / "shared")) == ["CURRENT.json", "v000001.arrow"]
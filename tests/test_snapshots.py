@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from snapshots import SnapshotStore
+
+
+def _rows(names, dates):
+    return pd.DataFrame({
+        'Email': [f"{n.lower()}@example.com" for n in names],
+        'Name': names,
+        'Leave Date': pd.to_datetime(dates),
+        'Leave Type': "Casual Leave",
+        'Duration': 1.0,
+    })
+
+
+def test_commit_only_versions_changed_rows(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    v1 = _rows(["Asha"], ["2025-01-06"])
+    assert store.commit(v1, source="a") == 1
+    assert store.commit(v1.copy(), source="b") == 1
+    assert store.commit(_rows(["Ravi"], ["2025-01-07"]), source="a") == 1
+    assert store.version_of("b") == 1
+    assert store.commit(pd.concat([v1, _rows(["Ravi"], ["2025-01-07"])]), source="c") == 2
+    assert store.versions()['rows'].tolist() == [1, 2]
+
+
+def test_as_of_and_diff_replay_deltas_from_disk(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.commit(_rows(["Asha", "Asha"], ["2025-01-06", "2025-01-06"]))
+    store.commit(_rows(["Asha", "Ravi"], ["2025-01-06", "2025-02-03"]))
+
+    reopened = SnapshotStore(str(tmp_path))
+    assert reopened.latest == 2
+    assert len(reopened.as_of(1)) == 2
+    added, removed = reopened.diff(1, 2)
+    assert added['Name'].tolist() == ["Ravi"]
+    assert removed['Name'].tolist() == ["Asha"]
+    assert reopened.changed_keys(2, 1) == {("Asha", 2025, 1), ("Ravi", 2025, 2)}
+    with pytest.raises(KeyError):
+        reopened.as_of(3)
+
+
+def test_as_of_version_without_a_later_employee(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.commit(_rows(["Asha"], ["2025-01-06"]))
+    store.commit(_rows(["Asha", "Ravi"], ["2025-01-06", "2025-02-03"]))
+    old = SnapshotStore(str(tmp_path)).as_of(1)
+    assert old.loc[old['Name'] == "Ravi", 'Email'].empty
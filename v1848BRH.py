@@ -1,10 +1,25 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, date, timedelta
 import calendar
-import numpy as np
+from leave_balance import LeaveBalanceLedger
+from leave_data import read_tracker_workbook, workbook_path, workbook_version, data_version
+from leave_aggregates import monthly_leave_days_by_employee, bin_monthly_days
+from leave_overlap import LeaveIntervalIndex
+from leave_import import read_leave_file, validate_leave_records, LEAVE_TYPES, LEAVE_COLUMNS
+from leave_dedup import SubmissionDeduplicator
+from leave_intervals import coalesce_leave_days, INTERVAL_COLUMNS
+from name_index import NameIndex, employee_search_box
+from absence_analytics import AbsenceAnalytics, render_absence_dashboard
+from capacity_sim import CapacitySimulator, render_capacity_whatif
+from partitions import derive_teams, load_team_mapping
+from memory_report import cache_limit, trimmable, admin_requested, render_memory_admin, maybe_trim_caches
+from profiling import start_rerun_profile, finish_rerun_profile
+from assets import load_css
+from render_cache import MonthViewCache
+from prefetch import Prefetcher, adjacent_months
+from pagination import sorted_history, paged_history_table
+import os
 
 # Configure page
 st.set_page_config(
@@ -14,6 +29,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Opt-in per-session profiling (?profile=N or LEAVE_TRACKER_PROFILE=N)
+start_rerun_profile("v1848BRH")
+
 # Initialize session state
 if 'leave_data' not in st.session_state:
     st.session_state.leave_data = pd.DataFrame(columns=[
@@ -53,6 +71,47 @@ def load_sample_data():
 if st.session_state.leave_data.empty:
     st.session_state.leave_data = load_sample_data()
 
+# Version of leave_data, bumped whenever rows are added
+if 'data_version' not in st.session_state:
+    st.session_state.data_version = data_version(st.session_state.leave_data)
+
+# Running leave balances, updated on every submission
+if 'balance_ledger' not in st.session_state:
+    st.session_state.balance_ledger = LeaveBalanceLedger.from_frame(st.session_state.leave_data)
+
+def tracker_version():
+    """Version token of the Excel tracker on disk, or None without one"""
+    path = workbook_path()
+    return workbook_version(path) if os.path.exists(path) else None
+
+@trimmable
+@st.cache_resource(max_entries=cache_limit('workbook', 2))
+def load_tracker_leaves(version):
+    """Leaves recorded in the Excel tracker, coalesced into Start/End intervals"""
+    if version is None:
+        return pd.DataFrame(columns=INTERVAL_COLUMNS)
+    return coalesce_leave_days(read_tracker_workbook(workbook_path()))
+
+# Key hashes of stored leaves, so repeated submissions and re-imports are skipped.
+# Every column is part of the key, so keeping the stored copy loses nothing.
+if 'leave_dedup' not in st.session_state:
+    st.session_state.leave_dedup = SubmissionDeduplicator.from_frame(
+        st.session_state.leave_data, keys=LEAVE_COLUMNS, policy="first")
+
+# Booked intervals per employee and rolling absence totals over both this app
+# and the Excel tracker, updated on every submission and rebuilt when the
+# tracker changes on disk
+current_tracker = tracker_version()
+if st.session_state.get('tracker_version', '') != current_tracker:
+    st.session_state.tracker_version = current_tracker
+    tracker_leaves = load_tracker_leaves(current_tracker)
+    leave_index = LeaveIntervalIndex.from_frame(st.session_state.leave_data)
+    leave_index.add_frame(tracker_leaves)
+    st.session_state.leave_index = leave_index
+    analytics = AbsenceAnalytics.from_frame(st.session_state.leave_data)
+    analytics.add_frame(tracker_leaves)
+    st.session_state.absence_analytics = analytics
+
 # Navigation functions
 def go_to_page(page_name):
     st.session_state.page = page_name
@@ -73,6 +132,70 @@ def get_leave_dates(start_date, end_date):
         current_date += timedelta(days=1)
     return dates
 
+@trimmable
+@st.cache_resource(max_entries=cache_limit('monthly', 16))
+def get_monthly_leave_days(version, _leave_data):
+    """Monthly leave days for every employee, computed once per data version"""
+    return monthly_leave_days_by_employee(_leave_data)
+
+# Figures are cached per (employee, data version); least recently used are evicted
+FIGURE_CACHE_ENTRIES = cache_limit('figures', 64)
+
+@trimmable
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def get_monthly_bar_figure(employee, version, _monthly_leaves):
+    """Monthly leave bar chart, binned to quarters or years for long histories"""
+    # plotly is imported on first chart, not at startup
+    import plotly.express as px
+    binned = bin_monthly_days(_monthly_leaves)
+    fig_bar = px.bar(
+        binned, 
+        x='Month', 
+        y='Days',
+        title=f"Monthly Leave Pattern for {employee}",
+        color='Days',
+        color_continuous_scale='viridis'
+    )
+    fig_bar.update_layout(
+        showlegend=False,
+        height=400,
+        title_x=0.5,
+        xaxis_title="Month" if binned is _monthly_leaves else "Period",
+        yaxis_title="Leave Days"
+    )
+    return fig_bar
+
+@trimmable
+@st.cache_resource(max_entries=FIGURE_CACHE_ENTRIES)
+def get_leave_type_pie_figure(employee, version, _leave_types):
+    """Leave type distribution pie chart"""
+    import plotly.express as px
+    fig_pie = px.pie(
+        values=_leave_types.values, 
+        names=_leave_types.index,
+        title=f"Leave Types for {employee}",
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig_pie.update_layout(
+        height=400,
+        title_x=0.5,
+        showlegend=True
+    )
+    return fig_pie
+
+@trimmable
+@st.cache_resource(max_entries=cache_limit('history', 64))
+def get_employee_history(employee, version, _leave_data):
+    """One employee's leaves ordered by start date, rebuilt only when leave_data changes"""
+    rows = _leave_data.loc[_leave_data['Employee Name'] == employee, ['Leave Type', 'Start Date', 'End Date', 'Days']]
+    return sorted_history(rows, 'Start Date')
+
+@trimmable
+@st.cache_resource(max_entries=cache_limit('name_index', 16))
+def get_name_index(version, _leave_data):
+    """Searchable employee names, built once per data version"""
+    return NameIndex(_leave_data['Employee Name'].unique())
+
 def get_leave_color(leave_type):
     """Return color based on leave type"""
     colors = {
@@ -87,224 +210,7 @@ def get_leave_color(leave_type):
 # Main application
 def main():
     # Enhanced Custom CSS
-    st.markdown("""
-    <style>
-    /* Main styling */
-    .main-header {
-        text-align: center;
-        padding: 3rem 0;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 15px;
-        margin-bottom: 3rem;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-    }
-    
-    .main-header h1 {
-        font-size: 3rem;
-        margin-bottom: 0.5rem;
-        font-weight: 700;
-    }
-    
-    .main-header p {
-        font-size: 1.3rem;
-        opacity: 0.9;
-    }
-    
-    /* Button styling */
-    .option-card {
-        background: white;
-        padding: 3rem 2rem;
-        border-radius: 15px;
-        box-shadow: 0 8px 25px rgba(0,0,0,0.1);
-        text-align: center;
-        transition: all 0.3s ease;
-        border: 2px solid transparent;
-        height: 250px;
-        display: flex;
-        flex-direction: column;
-        justify-content: center;
-        cursor: pointer;
-    }
-    
-    .option-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 15px 40px rgba(0,0,0,0.15);
-        border-color: #667eea;
-    }
-    
-    .option-icon {
-        font-size: 4rem;
-        margin-bottom: 1rem;
-    }
-    
-    .option-title {
-        font-size: 1.5rem;
-        font-weight: 600;
-        color: #333;
-        margin-bottom: 0.5rem;
-    }
-    
-    .option-desc {
-        color: #666;
-        font-size: 1rem;
-    }
-    
-    /* Calendar styling */
-    .calendar-container {
-        background: white;
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: 0 5px 20px rgba(0,0,0,0.1);
-        margin: 2rem 0;
-    }
-    
-    .calendar-header {
-        text-align: center;
-        margin-bottom: 2rem;
-        padding: 1rem;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 10px;
-        font-size: 1.5rem;
-        font-weight: 600;
-    }
-    
-    .calendar-day-header {
-        background: #f8f9fa;
-        padding: 1rem;
-        text-align: center;
-        font-weight: 600;
-        color: #333;
-        border-radius: 8px;
-        margin-bottom: 0.5rem;
-    }
-    
-    .calendar-day {
-        background: white;
-        padding: 1rem;
-        margin: 0.2rem;
-        border-radius: 8px;
-        text-align: center;
-        border: 1px solid #e9ecef;
-        font-weight: 500;
-        transition: all 0.3s ease;
-        min-height: 60px;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-    }
-    
-    .calendar-day:hover {
-        background: #f8f9fa;
-        border-color: #667eea;
-    }
-    
-    .calendar-day-today {
-        border: 3px solid #ffd700 !important;
-        background: #fffacd;
-        font-weight: 700;
-    }
-    
-    .calendar-day-leave {
-        color: white;
-        font-weight: 600;
-        border: none;
-        position: relative;
-        cursor: pointer;
-    }
-    
-    .calendar-day-leave:hover {
-        opacity: 0.9;
-        transform: scale(1.05);
-    }
-    
-    .calendar-day-leave.calendar-day-today {
-        border: 3px solid #ffd700 !important;
-        box-shadow: 0 0 10px rgba(255, 215, 0, 0.5);
-    }
-    
-    /* Form styling */
-    .form-container {
-        background: white;
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: 0 5px 20px rgba(0,0,0,0.1);
-        margin: 2rem 0;
-    }
-    
-    /* Legend styling */
-    .legend-container {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 10px;
-        box-shadow: 0 3px 15px rgba(0,0,0,0.1);
-        margin-top: 2rem;
-    }
-    
-    .legend-item {
-        display: flex;
-        align-items: center;
-        margin: 0.5rem 0;
-        padding: 0.5rem;
-        border-radius: 5px;
-        transition: background 0.3s ease;
-    }
-    
-    .legend-item:hover {
-        background: #f8f9fa;
-    }
-    
-    .legend-color {
-        width: 20px;
-        height: 20px;
-        border-radius: 4px;
-        margin-right: 15px;
-        border: 2px solid white;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.2);
-    }
-    
-    /* Filter styling */
-    .filter-container {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 10px;
-        box-shadow: 0 3px 15px rgba(0,0,0,0.1);
-        margin-bottom: 2rem;
-    }
-    
-    /* Employee stats container */
-    .employee-stats {
-        background: white;
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: 0 5px 20px rgba(0,0,0,0.1);
-        margin: 2rem 0;
-    }
-    
-    /* Navigation buttons */
-    .nav-button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        padding: 0.75rem 2rem;
-        border-radius: 25px;
-        font-weight: 600;
-        cursor: pointer;
-        transition: all 0.3s ease;
-    }
-    
-    .nav-button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 5px 15px rgba(0,0,0,0.2);
-    }
-    
-    /* Hide streamlit elements */
-    .stDeployButton {display:none;}
-    footer {visibility: hidden;}
-    .stApp > header {visibility: hidden;}
-    </style>
-    """, unsafe_allow_html=True)
+    load_css("v1848BRH.css")
 
     if st.session_state.page == 'home':
         show_home_page()
@@ -314,6 +220,18 @@ def main():
         show_view_tracker_page()
     elif st.session_state.page == 'employee_detail':
         show_employee_detail_page()
+    elif st.session_state.page == 'import_leaves':
+        show_import_page()
+    elif st.session_state.page == 'absence_trends':
+        show_absence_trends_page()
+    elif st.session_state.page == 'capacity_whatif':
+        show_capacity_whatif_page()
+    
+    # Memory admin view (?admin=memory)
+    if admin_requested():
+        with st.expander("🧠 Memory Admin", expanded=True):
+            render_memory_admin()
+    maybe_trim_caches()
 
 def show_home_page():
     # Enhanced Header
@@ -363,10 +281,7 @@ def show_apply_leave_page():
         
         with col1:
             employee_name = st.text_input("Employee Name*", placeholder="Enter your full name")
-            leave_type = st.selectbox("Leave Type*", [
-                "Earned Leave", "Sick Leave", "Personal Leave", 
-                "Emergency Leave", "Joining Transfer Leave"
-            ])
+            leave_type = st.selectbox("Leave Type*", LEAVE_TYPES)
         
         with col2:
             start_date = st.date_input("Start Date*", value=date.today())
@@ -379,9 +294,19 @@ def show_apply_leave_page():
         
         if submitted:
             if employee_name and start_date and end_date:
-                if start_date <= end_date:
-                    days = (end_date - start_date).days + 1
-                    
+                days = (end_date - start_date).days + 1 if start_date <= end_date else 0
+                allowed, available = st.session_state.balance_ledger.can_take(
+                    employee_name, leave_type, days, start_date
+                )
+                conflicts = st.session_state.leave_index.overlapping(employee_name, start_date, end_date)
+                if start_date > end_date:
+                    st.error("❌ End date must be after or equal to start date!")
+                elif conflicts:
+                    booked = ", ".join(f"{s:%d %b %Y} – {e:%d %b %Y}" for s, e in conflicts)
+                    st.error(f"❌ You already have leave booked on these dates: {booked}")
+                elif not allowed:
+                    st.error(f"❌ Insufficient {leave_type} balance: {available:g} day(s) available, {days} requested.")
+                else:
                     new_leave = pd.DataFrame({
                         'Employee Name': [employee_name],
                         'Leave Type': [leave_type],
@@ -391,10 +316,11 @@ def show_apply_leave_page():
                     
                     })
                     
-                    st.session_state.leave_data = pd.concat([st.session_state.leave_data, new_leave], ignore_index=True)
+                    add_leave_records(new_leave)
                     st.success(f"✅ Leave application submitted successfully! Application ID: LA{len(st.session_state.leave_data):04d}")
-                else:
-                    st.error("❌ End date must be after or equal to start date!")
+                    team_out = st.session_state.leave_index.employees_out(start_date, end_date, exclude=employee_name)
+                    if team_out:
+                        st.info(f"👥 Also out during this period: {', '.join(team_out)}")
             else:
                 st.error("❌ Please fill in all required fields!")
     
@@ -407,6 +333,115 @@ def show_apply_leave_page():
         if st.button("🏠 Back to Home", type="secondary"):
             go_to_page('home')
 
+def add_leave_records(new_leaves):
+    """Append a batch of validated leaves and update every running index.
+
+    Returns the number of rows skipped as duplicates of stored or batch rows.
+    """
+    new_leaves, duplicates, _ = st.session_state.leave_dedup.add(new_leaves)
+    if new_leaves.empty:
+        return len(duplicates)
+    st.session_state.leave_data = pd.concat([st.session_state.leave_data, new_leaves], ignore_index=True)
+    st.session_state.data_version = data_version(new_leaves, st.session_state.data_version)
+    st.session_state.balance_ledger.record_frame(new_leaves)
+    st.session_state.leave_index.add_frame(new_leaves)
+    st.session_state.absence_analytics.add_frame(new_leaves)
+    return len(duplicates)
+
+def show_import_page():
+    st.markdown("# 📥 Import Leave History")
+    
+    st.markdown('<div class="form-container">', unsafe_allow_html=True)
+    st.markdown("Upload a CSV, Excel or Parquet file with the columns "
+                "`Employee Name`, `Leave Type`, `Start Date`, `End Date` and optionally `Days`.")
+    
+    uploaded = st.file_uploader("Leave records file", type=["csv", "xlsx", "parquet"])
+    
+    if uploaded is not None:
+        try:
+            accepted, rejected = validate_leave_records(read_leave_file(uploaded))
+        except Exception as e:
+            st.error(f"❌ Could not read file: {e}")
+            accepted, rejected = None, None
+        
+        if accepted is not None:
+            col1, col2 = st.columns(2)
+            col1.metric("Valid Records", len(accepted))
+            col2.metric("Rejected Records", len(rejected))
+            
+            if not rejected.empty:
+                with st.expander("⚠️ Rejected rows"):
+                    st.dataframe(rejected, use_container_width=True, hide_index=True)
+            
+            if not accepted.empty and st.button(f"Import {len(accepted)} records", type="primary"):
+                skipped = add_leave_records(accepted)
+                st.success(f"✅ Imported {len(accepted) - skipped} leave records"
+                           + (f", skipped {skipped} duplicate(s)." if skipped else "."))
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Navigation
+    st.markdown("---")
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        if st.button("🏠 Back to Home", type="secondary"):
+            go_to_page('home')
+
+def show_absence_trends_page():
+    st.markdown("# 📈 Absence Trends")
+    
+    as_of = st.date_input("As of", value=date.today(), key="absence_as_of")
+    render_absence_dashboard(st.session_state.absence_analytics, as_of)
+    
+    # Navigation
+    st.markdown("---")
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        if st.button("🏠 Back to Home", type="secondary"):
+            go_to_page('home')
+
+def team_rosters(leave_data, mapping):
+    """Team -> (names with leave on record, headcount from the team mapping and those names)"""
+    emails = leave_data['Email'] if 'Email' in leave_data.columns else pd.Series("", index=leave_data.index)
+    teams = derive_teams(emails, mapping)
+    mapped = pd.Series(mapping, dtype=object).value_counts().to_dict() if mapping else {}
+    rosters = {}
+    for team, names in leave_data['Employee Name'].groupby(teams.to_numpy()):
+        members = sorted(names.dropna().unique())
+        rosters[team] = (members, max(len(members), mapped.get(team, 0)))
+    return rosters
+
+@trimmable
+@st.cache_resource(max_entries=cache_limit('capacity', 4))
+def get_capacity_simulator(version, team, roster, headcount, _leave_data):
+    """Coverage simulator for one team's leave, built once per data version and headcount"""
+    return CapacitySimulator.from_intervals(_leave_data, list(roster), headcount)
+
+def show_capacity_whatif_page():
+    st.markdown("# 🧮 Coverage What-If")
+    st.caption("Chance of dropping below minimum staffing if pending requests are granted, "
+               "on top of booked leave and the usual absence for the time of year.")
+    
+    rosters = team_rosters(st.session_state.leave_data, load_team_mapping())
+    if not rosters:
+        st.info("No leave data to simulate")
+        return
+    col1, col2 = st.columns(2)
+    team = col1.selectbox("Team", sorted(rosters), key="capacity_team")
+    members, known = rosters[team]
+    headcount = col2.number_input("Team headcount", len(members), None, known, key=f"capacity_headcount_{team}",
+                                  help="Everyone in the team, including those with no leave on record")
+    simulator = get_capacity_simulator(st.session_state.data_version, team, tuple(members), int(headcount),
+                                       st.session_state.leave_data)
+    render_capacity_whatif(simulator, members, LEAVE_TYPES, key=f"capacity_{team}")
+    
+    # Navigation
+    st.markdown("---")
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        if st.button("🏠 Back to Home", type="secondary"):
+            go_to_page('home')
+
 def show_view_tracker_page():
     st.markdown("# 📊 Leave Tracker Dashboard")
     
@@ -419,17 +454,19 @@ def show_view_tracker_page():
     with col1:
         selected_month = st.selectbox("📅 Select Month", range(1, 13), 
                                     index=datetime.now().month - 1,
-                                    format_func=lambda x: calendar.month_name[x])
+                                    format_func=lambda x: calendar.month_name[x],
+                                    key="tracker_month")
     with col2:
         current_year = datetime.now().year
         year_options = list(range(2023, 2026))
         default_year_index = year_options.index(current_year) if current_year in year_options else 1
         selected_year = st.selectbox("📅 Select Year", year_options, 
-                                   index=default_year_index)
+                                   index=default_year_index, key="tracker_year")
     
     with col3:
-        employees = ['All Employees'] + sorted(st.session_state.leave_data['Employee Name'].unique().tolist())
-        selected_employee = st.selectbox("👤 Select Employee", employees)
+        name_index = get_name_index(st.session_state.data_version, st.session_state.leave_data)
+        selected_employee = employee_search_box(name_index, 'All Employees', key="tracker_employee",
+                                                label="👤 Select Employee")
         
         if selected_employee != 'All Employees':
             go_to_employee_detail(selected_employee)
@@ -439,7 +476,17 @@ def show_view_tracker_page():
     # Show calendar
     show_calendar_view(selected_month, selected_year)
 
-def show_calendar_view(selected_month, selected_year):
+    # Balances for everyone at a glance
+    with st.expander("📒 Leave Balances"):
+        st.dataframe(st.session_state.balance_ledger.to_frame(), use_container_width=True, hide_index=True)
+
+@st.cache_resource
+def get_month_views():
+    """Rendered month grids shared by all sessions"""
+    return MonthViewCache(cache_limit('month_views', 64))
+
+def month_view_cells(leave_data, selected_month, selected_year):
+    """HTML of each calendar day cell, one list of seven per week"""
     # Create calendar
     cal = calendar.monthcalendar(selected_year, selected_month)
     
@@ -450,9 +497,9 @@ def show_calendar_view(selected_month, selected_year):
     else:
         month_end = datetime(selected_year, selected_month + 1, 1) - timedelta(days=1)
     
-    month_leaves = st.session_state.leave_data[
-        (st.session_state.leave_data['Start Date'] <= month_end) & 
-        (st.session_state.leave_data['End Date'] >= month_start)
+    month_leaves = leave_data[
+        (leave_data['Start Date'] <= month_end) & 
+        (leave_data['End Date'] >= month_start)
     ]
     
     # Create leave date mapping
@@ -469,26 +516,16 @@ def show_calendar_view(selected_month, selected_year):
                 'color': get_leave_color(leave['Leave Type'])
             })
     
-    # Display calendar
-    st.markdown('<div class="calendar-container">', unsafe_allow_html=True)
-    
-    st.markdown(f'<div class="calendar-header">{calendar.month_name[selected_month]} {selected_year}</div>', 
-                unsafe_allow_html=True)
-    
-    # Calendar header
-    days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    cols = st.columns(7)
-    for i, day in enumerate(days):
-        cols[i].markdown(f'<div class="calendar-day-header">{day}</div>', unsafe_allow_html=True)
-    
     # Calendar body
     today = datetime.now()
+    weeks = []
     
     for week in cal:
-        cols = st.columns(7)
+        cells = []
+        weeks.append(cells)
         for i, day in enumerate(week):
             if day == 0:
-                cols[i].markdown('<div class="calendar-day"></div>', unsafe_allow_html=True)
+                cells.append('<div class="calendar-day"></div>')
             else:
                 # Check if this is today
                 is_today = (day == today.day and 
@@ -508,17 +545,51 @@ def show_calendar_view(selected_month, selected_year):
                     
                     today_class = " calendar-day-today" if is_today else ""
                     
-                    cols[i].markdown(f"""
+                    cells.append(f"""
                     <div class="calendar-day calendar-day-leave{today_class}" 
                          style="background-color: {color};" 
                          title="{tooltip_text}&#10;{hover_content}">
                         <strong>{day}</strong>
                     </div>
-                    """, unsafe_allow_html=True)
+                    """)
                 else:
                     # Regular day
                     today_class = " calendar-day-today" if is_today else ""
-                    cols[i].markdown(f'<div class="calendar-day{today_class}">{day}</div>', unsafe_allow_html=True)
+                    cells.append(f'<div class="calendar-day{today_class}">{day}</div>')
+    return weeks
+
+@st.cache_resource
+def get_prefetcher():
+    """Background pool warming likely next views for all sessions"""
+    return Prefetcher()
+
+def show_calendar_view(selected_month, selected_year):
+    month_views = get_month_views()
+    weeks = month_views.get(('v1848BRH', selected_year, selected_month, st.session_state.data_version),
+                            month_view_cells, st.session_state.leave_data, selected_month, selected_year)
+
+    # Build the months either side in the background so the next switch is a cache hit
+    for year, month in adjacent_months(selected_year, selected_month):
+        key = ('v1848BRH', year, month, st.session_state.data_version)
+        get_prefetcher().submit(key, month_views.get, key, month_view_cells,
+                                st.session_state.leave_data, month, year)
+
+    # Display calendar
+    st.markdown('<div class="calendar-container">', unsafe_allow_html=True)
+    
+    st.markdown(f'<div class="calendar-header">{calendar.month_name[selected_month]} {selected_year}</div>', 
+                unsafe_allow_html=True)
+    
+    # Calendar header
+    days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+    cols = st.columns(7)
+    for i, day in enumerate(days):
+        cols[i].markdown(f'<div class="calendar-day-header">{day}</div>', unsafe_allow_html=True)
+    
+    for week in weeks:
+        cols = st.columns(7)
+        for i, cell_html in enumerate(week):
+            cols[i].markdown(cell_html, unsafe_allow_html=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -580,6 +651,14 @@ def show_employee_detail_page():
         unique_leave_types = employee_data['Leave Type'].nunique()
         st.metric("Types of Leaves Used", unique_leave_types)
     
+    # Remaining balance per leave type
+    st.markdown("#### 📒 Leave Balance")
+    st.dataframe(
+        st.session_state.balance_ledger.employee_frame(employee).drop(columns=['Employee Name']),
+        use_container_width=True,
+        hide_index=True
+    )
+    
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Interactive Charts
@@ -591,28 +670,13 @@ def show_employee_detail_page():
         # Monthly leaves bar chart
         st.markdown("#### Monthly Leave Days")
         if len(employee_data) > 0:
-            # Create monthly data
-            employee_data_copy = employee_data.copy()
-            employee_data_copy['Month'] = employee_data_copy['Start Date'].dt.to_period('M')
-            monthly_leaves = employee_data_copy.groupby('Month')['Days'].sum().reset_index()
-            monthly_leaves['Month'] = monthly_leaves['Month'].astype(str)
+            # Monthly data, split across month boundaries
+            monthly_leaves = get_monthly_leave_days(
+                st.session_state.data_version, st.session_state.leave_data
+            ).get(employee, pd.DataFrame(columns=['Month', 'Days']))
             
             if len(monthly_leaves) > 0:
-                fig_bar = px.bar(
-                    monthly_leaves, 
-                    x='Month', 
-                    y='Days',
-                    title=f"Monthly Leave Pattern for {employee}",
-                    color='Days',
-                    color_continuous_scale='viridis'
-                )
-                fig_bar.update_layout(
-                    showlegend=False,
-                    height=400,
-                    title_x=0.5,
-                    xaxis_title="Month",
-                    yaxis_title="Leave Days"
-                )
+                fig_bar = get_monthly_bar_figure(employee, st.session_state.data_version, monthly_leaves)
                 st.plotly_chart(fig_bar, use_container_width=True)
             else:
                 st.info("No monthly data available")
@@ -623,17 +687,7 @@ def show_employee_detail_page():
         leave_types = employee_data['Leave Type'].value_counts()
         
         if len(leave_types) > 0:
-            fig_pie = px.pie(
-                values=leave_types.values, 
-                names=leave_types.index,
-                title=f"Leave Types for {employee}",
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            fig_pie.update_layout(
-                height=400,
-                title_x=0.5,
-                showlegend=True
-            )
+            fig_pie = get_leave_type_pie_figure(employee, st.session_state.data_version, leave_types)
             st.plotly_chart(fig_pie, use_container_width=True)
         else:
             st.info("No leave type data available")
@@ -641,17 +695,10 @@ def show_employee_detail_page():
     # Leave History Table
     st.markdown("### 📋 Leave History")
     
-    # Format the data for better display
-    display_data = employee_data.copy()
-    display_data['Start Date'] = display_data['Start Date'].dt.strftime('%Y-%m-%d')
-    display_data['End Date'] = display_data['End Date'].dt.strftime('%Y-%m-%d')
-    display_data = display_data.sort_values('Start Date', ascending=False)
-    
-    st.dataframe(
-        display_data[['Leave Type', 'Start Date', 'End Date', 'Days']], 
-        use_container_width=True,
-        hide_index=True
-    )
+    # Only the visible page is formatted and sent to the browser
+    history = get_employee_history(employee, st.session_state.data_version, st.session_state.leave_data)
+    paged_history_table(history, f"leave_history_{employee}", 'Start Date', ['Leave Type', 'Start Date', 'End Date', 'Days'],
+                        date_columns=['Start Date', 'End Date'])
     
     # Navigation
     st.markdown("---")
@@ -673,7 +720,23 @@ with st.sidebar:
     
     if st.button("📊 View Tracker", type="secondary"):
         go_to_page('view_tracker')
+    
+    if st.button("📥 Import Leaves", type="secondary"):
+        go_to_page('import_leaves')
+    
+    if st.button("📈 Absence Trends", type="secondary"):
+        go_to_page('absence_trends')
+    
+    if st.button("🧮 Coverage What-If", type="secondary"):
+        go_to_page('capacity_whatif')
 
 # Run the main function
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
+    finish_rerun_profile(
+        page=st.session_state.page,
+        year=st.session_state.get('tracker_year'),
+        month=st.session_state.get('tracker_month'),
+        employee=st.session_state.get('selected_employee'),
+        tracker_employee=st.session_state.get('tracker_employee'),
+    )
\ No newline at end of file